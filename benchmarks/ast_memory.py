@@ -0,0 +1,83 @@
+"""Memory and parse time of the slotted, interned AST against plain dataclasses.
+
+The baseline swaps the parser's node classes for dict-backed, non-interned
+clones with the same fields. Run from the repository root:
+
+    python -m benchmarks.ast_memory [--nodes N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import fields, is_dataclass, make_dataclass
+
+import fluent_ast
+import parser as parser_module
+from benchmarks.corpus import many_functions
+from benchmarks.frontend import count_nodes
+from lexer import Lexer
+from parser import Parser
+
+
+def _fresh(cls, value):
+    return cls(value)
+
+
+@contextmanager
+def plain_nodes():
+    saved = {}
+    for name, cls in vars(fluent_ast).items():
+        if is_dataclass(cls) and name in vars(parser_module):
+            saved[name] = cls
+            setattr(parser_module, name, make_dataclass(name, [(f.name, f.type) for f in fields(cls) if f.init],
+                                                        namespace={"interned": classmethod(_fresh)}))
+    try:
+        yield
+    finally:
+        for name, cls in saved.items():
+            setattr(parser_module, name, cls)
+
+
+def measure(tokens, repeat):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = Parser.from_tokens(tokens).parse()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del tree
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Parser.from_tokens(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return retained, best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--nodes", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    per_function = count_nodes(Parser(many_functions(10)).parse()) / 10
+    source = many_functions(max(1, round(args.nodes / per_function)))
+    tokens = Lexer(source).tokenize()
+    nodes = count_nodes(Parser.from_tokens(tokens).parse())
+
+    with plain_nodes():
+        plain_bytes, plain_seconds = measure(tokens, args.repeat)
+    slot_bytes, slot_seconds = measure(tokens, args.repeat)
+
+    print(f"{nodes:,} nodes")
+    print(f"{'':>10} {'MiB':>8} {'bytes/node':>11} {'parse s':>8}")
+    for label, size, seconds in (("plain", plain_bytes, plain_seconds),
+                                 ("slotted", slot_bytes, slot_seconds)):
+        print(f"{label:>10} {size / 2**20:>8.1f} {size / nodes:>11.1f} {seconds:>8.2f}")
+    print(f"memory saved: {1 - slot_bytes / plain_bytes:.0%}, "
+          f"parse time change: {slot_seconds / plain_seconds - 1:+.0%}")
+
+
+if __name__ == "__main__":
+    main()
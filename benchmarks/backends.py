@@ -0,0 +1,62 @@
+"""Run time of each execution backend on recursive and looping programs.
+
+Run from the repository root:
+
+    python -m benchmarks.backends [--backends tree closure ...] [--fib N]
+"""
+import argparse
+import sys
+import time
+
+from interpreter import BACKENDS, Interpreter
+from parser import Parser
+
+FIB = '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+fib({n})
+'''
+
+SUM_TO = '''fn sum_to(n: Int, acc: Int)
+  if n < 1
+    acc
+  else
+    sum_to(n - 1, acc + n)
+sum_to({n}, 0)
+'''
+
+
+def best_time(backend, stmts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter(backend)
+        start = time.perf_counter()
+        interpreter.eval_program(stmts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    ap.add_argument("--fib", type=int, default=22)
+    ap.add_argument("--sum-to", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 50 * args.sum_to))
+
+    programs = {f"fib({args.fib})": FIB.format(n=args.fib), f"sum_to({args.sum_to})": SUM_TO.format(n=args.sum_to)}
+    print(f"{'program':>14} {'backend':>9} {'seconds':>9} {'speedup':>8}")
+    for label, source in programs.items():
+        stmts = Parser(source).parse()
+        baseline = None
+        for backend in args.backends:
+            seconds = best_time(backend, stmts, args.repeat)
+            baseline = baseline or seconds
+            print(f"{label:>14} {backend:>9} {seconds:>9.3f} {baseline / seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Run time of a call-heavy program full of constant arithmetic, with and without optimize.
+
+Run from the repository root:
+
+    python -m benchmarks.constant_folding [--depth N] [--backends tree closure ...]
+"""
+import argparse
+import time
+
+from interpreter import BACKENDS, Interpreter
+from parser import Parser
+
+PROGRAM = '''fn timeout(n: Int)
+  let minute = 60
+  let hour = minute * 60
+  let retries = 3 * 2 + 1
+  let mode = 2
+  if retries > 5
+    n * hour + minute * retries + match mode
+      1 => 1000 * 1000
+      2 => 24 * hour
+      _ => 0
+  else
+    0
+fn total(n: Int)
+  if n < 2
+    timeout(n)
+  else
+    total(n - 1) + total(n - 2)
+total({depth})
+'''
+
+
+def best_time(backend, optimize, stmts, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        interpreter = Interpreter(backend, optimize=optimize)
+        start = time.perf_counter()
+        interpreter.eval_program(stmts)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["tree", "closure"])
+    ap.add_argument("--depth", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    stmts = Parser(PROGRAM.format(depth=args.depth)).parse()
+    print(f"{'backend':>8} {'plain':>9} {'optimize':>9} {'speedup':>8}")
+    for backend in args.backends:
+        plain = best_time(backend, False, stmts, args.repeat)
+        folded = best_time(backend, True, stmts, args.repeat)
+        print(f"{backend:>8} {plain:>9.3f} {folded:>9.3f} {plain / folded:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Synthetic Fluent programs of controllable shape for front-end benchmarks.
+
+Every generator takes a size `n` and returns source text that lexes and
+parses; `n` is the quantity that shape scales (terms, depth, functions, ...).
+"""
+
+
+def long_lines(n):
+    """A single `let` whose right-hand side has `n` terms on one line."""
+    terms = [f"f{i % 5}(a{i}, {i}) * xs[{i % 3}]" for i in range(n)]
+    return "let total: Int = " + " + ".join(terms) + "\n"
+
+
+def deep_nesting(n):
+    """A function whose body is `n` nested if/else blocks."""
+    lines = ["fn deep(x: Int) -> Int"]
+    for depth in range(n):
+        lines.append("  " * (depth + 1) + f"if x > {depth}")
+    lines.append("  " * (n + 1) + "x")
+    for depth in reversed(range(n)):
+        lines.append("  " * (depth + 1) + "else")
+        lines.append("  " * (depth + 2) + f"{depth}")
+    return "\n".join(lines) + "\n"
+
+
+def many_functions(n):
+    """`n` small function declarations, each with a match and a call."""
+    lines = []
+    for i in range(n):
+        lines += [
+            f"fn f{i}(n: Int, xs: List[Int]) -> Int",
+            f"  let base = xs[0] + {i}",
+            "  match n",
+            "    0 => base",
+            f"    _ => f{i}(n - 1, xs) * 2",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def wide_match(n):
+    """One match expression with `n` literal arms plus a wildcard."""
+    lines = ["fn pick(n: Int) -> Int", "  match n"]
+    lines += [f"    {i} => {i} * n + {i % 7}" for i in range(n)]
+    lines.append("    _ => n")
+    return "\n".join(lines) + "\n"
+
+
+def binary_chain(n):
+    """One expression of `n` arithmetic and comparison operators.
+
+    `and`/`or` are left out: the lexer turns them into identifiers.
+    """
+    ops = ["+", "*", "-", "/", "<", ">=", "<=", "!=", ">"]
+    parts = ["a0"]
+    for i in range(n):
+        parts.append(ops[i % len(ops)])
+        parts.append(f"a{i + 1}")
+    return "let r = " + " ".join(parts) + "\n"
+
+
+SHAPES = {
+    "long_lines": long_lines,
+    "deep_nesting": deep_nesting,
+    "many_functions": many_functions,
+    "wide_match": wide_match,
+    "binary_chain": binary_chain,
+}
+
+# Default sizes per shape. deep_nesting stays small because the recursive
+# descent parser uses several Python frames per nesting level.
+DEFAULT_SIZES = {
+    "long_lines": [250, 500, 1000, 2000, 4000],
+    "deep_nesting": [10, 20, 40, 80, 120],
+    "many_functions": [250, 500, 1000, 2000, 4000],
+    "wide_match": [250, 500, 1000, 2000, 4000],
+    "binary_chain": [500, 1000, 2000, 4000, 8000],
+}
+
+
+def generate(shape, n):
+    return SHAPES[shape](n)
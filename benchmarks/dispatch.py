@@ -0,0 +1,87 @@
+"""Per-node-type cost of eval_expr: method-table dispatch vs. the old isinstance chain.
+
+LegacyInterpreter dispatches through the isinstance chain eval_expr used to
+have, in the same order, into the same handlers, so the difference is the
+dispatch alone. Run from the repository root:
+
+    python -m benchmarks.dispatch [--number N]
+"""
+import argparse
+import timeit
+
+from fluent_ast import (
+    Number, String, Var, ListLiteral, IndexExpr, Boolean, Binary, IfExpr, MatchExpr, MatchCase, Call,
+    ExprStmt, FnDecl
+)
+from interpreter import Interpreter
+
+
+class LegacyInterpreter(Interpreter):
+    def eval_expr(self, expr, env):
+        if isinstance(expr, Number):
+            return self.eval_Number(expr, env)
+        elif isinstance(expr, String):
+            return self.eval_String(expr, env)
+        elif isinstance(expr, Var):
+            return self.eval_Var(expr, env)
+        elif isinstance(expr, ListLiteral):
+            return self.eval_ListLiteral(expr, env)
+        elif isinstance(expr, IndexExpr):
+            return self.eval_IndexExpr(expr, env)
+        elif isinstance(expr, Boolean):
+            return self.eval_Boolean(expr, env)
+        elif isinstance(expr, Binary):
+            return self.eval_Binary(expr, env)
+        elif isinstance(expr, IfExpr):
+            return self.eval_IfExpr(expr, env)
+        elif isinstance(expr, MatchExpr):
+            return self.eval_MatchExpr(expr, env)
+        elif isinstance(expr, Call):
+            return self.eval_Call(expr, env)
+        else:
+            raise NotImplementedError(f"Unsupported expression: {type(expr)}")
+
+
+# One cheap instance per node type, in the order of the old chain.
+SAMPLES = [
+    Number(1),
+    String("s"),
+    Var("x"),
+    ListLiteral([]),
+    IndexExpr(Var("xs"), Number(0)),
+    Boolean(True),
+    Binary(Number(1), "+", Number(2)),
+    IfExpr(Boolean(True), [ExprStmt(Number(1))], None),
+    MatchExpr(Number(1), [MatchCase("_", Number(1))]),
+    Call("f", []),
+]
+
+
+def setup(interpreter):
+    env = interpreter.global_env
+    env.set("x", 1)
+    env.set("xs", [1])
+    env.set("f", FnDecl("f", [], None, [ExprStmt(Number(1))]))
+    return env
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--number", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    print(f"{'node':>12} {'chain ns':>9} {'table ns':>9} {'speedup':>8}")
+    for node in SAMPLES:
+        row = []
+        for cls in (LegacyInterpreter, Interpreter):
+            interpreter = cls()
+            env = setup(interpreter)
+            seconds = min(timeit.repeat(lambda: interpreter.eval_expr(node, env),
+                                        number=args.number, repeat=args.repeat))
+            row.append(seconds / args.number * 1e9)
+        print(f"{type(node).__name__:>12} {row[0]:>9.0f} {row[1]:>9.0f} {row[0] / row[1]:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Run time of functions that return early, with and without raising.
+
+Every call of `fib` below leaves through a `return`: the leaves from
+inside an `if`, the others from the last statement. The Legacy classes
+signal each return the way the tree walker and closure compiler used to,
+by raising ReturnException for the call to catch. The parser has no
+`return` yet, so the program is built as an AST. Run from the
+repository root:
+
+    python -m benchmarks.early_return [--fib N]
+"""
+import argparse
+import time
+
+from closure_compiler import ClosureInterpreter
+from fluent_ast import Binary, Call, ExprStmt, FnDecl, FnParam, IfExpr, Number, Return, SimpleType, Var
+from interpreter import Interpreter, ReturnException
+
+
+class LegacyInterpreter(Interpreter):
+    def exec_Return(self, stmt, env):
+        raise ReturnException(self.eval_expr(stmt.expr, env))
+
+
+class LegacyClosureInterpreter(ClosureInterpreter):
+    def stmt_Return(self, stmt):
+        value = self.compile_expr(stmt.expr)
+
+        def return_(frame):
+            raise ReturnException(value(frame))
+        return return_
+
+
+def program(n):
+    """fn fib(n: Int) -> Int: if n < 2 { return n }; return fib(n - 1) + fib(n - 2)"""
+    n_ = Var("n")
+    fib = FnDecl("fib", [FnParam("n", SimpleType("Int"))], SimpleType("Int"), [
+        ExprStmt(IfExpr(Binary(n_, "<", Number(2)), [Return(n_)], None)),
+        Return(Binary(Call("fib", [Binary(n_, "-", Number(1))]), "+", Call("fib", [Binary(n_, "-", Number(2))]))),
+    ])
+    return [fib, ExprStmt(Call("fib", [Number(n)]))]
+
+
+def best_times(classes, stmts, repeat):
+    """Best time of each class; runs alternate so that machine noise hits all alike."""
+    best = [float("inf")] * len(classes)
+    for _ in range(repeat):
+        for i, cls in enumerate(classes):
+            interpreter = cls()
+            start = time.perf_counter()
+            interpreter.eval_program(stmts)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fib", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args(argv)
+
+    stmts = program(args.fib)
+    print(f"{'backend':>8} {'raising':>9} {'completion':>11} {'speedup':>8}")
+    for label, legacy, current in (("tree", LegacyInterpreter, Interpreter),
+                                   ("closure", LegacyClosureInterpreter, ClosureInterpreter)):
+        before, after = best_times((legacy, current), stmts, args.repeat)
+        print(f"{label:>8} {before:>9.3f} {after:>11.3f} {before / after:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Expression parsing: table-driven Pratt parser vs. the original descent.
+
+Run from the repository root:
+
+    python -m benchmarks.expression_parsing [--scale F]
+"""
+import argparse
+
+from benchmarks.corpus import generate
+from benchmarks.frontend import best_time, count_nodes, same_tree
+from fluent_ast import Binary, Boolean, Call, IndexExpr, ListLiteral, Var
+from lexer import Lexer, TokenType
+from parser import PRECEDENCE, Parser
+
+
+class LegacyExprParser(Parser):
+    """The pre-Pratt parse_expr/parse_unary/parse_atom, kept as the baseline."""
+
+    def parse_atom(self):
+        tok = self.peek()
+
+        if tok.type == TokenType.MATCH:
+            return self.parse_match_expr()
+        elif tok.type == TokenType.IF:
+            return self.parse_if_expr()
+        elif tok.type == TokenType.LBRACKET:
+            self.advance()
+            elements = []
+            if self.peek().type != TokenType.RBRACKET:
+                elements.append(self.parse_expr())
+                while self.peek().type == TokenType.COMMA:
+                    self.advance()
+                    elements.append(self.parse_expr())
+            self.expect(TokenType.RBRACKET)
+            return ListLiteral(elements)
+        elif tok.type == TokenType.LPAREN:
+            self.advance()
+            expr = self.parse_expr()
+            self.expect(TokenType.RPAREN)
+            return expr
+        elif tok.type == TokenType.NUMBER:
+            return self.parse_number()
+        elif tok.type == TokenType.STRING:
+            return self.parse_string()
+        elif tok.type == TokenType.BOOL:
+            self.advance()
+            return Boolean(tok.value == "true")
+        elif tok.type == TokenType.IDENT:
+            return self.parse_var()
+        else:
+            raise SyntaxError(f"Unsupported expression starting with {tok.type}")
+
+    def parse_expr(self, min_precedence=0):
+        left = self.parse_unary()
+
+        while True:
+            tok = self.peek()
+
+            # Function call (e.g. foo(1, 2))
+            if tok.type == TokenType.LPAREN:
+                self.advance()
+                args = []
+                if self.peek().type != TokenType.RPAREN:
+                    args.append(self.parse_expr())
+                    while self.peek().type == TokenType.COMMA:
+                        self.advance()
+                        args.append(self.parse_expr())
+                self.expect(TokenType.RPAREN)
+                if isinstance(left, Var):
+                    left = Call(func=left.name, args=args)
+                else:
+                    raise SyntaxError(f"Cannot call non-variable expression at line {tok.line + 1}")
+                continue
+
+            if tok.type == TokenType.LBRACKET:
+                self.advance()
+                index_expr = self.parse_expr()
+                self.expect(TokenType.RBRACKET)
+                left = IndexExpr(target=left, index=index_expr)
+                continue
+
+            binary_ops = {
+                TokenType.PLUS: "+",
+                TokenType.MINUS: "-",
+                TokenType.STAR: "*",
+                TokenType.SLASH: "/",
+                TokenType.GT: ">",
+                TokenType.LT: "<",
+                TokenType.GTE: ">=",
+                TokenType.LTE: "<=",
+                TokenType.EQ: "==",
+                TokenType.NEQ: "!=",
+                TokenType.AND: "and",
+                TokenType.OR: "or",
+            }
+
+            if tok.type in binary_ops:
+                op = binary_ops[tok.type]
+                precedence = PRECEDENCE[op]
+                if precedence < min_precedence:
+                    break
+                self.advance()
+                right = self.parse_expr(precedence + 1)
+                left = Binary(left=left, op=op, right=right)
+            else:
+                break
+
+        return left
+
+    def parse_unary(self):
+        tok = self.peek()
+        if tok.type == TokenType.NOT:
+            self.advance()
+            operand = self.parse_unary()
+            return Binary(left=Boolean(True), op="and not", right=operand)
+        return self.parse_atom()
+
+
+CASES = [("binary_chain", 8000), ("long_lines", 4000), ("wide_match", 4000), ("many_functions", 2000)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scale", type=float, default=1.0)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    print(f"{'shape':>15} {'nodes':>8} {'legacy nodes/s':>15} {'pratt nodes/s':>15} {'speedup':>8}")
+    for shape, size in CASES:
+        tokens = Lexer(generate(shape, max(1, int(size * args.scale)))).tokenize()
+        tree = Parser.from_tokens(tokens).parse()
+        if not same_tree(LegacyExprParser.from_tokens(tokens).parse(), tree):
+            raise SystemExit(f"{shape}: trees differ")
+        nodes = count_nodes(tree)
+        legacy = best_time(lambda: LegacyExprParser.from_tokens(tokens).parse(), args.repeat)
+        pratt = best_time(lambda: Parser.from_tokens(tokens).parse(), args.repeat)
+        print(f"{shape:>15} {nodes:>8} {nodes / legacy:>15,.0f} {nodes / pratt:>15,.0f} {legacy / pratt:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
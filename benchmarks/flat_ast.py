@@ -0,0 +1,60 @@
+"""Memory, serialization and traversal of FlatAST against the object tree.
+
+Run from the repository root:
+
+    python -m benchmarks.flat_ast [--functions N]
+"""
+import argparse
+import gc
+import pickle
+import tracemalloc
+
+from benchmarks.corpus import many_functions
+from benchmarks.frontend import best_time, count_nodes
+from flat_ast import FlatAST
+from parser import Parser
+
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, size
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, default=40000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    source = many_functions(args.functions)
+    stmts, tree_bytes = retained(lambda: Parser(source).parse())
+    flat, flat_bytes = retained(lambda: FlatAST.from_nodes(stmts))
+    nodes = len(flat)
+
+    rows = [
+        ("memory MiB", tree_bytes / 2**20, flat_bytes / 2**20),
+        ("walk s", best_time(lambda: count_nodes(stmts), args.repeat),
+         best_time(lambda: sum(1 for _ in flat.walk()), args.repeat)),
+    ]
+    blob = pickle.dumps(stmts, protocol=pickle.HIGHEST_PROTOCOL)
+    data = flat.to_bytes()
+    rows += [
+        ("serialized MiB", len(blob) / 2**20, len(data) / 2**20),
+        ("dump s", best_time(lambda: pickle.dumps(stmts, protocol=pickle.HIGHEST_PROTOCOL), args.repeat),
+         best_time(flat.to_bytes, args.repeat)),
+        ("load s", best_time(lambda: pickle.loads(blob), args.repeat),
+         best_time(lambda: FlatAST.from_bytes(data), args.repeat)),
+    ]
+    print(f"{nodes:,} nodes")
+    print(f"{'':>15} {'objects':>9} {'flat':>9}")
+    for label, tree_value, flat_value in rows:
+        print(f"{label:>15} {tree_value:>9.3f} {flat_value:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
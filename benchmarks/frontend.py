@@ -0,0 +1,168 @@
+"""Front-end scaling suite: lexer and parser throughput across program shapes.
+
+For every corpus shape and size it times `Lexer.tokenize` and `Parser.parse`
+(on pre-lexed tokens), reports tokens/sec and nodes/sec, and fits a growth
+exponent k for time ~ size**k. A k well above 1 means super-linear work,
+such as re-slicing the rest of a line per token.
+
+Run from the repository root:
+
+    python -m benchmarks.frontend [--json out.json] [--baseline base.json]
+
+Exits with status 1 if a fitted exponent exceeds --max-exponent, or if a
+baseline is given and a shape got slower or grew faster than it allows.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+from dataclasses import fields, is_dataclass
+
+from benchmarks.corpus import DEFAULT_SIZES, SHAPES, generate
+from lexer import Lexer
+from parser import Parser
+
+
+def count_nodes(tree):
+    # Iterative: left-associative chains make trees as deep as they are long.
+    count, stack = 0, [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif is_dataclass(node):
+            count += 1
+            stack.extend(getattr(node, f.name) for f in fields(node))
+    return count
+
+
+def same_tree(a, b):
+    """Iterative structural equality; `==` on deep dataclass trees recurses."""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if isinstance(x, list) and isinstance(y, list):
+            if len(x) != len(y):
+                return False
+            stack.extend(zip(x, y))
+        elif is_dataclass(x) and is_dataclass(y):
+            if type(x) is not type(y):
+                return False
+            stack.extend((getattr(x, f.name), getattr(y, f.name)) for f in fields(x))
+        elif x != y:
+            return False
+    return True
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def fit_exponent(sizes, seconds):
+    """Least-squares slope of log(seconds) against log(size)."""
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(max(t, 1e-9)) for t in seconds]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mean_x) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var
+
+
+def run_shape(shape, sizes, repeat):
+    rows = []
+    for size in sizes:
+        source = generate(shape, size)
+        tokens = Lexer(source).tokenize()
+        nodes = count_nodes(Parser.from_tokens(tokens).parse())
+        lex_seconds = best_time(lambda: Lexer(source).tokenize(), repeat)
+        parse_seconds = best_time(lambda: Parser.from_tokens(tokens).parse(), repeat)
+        rows.append({
+            "size": size,
+            "tokens": len(tokens),
+            "nodes": nodes,
+            "lex_seconds": lex_seconds,
+            "parse_seconds": parse_seconds,
+            "tokens_per_sec": len(tokens) / lex_seconds,
+            "nodes_per_sec": nodes / parse_seconds,
+        })
+    return {
+        "rows": rows,
+        "lex_exponent": fit_exponent([r["size"] for r in rows], [r["lex_seconds"] for r in rows]),
+        "parse_exponent": fit_exponent([r["size"] for r in rows], [r["parse_seconds"] for r in rows]),
+    }
+
+
+def check(results, max_exponent, baseline=None, slowdown=0.3, exponent_slack=0.2):
+    """Return a list of human-readable failures (empty if everything passed)."""
+    failures = []
+    for shape, result in results.items():
+        for stage in ("lex", "parse"):
+            k = result[f"{stage}_exponent"]
+            if k > max_exponent:
+                failures.append(f"{shape}: {stage} time grows like size**{k:.2f} (max {max_exponent})")
+
+        base = (baseline or {}).get(shape)
+        if base is None:
+            continue
+        for stage in ("lex", "parse"):
+            k, base_k = result[f"{stage}_exponent"], base[f"{stage}_exponent"]
+            if k > base_k + exponent_slack:
+                failures.append(f"{shape}: {stage} exponent {k:.2f} vs baseline {base_k:.2f}")
+        base_rows = {r["size"]: r for r in base["rows"]}
+        common = [r for r in result["rows"] if r["size"] in base_rows]
+        if not common:
+            continue
+        row, base_row = common[-1], base_rows[common[-1]["size"]]
+        for key in ("tokens_per_sec", "nodes_per_sec"):
+            if row[key] < base_row[key] * (1 - slowdown):
+                failures.append(f"{shape}: {key} at size {row['size']} fell to {row[key]:,.0f} "
+                                f"from {base_row[key]:,.0f}")
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES))
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply the default sizes")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", help="write results to this file")
+    ap.add_argument("--baseline", help="compare against a previous --json file")
+    ap.add_argument("--max-exponent", type=float, default=1.3)
+    ap.add_argument("--slowdown", type=float, default=0.3,
+                    help="allowed throughput loss against the baseline (fraction)")
+    args = ap.parse_args(argv)
+
+    results = {}
+    print(f"{'shape':>15} {'size':>6} {'tokens':>8} {'nodes':>8} {'tok/s':>12} {'nodes/s':>12}")
+    for shape in args.shapes:
+        sizes = [max(1, int(s * args.scale)) for s in DEFAULT_SIZES[shape]]
+        result = results[shape] = run_shape(shape, sizes, args.repeat)
+        for row in result["rows"]:
+            print(f"{shape:>15} {row['size']:>6} {row['tokens']:>8} {row['nodes']:>8} "
+                  f"{row['tokens_per_sec']:>12,.0f} {row['nodes_per_sec']:>12,.0f}")
+        print(f"{shape:>15} growth: lex ~ n^{result['lex_exponent']:.2f}, "
+              f"parse ~ n^{result['parse_exponent']:.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(results, args.max_exponent, baseline, args.slowdown)
+    for failure in failures:
+        print("REGRESSION:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
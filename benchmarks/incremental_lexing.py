@@ -0,0 +1,49 @@
+"""Edit latency: IncrementalLexer.edit vs. a full re-lex, as the file grows.
+
+Run from the repository root:
+
+    python -m benchmarks.incremental_lexing [--functions N ...]
+"""
+import argparse
+import time
+
+from incremental_lexer import IncrementalLexer
+from lexer import Lexer
+
+FUNCTION = [
+    "fn f{i}(n: Int) -> Int",
+    "  match n",
+    "    0 => {i}",
+    "    _ => if n > 2",
+    "      f{i}(n - 1) + n",
+    "    else",
+    "      n",
+]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--edits", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    print(f"{'lines':>8} {'full re-lex ms':>15} {'edit us':>9}")
+    for functions in args.functions:
+        lines = [line.format(i=i) for i in range(functions) for line in FUNCTION]
+        source = "\n".join(lines)
+
+        start = time.perf_counter()
+        Lexer(source).tokenize()
+        full = time.perf_counter() - start
+
+        inc = IncrementalLexer(source)
+        middle = (functions // 2) * len(FUNCTION) + 4
+        start = time.perf_counter()
+        for i in range(args.edits):
+            inc.edit(middle, middle + 1, [f"      f0(n - {i}) + n"])
+        edit = (time.perf_counter() - start) / args.edits
+        print(f"{len(lines):>8} {full * 1e3:>15.1f} {edit * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Edit latency: IncrementalParser.edit vs. a full parse, as the file grows.
+
+Run from the repository root:
+
+    python -m benchmarks.incremental_parsing [--functions N ...]
+"""
+import argparse
+import time
+
+from benchmarks.corpus import many_functions
+from incremental_parser import IncrementalParser
+from parser import Parser
+
+LINES_PER_FUNCTION = 5
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, nargs="+", default=[100, 1000, 10000])
+    ap.add_argument("--edits", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    print(f"{'functions':>10} {'full parse ms':>14} {'edit us':>9}")
+    for functions in args.functions:
+        source = many_functions(functions)
+        start = time.perf_counter()
+        Parser(source).parse()
+        full = time.perf_counter() - start
+
+        inc = IncrementalParser(source)
+        inc.stmts
+        line = (functions // 2) * LINES_PER_FUNCTION + 3
+        start = time.perf_counter()
+        for i in range(args.edits):
+            inc.edit(line, line + 1, [f"    0 => base + {i}"])
+        edit = (time.perf_counter() - start) / args.edits
+        print(f"{functions:>10} {full * 1e3:>14.1f} {edit * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Lexer throughput: master-regex scanner vs. the original if/elif chain.
+
+Run from the repository root:
+
+    python -m benchmarks.lexer_throughput [--lines N] [--width N]
+"""
+import argparse
+import re
+import time
+
+from lexer import Lexer, Token, TokenType
+
+
+class ChainLexer(Lexer):
+    """The original if/elif scanner, kept as the comparison baseline."""
+
+    def _tokenize_line(self, line: str, pos: int, tokens: list):
+        text, start_column = line[pos:], pos
+        pos = 0
+        while pos < len(text):
+            current_col = start_column + pos
+            if text.startswith("_", pos) and (pos + 1 == len(text) or not text[pos + 1].isalnum()):
+                tokens.append(Token(TokenType.UNDERSCORE, "_", self.line_num, current_col))
+                pos += 1
+            elif m := re.match(r'[a-zA-Z_][a-zA-Z0-9_]*', text[pos:]):
+                word = m.group(0)
+                tok_type = self.KEYWORDS.get(word, TokenType.IDENT)
+                tokens.append(Token(tok_type, word, self.line_num, current_col))
+                pos += len(word)
+            elif m := re.match(r'\d+', text[pos:]):
+                num = m.group(0)
+                tokens.append(Token(TokenType.NUMBER, num, self.line_num, current_col))
+                pos += len(num)
+            elif text[pos] == '"':
+                end = text.find('"', pos + 1)
+                if end == -1:
+                    raise SyntaxError(f"Unclosed string starting at line {self.line_num + 1}, column {current_col}")
+                value = text[pos + 1:end]
+                tokens.append(Token(TokenType.STRING, value, self.line_num, current_col))
+                pos = end + 1
+            elif text.startswith("and", pos) and not text[pos + 3:pos + 4].isalnum():
+                tokens.append(Token(TokenType.AND, "and", self.line_num, current_col))
+                pos += 3
+            elif text.startswith("or", pos) and not text[pos + 2:pos + 3].isalnum():
+                tokens.append(Token(TokenType.OR, "or", self.line_num, current_col))
+                pos += 2
+            elif text.startswith("not", pos) and not text[pos + 3:pos + 4].isalnum():
+                tokens.append(Token(TokenType.NOT, "not", self.line_num, current_col))
+                pos += 3
+            elif text[pos:].startswith('->'):
+                tokens.append(Token(TokenType.ARROW, '->', self.line_num, current_col))
+                pos += 2
+            elif text[pos:].startswith('=>'):
+                tokens.append(Token(TokenType.FAT_ARROW, '=>', self.line_num, current_col))
+                pos += 2
+            elif text[pos:].startswith('..'):
+                tokens.append(Token(TokenType.RANGE, '..', self.line_num, current_col))
+                pos += 2
+            elif text[pos] == '+':
+                tokens.append(Token(TokenType.PLUS, '+', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '-':
+                tokens.append(Token(TokenType.MINUS, '-', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '*':
+                tokens.append(Token(TokenType.STAR, '*', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '/':
+                tokens.append(Token(TokenType.SLASH, '/', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '=':
+                tokens.append(Token(TokenType.ASSIGN, '=', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == ':':
+                tokens.append(Token(TokenType.COLON, ':', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == ',':
+                tokens.append(Token(TokenType.COMMA, ',', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '(':
+                tokens.append(Token(TokenType.LPAREN, '(', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == ')':
+                tokens.append(Token(TokenType.RPAREN, ')', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == '[':
+                tokens.append(Token(TokenType.LBRACKET, '[', self.line_num, current_col))
+                pos += 1
+            elif text[pos] == ']':
+                tokens.append(Token(TokenType.RBRACKET, ']', self.line_num, current_col))
+                pos += 1
+            elif text[pos] in ' \t':
+                pos += 1  # skip extra whitespace
+            elif text.startswith(">>>", pos):
+                raise SyntaxError(f"Unexpected operator '>>>' at line {self.line_num + 1}, column {current_col}")
+            elif text.startswith(">>", pos):
+                raise SyntaxError(f"Unexpected operator '>>' at line {self.line_num + 1}, column {current_col}")
+            elif text.startswith(">=", pos):
+                tokens.append(Token(TokenType.GTE, ">=", self.line_num, current_col))
+                pos += 2
+            elif text.startswith("<=", pos):
+                tokens.append(Token(TokenType.LTE, "<=", self.line_num, current_col))
+                pos += 2
+            elif text.startswith(">", pos):
+                tokens.append(Token(TokenType.GT, ">", self.line_num, current_col))
+                pos += 1
+            elif text.startswith("<", pos):
+                tokens.append(Token(TokenType.LT, "<", self.line_num, current_col))
+                pos += 1
+            elif text.startswith("==", pos):
+                tokens.append(Token(TokenType.EQ, "==", self.line_num, current_col))
+                pos += 2
+            elif text.startswith("!=", pos):
+                tokens.append(Token(TokenType.NEQ, "!=", self.line_num, current_col))
+                pos += 2
+            elif text.startswith("true", pos) and not text[pos + 4:pos + 5].isalnum():
+                tokens.append(Token(TokenType.BOOL, "true", self.line_num, current_col))
+                pos += 4
+            elif text.startswith("false", pos) and not text[pos + 5:pos + 6].isalnum():
+                tokens.append(Token(TokenType.BOOL, "false", self.line_num, current_col))
+                pos += 5
+            else:
+                raise SyntaxError(f"Unexpected character '{text[pos]}' at line {self.line_num + 1}, column {current_col}")
+
+
+def generate_source(lines, width):
+    """A program of `lines` top-level lets, each an expression roughly `width` chars long."""
+    out = []
+    for i in range(lines):
+        terms = []
+        length = 0
+        while length < width:
+            term = f"f_{i % 7}(x{len(terms)}, {len(terms) * 13}) * [a, b][0]"
+            terms.append(term)
+            length += len(term) + 3
+        out.append(f"let v{i}: Int = " + " + ".join(terms))
+    return "\n".join(out) + "\n"
+
+
+def measure(lexer_cls, source, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(lexer_cls(source).tokenize())
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--lines", type=int, default=2000)
+    ap.add_argument("--width", type=int, nargs="+", default=[80, 400, 2000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'width':>6} {'tokens':>9} {'chain tok/s':>13} {'regex tok/s':>13} {'speedup':>8}")
+    for width in args.width:
+        source = generate_source(max(1, args.lines * 80 // width), width)
+        expected = ChainLexer(source).tokenize()
+        if Lexer(source).tokenize() != expected:
+            raise SystemExit("token streams differ")
+        count, chain_time = measure(ChainLexer, source, args.repeat)
+        _, regex_time = measure(Lexer, source, args.repeat)
+        print(f"{width:>6} {count:>9} {count / chain_time:>13,.0f} {count / regex_time:>13,.0f} "
+              f"{chain_time / regex_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Run time of naive recursion in the tree walker, with and without memoize.
+
+Run from the repository root:
+
+    python -m benchmarks.memoization [--fib N] [--maxsize N]
+"""
+import argparse
+import time
+
+from interpreter import Interpreter
+from parser import Parser
+
+FIB = '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+fib({n})
+'''
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--fib", type=int, default=22)
+    ap.add_argument("--maxsize", type=int, default=256)
+    args = ap.parse_args(argv)
+
+    stmts = Parser(FIB.format(n=args.fib)).parse()
+    print(f"{'memoize':>8} {'seconds':>9} {'hits':>7} {'misses':>7}")
+    for memoize in (0, args.maxsize):
+        interpreter = Interpreter("tree", memoize=memoize)
+        start = time.perf_counter()
+        interpreter.eval_program(stmts)
+        seconds = time.perf_counter() - start
+        cache = interpreter.memo_caches.get("fib")
+        hits, misses = (cache.hits, cache.misses) if cache else ("-", "-")
+        print(f"{memoize:>8} {seconds:>9.4f} {hits:>7} {misses:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Parse time of parse_parallel against a single-process parse.
+
+Run from the repository root:
+
+    python -m benchmarks.parallel_parsing [--functions N] [--workers W ...]
+"""
+import argparse
+import os
+import time
+
+from benchmarks.corpus import many_functions
+from parallel_parser import parse_parallel
+from parser import Parser
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--functions", type=int, default=20000)
+    ap.add_argument("--workers", type=int, nargs="+",
+                    default=sorted({2, 4, os.cpu_count() or 1}))
+    args = ap.parse_args(argv)
+
+    source = many_functions(args.functions)
+    start = time.perf_counter()
+    expected = Parser(source).parse()
+    sequential = time.perf_counter() - start
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+    print(f"{1:>8} {sequential:>9.3f} {1.0:>8.2f}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        stmts = parse_parallel(source, workers, min_lines=0)
+        elapsed = time.perf_counter() - start
+        assert len(stmts) == len(expected)
+        print(f"{workers:>8} {elapsed:>9.3f} {sequential / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
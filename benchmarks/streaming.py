@@ -0,0 +1,45 @@
+"""Peak memory of eval_stream against parse-then-eval_program.
+
+The script is a generated data-loading program fed line by line, so its
+text is never held in memory as a whole. Run from the repository root:
+
+    python -m benchmarks.streaming [--rows N ...]
+"""
+import argparse
+import tracemalloc
+
+from interpreter import Interpreter
+from parser import Parser
+
+
+def data_script(rows):
+    yield "fn total(row: List[Int])\n"
+    yield "  row[0] + row[1] * row[2]\n"
+    for i in range(rows):
+        yield f"let row = [{i}, {i + 1}, {i + 2}]\n"
+        yield "let last = total(row)\n"
+
+
+def peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = ap.parse_args(argv)
+
+    print(f"{'rows':>8} {'eval_program KiB':>17} {'eval_stream KiB':>16}")
+    for rows in args.rows:
+        batch = peak(lambda: Interpreter().eval_program(Parser(data_script(rows)).parse()))
+        stream = peak(lambda: Interpreter().eval_stream(data_script(rows)))
+        print(f"{rows:>8} {batch / 1024:>17,.0f} {stream / 1024:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Token storage memory: Token dataclass list vs. struct-of-arrays TokenBuffer.
+
+Run from the repository root:
+
+    python -m benchmarks.token_memory [--tokens N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from lexer import Lexer
+from token_buffer import TokenBuffer
+
+LINE = "let total_{i}: Int = scale(x{i}, 1024) * [a, b][0] + offset_{i}"
+TOKENS_PER_LINE = len(Lexer(LINE.format(i=0)).tokenize()) - 1  # minus EOF
+
+
+def measure(build, source):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(source)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), current, peak, elapsed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tokens", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    lines = max(1, args.tokens // TOKENS_PER_LINE)
+    source = "\n".join(LINE.format(i=i) for i in range(lines)) + "\n"
+
+    print(f"{'storage':>12} {'tokens':>9} {'retained':>12} {'peak':>12} {'B/token':>8} {'seconds':>8}")
+    for name, build in (("dataclass", lambda s: Lexer(s).tokenize()),
+                        ("TokenBuffer", TokenBuffer.from_source)):
+        count, current, peak, elapsed = measure(build, source)
+        print(f"{name:>12} {count:>9} {current:>12,} {peak:>12,} {current / count:>8.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Cost of reading parameters from inside nested if blocks, per backend.
+
+With --nesting N, each read of `a` or `b` in the innermost block crosses N
+if blocks, each of which binds a name and so opens a scope: N dict probes
+up an Environment chain by name, against one (depth, slot) read in the
+tree walker and the closure backend. Run from the repository root:
+
+    python -m benchmarks.variable_access [--nesting N] [--calls N]
+"""
+import argparse
+import sys
+import time
+
+from interpreter import BACKENDS, Interpreter
+from parser import Parser
+
+
+def program(nesting, calls):
+    lines = ["fn walk(n: Int, a: Int, b: Int)", "  if n > 0"]
+    for level in range(nesting):
+        lines.append("  " * (level + 2) + "if a > 0")
+        lines.append("  " * (level + 3) + f"let c{level} = {level}")
+    lines.append("  " * (nesting + 2) + "a + b + a + b + a + b + a + b + walk(n - 1, a, b)")
+    lines += ["  else", "    0", f"walk({calls}, 1, 2)"]
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["tree", "closure"])
+    ap.add_argument("--nesting", type=int, default=8)
+    ap.add_argument("--calls", type=int, default=300)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args(argv)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100 * args.calls))
+
+    stmts = Parser(program(args.nesting, args.calls)).parse()
+    # Runs alternate between backends, so that machine noise hits all alike.
+    best = dict.fromkeys(args.backends, float("inf"))
+    for _ in range(args.repeat):
+        for backend in args.backends:
+            interpreter = Interpreter(backend)
+            start = time.perf_counter()
+            interpreter.eval_program(stmts)
+            best[backend] = min(best[backend], time.perf_counter() - start)
+    print(f"{'backend':>9} {'ms':>8} {'speedup':>8}")
+    baseline = best[args.backends[0]]
+    for backend, seconds in best.items():
+        print(f"{backend:>9} {seconds * 1000:>8.2f} {baseline / seconds:>8.2f}")
+
+if __name__ == "__main__":
+    main()
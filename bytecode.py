@@ -0,0 +1,360 @@
+import operator
+from array import array
+
+from fluent_ast import FnDecl, Number
+from interpreter import type_predicate
+from symbols import symbol_name
+from visitor import MethodTable, Visitor
+
+# Opcodes. Every instruction is two ints in Code.ops: the opcode and its arg.
+OPCODES = [
+    "LOAD_FAST",             # push slots[arg]
+    "CONST",                 # push consts[arg]
+    "LOAD_NAME",             # push the value of symbol arg, looked up through the callers
+    "BINARY",                # pop right, left; push BINARY_OPS[arg](left, right)
+    "BINARY_CONST",          # left op consts[arg >> 4], with BINARY_OPS[arg & 15]
+    "CALL",                  # call with consts[arg], a CallSite
+    "RETURN_VALUE",          # return top of stack from the frame
+    "POP",                   # drop top of stack
+    "MATCH",                 # pop value; jump through consts[arg], a MatchTable
+    "JUMP",                  # jump to arg
+    "POP_JUMP_IF_FALSE",     # pop; jump to arg if false
+    "CHECK_BOOL",            # raise unless top of stack is a bool (if conditions)
+    "STORE_FAST",            # slots[arg] = top of stack (kept)
+    "STORE_ENV",             # bind symbol arg in the frame's environment to top of stack (kept)
+    "CHECK_TYPE",            # raise unless top of stack matches the let annotation consts[arg]
+    "BUILD_LIST",            # pop arg items; push them as a list
+    "INDEX",                 # pop index, target; push target[index]
+    "JUMP_IF_FALSE_OR_POP",  # `and`: keep a falsy left operand and jump to arg
+    "JUMP_IF_TRUE_OR_POP",   # `or`: keep a truthy left operand and jump to arg
+    "NOT",                   # replace top of stack with its negation
+    "RAISE",                 # raise consts[arg], an (exception type, message) pair
+    "RAISE_RETURN",          # `return` outside any function: raise ReturnException(top of stack)
+]
+(LOAD_FAST, CONST, LOAD_NAME, BINARY, BINARY_CONST, CALL, RETURN_VALUE, POP, MATCH, JUMP, POP_JUMP_IF_FALSE, CHECK_BOOL,
+ STORE_FAST, STORE_ENV, CHECK_TYPE, BUILD_LIST, INDEX, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP,
+ NOT, RAISE, RAISE_RETURN) = range(len(OPCODES))
+
+BINARY_OPS = [
+    ("+", operator.add), ("-", operator.sub), ("*", operator.mul), ("/", operator.truediv),
+    (">", operator.gt), ("<", operator.lt), (">=", operator.ge), ("<=", operator.le),
+    ("==", operator.eq), ("!=", operator.ne),
+]
+BINARY_INDEX = {op: i for i, (op, _) in enumerate(BINARY_OPS)}
+
+
+class CallSite:
+    """Constant operand of CALL.
+
+    `visible` maps each symbol bound in a slot at the call site to its
+    slots, innermost first; a callee looking up a name it does not bind
+    itself searches these, mirroring the caller's environment chain. Only
+    bindings made before the call site are listed, so they are all set.
+    `fn` and `code` cache the function last called from here.
+    """
+    __slots__ = ("nargs", "name", "visible", "fn", "code")
+
+    def __init__(self, nargs, name, visible):
+        self.nargs = nargs
+        self.name = name
+        self.visible = visible
+        self.fn = None
+        self.code = None
+
+    def __repr__(self):
+        return f"{self.name}/{self.nargs}"
+
+
+class MatchTable:
+    """Constant operand of MATCH: arm targets by pattern, up to the first wildcard."""
+    __slots__ = ("targets", "default")
+
+    def __init__(self):
+        self.targets = {}
+        self.default = -1
+
+    def __repr__(self):
+        arms = ", ".join(f"{pattern!r} -> {target}" for pattern, target in self.targets.items())
+        return f"{{{arms}, _ -> {self.default}}}"
+
+
+class Code:
+    """A compiled function body or top-level program.
+
+    For a function, `checks` holds (slot, predicate) for each annotated
+    parameter and `return_check` the predicate for its return type.
+    """
+
+    def __init__(self, name, ops, consts, slot_names, fn=None):
+        self.name = name
+        self.ops = ops
+        self.consts = consts
+        self.slot_names = slot_names
+        self.nslots = len(slot_names)
+        self.fn = fn
+        self.checks = ()
+        self.return_check = None
+
+
+class Compiler(Visitor):
+    """Compiles statements to a Code object.
+
+    Parameters and `let`s inside a function, and `let`s in any block, live
+    in slots of the frame; each binding gets its own slot, so a block's
+    bindings simply stop being referenced once it is compiled. Top-level
+    bindings go to the environment the program runs in. Any other name is
+    resolved at run time by LOAD_NAME.
+    """
+    _expr_compilers = MethodTable("expr_", "_unsupported_expr")
+    _stmt_compilers = MethodTable("stmt_", "_unsupported_stmt")
+
+    def __init__(self, fn=None):
+        self.fn = fn
+        self.ops = array("i")
+        self.consts = []
+        self._const_index = {}
+        self.slot_names = []
+        # Scopes as dicts of symbol -> slot. At top level the outermost
+        # scope is the environment itself, represented by None.
+        self.scopes = [{}] if fn is not None else [None]
+
+    @classmethod
+    def compile_program(cls, stmts):
+        compiler = cls()
+        compiler.stmts(stmts)
+        compiler.emit(RETURN_VALUE)
+        return compiler.code("<program>")
+
+    @classmethod
+    def compile_expression(cls, expr):
+        compiler = cls()
+        compiler.expr(expr)
+        compiler.emit(RETURN_VALUE)
+        return compiler.code("<expr>")
+
+    @classmethod
+    def compile_function(cls, fn):
+        compiler = cls(fn)
+        for param in fn.params:
+            compiler.bind(param.sym)
+        compiler.stmts(fn.body)
+        compiler.emit(RETURN_VALUE)
+        code = compiler.code(fn.name)
+        code.checks = tuple((slot, type_predicate(param.type_annotation))
+                            for slot, param in enumerate(fn.params) if param.type_annotation)
+        if fn.return_type:
+            code.return_check = type_predicate(fn.return_type)
+        return code
+
+    def code(self, name):
+        ops = self.ops
+        # A jump to a return returns directly (the end of every match arm
+        # and if branch in tail position).
+        for pc in range(0, len(ops), 2):
+            if ops[pc] == JUMP and ops[pc + 1] < len(ops) and ops[ops[pc + 1]] == RETURN_VALUE:
+                ops[pc] = RETURN_VALUE
+        return Code(name, ops, self.consts, self.slot_names, self.fn)
+
+    # --- Emitting ---
+
+    def emit(self, op, arg=0):
+        self.ops.append(op)
+        self.ops.append(arg)
+        return len(self.ops) - 1  # position of the arg, for patching jumps
+
+    def label(self):
+        return len(self.ops)
+
+    def patch(self, at, target=None):
+        self.ops[at] = self.label() if target is None else target
+
+    def const(self, value):
+        # Unhashable and identity-sensitive constants get their own entry.
+        try:
+            key = (type(value), value)
+            index = self._const_index.get(key)
+        except TypeError:
+            key = index = None
+        if index is None:
+            index = len(self.consts)
+            self.consts.append(value)
+            if key is not None:
+                self._const_index[key] = index
+        return index
+
+    def bind(self, sym):
+        scope = self.scopes[-1]
+        if scope is None:
+            self.emit(STORE_ENV, sym)
+            return
+        slot = scope[sym] = len(self.slot_names)
+        self.slot_names.append(symbol_name(sym))
+        return slot
+
+    def visible(self):
+        visible = {}
+        for scope in reversed(self.scopes):
+            for sym, slot in (scope or {}).items():
+                visible.setdefault(sym, []).append(slot)
+        return {sym: tuple(slots) for sym, slots in visible.items()}
+
+    def load_name(self, sym):
+        for scope in reversed(self.scopes):
+            if scope is not None and sym in scope:
+                self.emit(LOAD_FAST, scope[sym])
+                return
+        self.emit(LOAD_NAME, sym)
+
+    # --- Statements ---
+
+    def stmts(self, stmts):
+        """Compile `stmts` so that only the last one's value stays on the stack."""
+        if not stmts:
+            self.emit(CONST, self.const(None))
+        for i, stmt in enumerate(stmts):
+            if i:
+                self.emit(POP)
+            self._stmt_compilers[type(stmt)](self, stmt)
+
+    def block(self, stmts):
+        self.scopes.append({})
+        self.stmts(stmts)
+        self.scopes.pop()
+
+    def stmt_LetStmt(self, stmt):
+        self.expr(stmt.value)
+        if stmt.type_annotation:
+            self.emit(CHECK_TYPE, self.const(stmt.type_annotation))
+        self.store(stmt.sym)
+
+    def stmt_FnDecl(self, stmt):
+        self.emit(CONST, self.const(stmt))
+        self.store(stmt.sym)
+
+    def store(self, sym):
+        # The binding becomes visible only after its value is computed.
+        slot = self.bind(sym)
+        if slot is not None:
+            self.emit(STORE_FAST, slot)
+
+    def stmt_ExprStmt(self, stmt):
+        self.expr(stmt.expr)
+
+    def stmt_Return(self, stmt):
+        self.expr(stmt.expr)
+        self.emit(RETURN_VALUE if self.fn is not None else RAISE_RETURN)
+
+    def _unsupported_stmt(self, stmt):
+        self.emit(RAISE, self.const((NotImplementedError, f"Unsupported statement: {type(stmt)}")))
+
+    # --- Expressions ---
+
+    def expr(self, expr):
+        self._expr_compilers[type(expr)](self, expr)
+
+    def expr_Number(self, expr):
+        self.emit(CONST, self.const(expr.value))
+
+    expr_String = expr_Boolean = expr_Number
+
+    def expr_Var(self, expr):
+        self.load_name(expr.sym)
+
+    def expr_ListLiteral(self, expr):
+        for elem in expr.elements:
+            self.expr(elem)
+        self.emit(BUILD_LIST, len(expr.elements))
+
+    def expr_IndexExpr(self, expr):
+        self.expr(expr.target)
+        self.expr(expr.index)
+        self.emit(INDEX)
+
+    def expr_Binary(self, expr):
+        op = expr.op
+        if op in ("and", "or", "and not"):
+            self.expr(expr.left)
+            jump = self.emit(JUMP_IF_TRUE_OR_POP if op == "or" else JUMP_IF_FALSE_OR_POP)
+            self.expr(expr.right)
+            if op == "and not":
+                self.emit(NOT)
+            self.patch(jump)
+        elif op in BINARY_INDEX and type(expr.right) is Number:
+            self.expr(expr.left)
+            self.emit(BINARY_CONST, self.const(expr.right.value) << 4 | BINARY_INDEX[op])
+        elif op in BINARY_INDEX:
+            self.expr(expr.left)
+            self.expr(expr.right)
+            self.emit(BINARY, BINARY_INDEX[op])
+        else:
+            self.emit(RAISE, self.const((NotImplementedError, f"Unsupported operator: {op}")))
+
+    def expr_IfExpr(self, expr):
+        self.expr(expr.condition)
+        self.emit(CHECK_BOOL)
+        to_else = self.emit(POP_JUMP_IF_FALSE)
+        self.block(expr.then_branch)
+        to_end = self.emit(JUMP)
+        self.patch(to_else)
+        if expr.else_branch is None:
+            self.emit(CONST, self.const(None))
+        else:
+            self.block(expr.else_branch)
+        self.patch(to_end)
+
+    def expr_MatchExpr(self, expr):
+        self.expr(expr.matched_expr)
+        table = MatchTable()
+        self.consts.append(table)
+        self.emit(MATCH, len(self.consts) - 1)
+        ends = []
+        for case in expr.cases:
+            wildcard = case.pattern == "_"
+            if not wildcard and not isinstance(case.pattern, (int, str)):
+                continue  # never matches in the tree walker either
+            if wildcard:
+                table.default = self.label()
+            else:
+                table.targets.setdefault(case.pattern, self.label())
+            self.expr(case.expr)
+            ends.append(self.emit(JUMP))
+            if wildcard:
+                break  # later arms are unreachable
+        for at in ends:
+            self.patch(at)
+
+    def expr_Call(self, expr):
+        self.load_name(expr.sym)
+        for arg in expr.args:
+            self.expr(arg)
+        self.consts.append(CallSite(len(expr.args), expr.func, self.visible()))
+        self.emit(CALL, len(self.consts) - 1)
+
+    def _unsupported_expr(self, expr):
+        self.emit(RAISE, self.const((NotImplementedError, f"Unsupported expression: {type(expr)}")))
+
+
+def disassemble(code: Code) -> str:
+    """One line per instruction: offset, opcode, arg and what the arg refers to."""
+    lines = [f"code {code.name} ({code.nslots} slots)"]
+    ops = code.ops
+    for pc in range(0, len(ops), 2):
+        op, arg = ops[pc], ops[pc + 1]
+        name = OPCODES[op]
+        if op == CONST and isinstance(code.consts[arg], FnDecl):
+            note = f"<fn {code.consts[arg].name}>"
+        elif op in (CONST, MATCH, CALL, CHECK_TYPE, RAISE):
+            note = repr(code.consts[arg])
+        elif op in (LOAD_FAST, STORE_FAST):
+            note = code.slot_names[arg]
+        elif op in (LOAD_NAME, STORE_ENV):
+            note = symbol_name(arg)
+        elif op == BINARY:
+            note = BINARY_OPS[arg][0]
+        elif op == BINARY_CONST:
+            note = f"{BINARY_OPS[arg & 15][0]} {code.consts[arg >> 4]!r}"
+        else:
+            note = ""
+        uses_arg = op not in (RETURN_VALUE, POP, CHECK_BOOL, INDEX, NOT, RAISE_RETURN)
+        lines.append(f"{pc:>6}  {name:<20} {arg if uses_arg else '':<6} {note}".rstrip())
+    return "\n".join(lines)
@@ -0,0 +1,389 @@
+from fluent_ast import ExprStmt, FnDecl, IfExpr, MatchExpr, Number, Return
+from interpreter import (
+    BINDING_STMTS, BuiltInFunction, Completion, Interpreter, ReturnException, check_type, drop_cached, format_type,
+    type_predicate
+)
+from resolver import Frame, Resolver, Scope, lookup
+from visitor import MethodTable
+
+# One closure factory per operator, so evaluating a Binary never compares
+# `op` strings. The second table covers a literal right operand (n - 1).
+_BINARY = {
+    "and": lambda l, r: lambda frame: l(frame) and r(frame),
+    "or": lambda l, r: lambda frame: l(frame) or r(frame),
+    "and not": lambda l, r: lambda frame: l(frame) and not r(frame),
+    "+": lambda l, r: lambda frame: l(frame) + r(frame),
+    "-": lambda l, r: lambda frame: l(frame) - r(frame),
+    "*": lambda l, r: lambda frame: l(frame) * r(frame),
+    "/": lambda l, r: lambda frame: l(frame) / r(frame),
+    ">": lambda l, r: lambda frame: l(frame) > r(frame),
+    "<": lambda l, r: lambda frame: l(frame) < r(frame),
+    ">=": lambda l, r: lambda frame: l(frame) >= r(frame),
+    "<=": lambda l, r: lambda frame: l(frame) <= r(frame),
+    "==": lambda l, r: lambda frame: l(frame) == r(frame),
+    "!=": lambda l, r: lambda frame: l(frame) != r(frame),
+}
+_BINARY_CONST = {
+    "+": lambda l, c: lambda frame: l(frame) + c,
+    "-": lambda l, c: lambda frame: l(frame) - c,
+    "*": lambda l, c: lambda frame: l(frame) * c,
+    ">": lambda l, c: lambda frame: l(frame) > c,
+    "<": lambda l, c: lambda frame: l(frame) < c,
+    ">=": lambda l, c: lambda frame: l(frame) >= c,
+    "<=": lambda l, c: lambda frame: l(frame) <= c,
+    "==": lambda l, c: lambda frame: l(frame) == c,
+    "!=": lambda l, c: lambda frame: l(frame) != c,
+}
+
+
+def _raise(error):
+    def fail(frame):
+        raise error
+    return fail
+
+
+def _may_return(stmts):
+    """Whether running `stmts` as a block can end in a return's Completion."""
+    return any(type(stmt) is Return or type(stmt) is ExprStmt and _expr_may_return(stmt.expr) for stmt in stmts)
+
+
+def _expr_may_return(expr):
+    # Only an if or match in statement position passes a Completion on.
+    if type(expr) is IfExpr:
+        return _may_return(expr.then_branch) or expr.else_branch is not None and _may_return(expr.else_branch)
+    if type(expr) is MatchExpr:
+        return any(_expr_may_return(case.expr) for case in expr.cases)
+    return False
+
+
+class ClosureInterpreter(Interpreter):
+    """Compiles each node once into a Python closure taking the current frame.
+
+    Evaluation is then just closure calls: node types, operators, call
+    arities and match patterns were all decided at compile time. Function
+    bodies and if branches run in resolver Frames, so a name bound in the
+    same function is read straight from its (depth, slot) address; other
+    names are looked up dynamically, as in the tree walker. Function bodies
+    are compiled on their first call and kept per FnDecl. Top-level
+    statements run against the Environment. Type checks and error
+    messages are those of the tree walker.
+    """
+    backend = "closure"
+    supports_tail_calls = False
+    supports_memoize = False
+    _expr_compilers = MethodTable("expr_", "_unsupported_expr_code")
+    _stmt_compilers = MethodTable("stmt_", "_unsupported_stmt_code")
+
+    def __init__(self, backend=None, **options):
+        super().__init__(**options)
+        self._functions = {}  # id(FnDecl) -> (FnDecl, compiled body)
+        self._resolver = Resolver()
+
+    def eval_expr(self, expr, env):
+        return self.compile_expr(expr)(env)
+
+    def _exec_stmt(self, stmt, env):
+        return self.compile_stmt(stmt)(env)
+
+    def compile_expr(self, expr):
+        return self._expr_compilers[type(expr)](self, expr)
+
+    def compile_stmt(self, stmt):
+        return self._stmt_compilers[type(stmt)](self, stmt)
+
+    def compile_block(self, stmts):
+        """A closure running `stmts` in a new Frame, returning the last value.
+
+        Blocks that bind nothing get no Frame and run in the current one.
+        """
+        if not any(type(stmt) in BINDING_STMTS for stmt in stmts):
+            return self.compile_sequence([self.compile_stmt(stmt) for stmt in stmts], _may_return(stmts))
+        scope = self._resolver.push(Scope())
+        try:
+            run = self.compile_sequence([self.compile_stmt(stmt) for stmt in stmts], _may_return(stmts))
+        finally:
+            self._resolver.pop()
+        return lambda frame: run(Frame(scope, frame))
+
+    @staticmethod
+    def compile_sequence(code, returns=False):
+        """A closure running the compiled statements `code` in order, returning the last value.
+
+        With `returns`, a statement may give a Completion, which ends the sequence.
+        """
+        if not code:
+            return lambda frame: None
+        if len(code) == 1:
+            return code[0]
+        if returns:
+            def sequence(frame):
+                result = None
+                for stmt in code:
+                    result = stmt(frame)
+                    if type(result) is Completion:
+                        break
+                return result
+            return sequence
+
+        def sequence(frame):
+            result = None
+            for stmt in code:
+                result = stmt(frame)
+            return result
+        return sequence
+
+    # --- Statements ---
+
+    def stmt_LetStmt(self, stmt):
+        value, sym, annotation = self.compile_expr(stmt.value), stmt.sym, stmt.type_annotation
+        slot = self._resolver.bind(sym)
+
+        def let(frame):
+            result = value(frame)
+            if annotation and not check_type(result, annotation):
+                raise TypeError(f"Type mismatch: expected {annotation}, got {type(result).__name__}")
+            if slot is None:
+                frame.values[sym] = result  # top level: the Environment
+            else:
+                frame.slots[slot] = result
+            return result
+        return let
+
+    def stmt_FnDecl(self, stmt):
+        sym = stmt.sym
+        slot = self._resolver.bind(sym)
+
+        def declare(frame):
+            if slot is None:
+                frame.values[sym] = stmt
+            else:
+                frame.slots[slot] = stmt
+            return stmt
+        return declare
+
+    def stmt_ExprStmt(self, stmt):
+        return self.compile_completing(stmt.expr)
+
+    def stmt_Return(self, stmt):
+        value = self.compile_expr(stmt.expr)
+        return lambda frame: Completion(value(frame))
+
+    def _unsupported_stmt_code(self, stmt):
+        return _raise(NotImplementedError(f"Unsupported statement: {type(stmt)}"))
+
+    # --- Expressions ---
+
+    def expr_Number(self, expr):
+        value = expr.value
+        return lambda frame: value
+
+    expr_String = expr_Boolean = expr_Number
+
+    def expr_Var(self, expr):
+        return self.compile_name(expr)
+
+    def compile_name(self, node):
+        """A closure reading the name `node` (a Var or a Call's callee) uses."""
+        sym = node.sym
+        address = self._resolver.address(sym)
+        if address is None:
+            if not self._resolver.chain:  # top level: `frame` is the Environment
+                return lambda env: env.lookup(sym)
+            return lambda frame: lookup(frame, sym)
+        depth, slot = address
+        if depth == 0:
+            return lambda frame: frame.slots[slot]
+        if depth == 1:
+            return lambda frame: frame.parent.slots[slot]
+
+        def var(frame):
+            for _ in range(depth):
+                frame = frame.parent
+            return frame.slots[slot]
+        return var
+
+    def expr_ListLiteral(self, expr):
+        elements = [self.compile_expr(elem) for elem in expr.elements]
+        return lambda frame: [elem(frame) for elem in elements]
+
+    def expr_IndexExpr(self, expr):
+        target, index = self.compile_expr(expr.target), self.compile_expr(expr.index)
+
+        def index_(frame):
+            sequence = target(frame)
+            i = index(frame)
+            if not isinstance(i, int):
+                raise TypeError(f"List index must be an integer, got {type(i).__name__}")
+            try:
+                return sequence[i]
+            except (TypeError, IndexError) as e:
+                raise RuntimeError(f"Indexing failed: {e}")
+        return index_
+
+    def expr_Binary(self, expr):
+        left = self.compile_expr(expr.left)
+        if expr.op in _BINARY_CONST and type(expr.right) is Number:
+            return _BINARY_CONST[expr.op](left, expr.right.value)
+        right = self.compile_expr(expr.right)
+        factory = _BINARY.get(expr.op)
+        if factory is None:
+            return _raise(NotImplementedError(f"Unsupported operator: {expr.op}"))
+        return factory(left, right)
+
+    def compile_completing(self, expr):
+        """Like compile_expr, but an if or match compiled here is a statement
+        of its own: a return in it gives its Completion rather than raising."""
+        if type(expr) is IfExpr:
+            return self.compile_if(expr)
+        if type(expr) is MatchExpr:
+            return self.compile_match(expr, self.compile_completing)
+        return self.compile_expr(expr)
+
+    def expr_IfExpr(self, expr):
+        code = self.compile_if(expr)
+        if not _expr_may_return(expr):
+            return code
+
+        def operand(frame):
+            result = code(frame)
+            if type(result) is Completion:
+                raise ReturnException(result.value)
+            return result
+        return operand
+
+    def expr_MatchExpr(self, expr):
+        return self.compile_match(expr, self.compile_expr)
+
+    def compile_if(self, expr):
+        condition = self.compile_expr(expr.condition)
+        then_branch = self.compile_block(expr.then_branch)
+        else_branch = self.compile_block(expr.else_branch) if expr.else_branch is not None else None
+
+        def if_(frame):
+            cond = condition(frame)
+            if not isinstance(cond, bool):
+                raise TypeError(f"If condition must be a boolean, got: {type(cond).__name__}")
+            if cond:
+                return then_branch(frame)
+            return else_branch(frame) if else_branch is not None else None
+        return if_
+
+    def compile_match(self, expr, compile_arm):
+        subject = self.compile_expr(expr.matched_expr)
+        # (wildcard, pattern, body); patterns that can never match are dropped.
+        cases = tuple((case.pattern == "_", case.pattern, compile_arm(case.expr))
+                      for case in expr.cases
+                      if case.pattern == "_" or isinstance(case.pattern, (int, str)))
+
+        # Patterns up to the first wildcard, hashed: dict lookup compares
+        # with == like the tree walker, and the first duplicate wins.
+        table, default = {}, None
+        for wildcard, pattern, body in cases:
+            if wildcard:
+                default = body
+                break
+            table.setdefault(pattern, body)
+
+        def match(frame):
+            value = subject(frame)
+            try:
+                body = table.get(value, default)
+            except TypeError:  # unhashable values never equal a pattern
+                body = default
+            if body is None:
+                raise ValueError(f"No match found for value: {value}")
+            return body(frame)
+        return match
+
+    def expr_Call(self, expr):
+        name = expr.func
+        callee = self.compile_name(expr)
+        args = [self.compile_expr(arg) for arg in expr.args]
+        compiled = self.compiled_function
+        if len(args) == 0:
+            evaluate = lambda frame: []
+        elif len(args) == 1:
+            a0, = args
+            evaluate = lambda frame: [a0(frame)]
+        elif len(args) == 2:
+            a0, a1 = args
+            evaluate = lambda frame: [a0(frame), a1(frame)]
+        else:
+            evaluate = lambda frame: [arg(frame) for arg in args]
+        # Inline cache: the function this call site last ran, and its code.
+        cache = [None, None]
+
+        def call(frame):
+            fn = callee(frame)
+            values = evaluate(frame)
+            if fn is cache[0]:
+                return cache[1](frame, values)
+            if isinstance(fn, FnDecl):
+                cache[1] = run = compiled(fn)
+                cache[0] = fn
+                return run(frame, values)
+            elif isinstance(fn, BuiltInFunction):
+                return fn.call(values)
+            raise TypeError(f"'{name}' is not a function")
+        return call
+
+    def _unsupported_expr_code(self, expr):
+        return _raise(NotImplementedError(f"Unsupported expression: {type(expr)}"))
+
+    # --- Functions ---
+
+    def compiled_function(self, fn):
+        entry = self._functions.get(id(fn))
+        if entry is None or entry[0] is not fn:
+            entry = self._functions[id(fn)] = (fn, self.compile_function(fn))
+        return entry[1]
+
+    def _forget_function(self, fn):
+        super()._forget_function(fn)
+        drop_cached(self._functions, fn)
+
+    def compile_function(self, fn):
+        """A closure `(caller_frame, args) -> result` for the body of `fn`."""
+        outer, self._resolver = self._resolver, Resolver(fn)
+        try:
+            scope = self._resolver.chain[0]
+            body = [self.compile_stmt(stmt) for stmt in fn.body]
+        finally:
+            self._resolver = outer
+        slots = [scope.index[param.sym] for param in fn.params]
+        # Distinct parameters take the first slots, in order.
+        in_order = slots == list(range(len(slots)))
+        checks = [(scope.index[param.sym], param.name, param.type_annotation, type_predicate(param.type_annotation))
+                  for param in fn.params if param.type_annotation]
+        returns = _may_return(fn.body)
+        run_body = self.compile_sequence(body, returns)
+        return_type = fn.return_type
+        check_return = type_predicate(return_type) if return_type else None
+        arity = len(slots)
+
+        def run(caller, values):
+            # Callee frames hang off the caller's, as environments do in eval_Call.
+            local = Frame(scope, caller)
+            if len(values) != arity:
+                raise ValueError(f"Function '{fn.name}' expects {arity} arguments, got {len(values)}")
+            if in_order:
+                local.slots[:arity] = values
+            else:
+                for slot, value in zip(slots, values):
+                    local.slots[slot] = value
+            for slot, name, annotation, check in checks:
+                value = local.slots[slot]
+                if not check(value):
+                    raise TypeError(
+                        f"Type mismatch in parameter '{name}': expected {format_type(annotation)}, got {type(value).__name__}")
+            try:
+                result = run_body(local)
+            except ReturnException as re:
+                result = re.value
+            if returns and type(result) is Completion:
+                result = result.value
+            if check_return is not None and not check_return(result):
+                raise TypeError(
+                    f"Return type mismatch in function '{fn.name}': expected {format_type(return_type)}, got {type(result).__name__}")
+            return result
+        return run
@@ -0,0 +1,194 @@
+import marshal
+import struct
+from array import array
+from dataclasses import fields, is_dataclass
+
+from fluent_ast import (
+    Number, String, Var, Boolean, Binary, Call, IfExpr, MatchCase, MatchExpr, ListLiteral, IndexExpr,
+    LetStmt, FnParam, FnDecl, ExprStmt, Return, SimpleType, ListType
+)
+
+# Kind codes are part of the serialized format: append, never reorder.
+KINDS = (
+    Number, String, Var, Boolean, Binary, Call, IfExpr, MatchCase, MatchExpr, ListLiteral, IndexExpr,
+    LetStmt, FnParam, FnDecl, ExprStmt, Return, SimpleType, ListType,
+)
+KIND_CODES = {cls: code for code, cls in enumerate(KINDS)}
+FIELDS = tuple(tuple(f.name for f in fields(cls) if f.init) for cls in KINDS)
+FIELD_INDEX = tuple({name: i for i, name in enumerate(names)} for names in FIELDS)
+# Fields holding a list of nodes (or None, for an if without else).
+LIST_FIELDS = frozenset({
+    (Call, "args"), (IfExpr, "then_branch"), (IfExpr, "else_branch"), (MatchExpr, "cases"),
+    (ListLiteral, "elements"), (FnDecl, "params"), (FnDecl, "body"),
+})
+_IS_LIST = tuple(tuple((cls, name) in LIST_FIELDS for name in names) for cls, names in zip(KINDS, FIELDS))
+
+_MAGIC = b"FLA1"
+_HEADER = struct.Struct("<4sIII")
+
+
+class FlatAST:
+    """An AST stored as parallel arrays instead of one object per node.
+
+    Node `i` has kind code `kinds[i]` and one slot per field starting at
+    `slots[starts[i]]`, in `dataclasses.fields` order. A slot `v >= 0` is a
+    child node index; `v < 0` refers to `pool[~v]`, the table of literals,
+    names, operators and None. A list field's slot is instead the offset in
+    `slots` of its length followed by its items, or -1 for None. Children
+    always have higher indices than their parent; `roots` are the top-level
+    statements.
+    """
+
+    def __init__(self):
+        self.kinds = array("B")
+        self.starts = array("i")
+        self.slots = array("i")
+        self.roots = array("i")
+        self.pool = [None]
+        self._pool_index = {(type(None), None): 0}
+
+    @classmethod
+    def from_nodes(cls, stmts):
+        tree = cls()
+        for stmt in stmts:
+            tree.roots.append(tree.add(stmt))
+        return tree
+
+    def add(self, node):
+        """Append `node` and its whole subtree; returns the node's index."""
+        kinds, starts, slots = self.kinds, self.starts, self.slots
+        pending = []
+
+        def new_node(obj):
+            if not is_dataclass(obj):
+                return ~self._pool_value(obj)
+            kinds.append(KIND_CODES[type(obj)])
+            starts.append(-1)
+            pending.append((len(kinds) - 1, obj))
+            return len(kinds) - 1
+
+        index = new_node(node)
+        # Iterative, so left-leaning operator chains of any length fit.
+        while pending:
+            i, obj = pending.pop()
+            code = kinds[i]
+            base = starts[i] = len(slots)
+            slots.extend([0] * len(FIELDS[code]))
+            for k, (name, is_list) in enumerate(zip(FIELDS[code], _IS_LIST[code])):
+                value = getattr(obj, name)
+                if not is_list:
+                    slots[base + k] = new_node(value)
+                elif value is None:
+                    slots[base + k] = -1
+                else:
+                    slots[base + k] = len(slots)
+                    slots.append(len(value))
+                    offset = len(slots)
+                    slots.extend([0] * len(value))
+                    for j, item in enumerate(value):
+                        slots[offset + j] = new_node(item)
+        return index
+
+    def _pool_value(self, value):
+        key = (type(value), value)
+        index = self._pool_index.get(key)
+        if index is None:
+            index = self._pool_index[key] = len(self.pool)
+            self.pool.append(value)
+        return index
+
+    def __len__(self):
+        return len(self.kinds)
+
+    # --- Reading without materializing nodes ---
+
+    def kind(self, i):
+        return KINDS[self.kinds[i]]
+
+    def get(self, i, name):
+        """Field `name` of node `i`: a child index, a pool value, or for list
+        fields a list of those (None for a missing else branch)."""
+        code = self.kinds[i]
+        k = FIELD_INDEX[code][name]
+        slot = self.slots[self.starts[i] + k]
+        if not _IS_LIST[code][k]:
+            return slot if slot >= 0 else self.pool[~slot]
+        if slot < 0:
+            return None
+        items = self.slots[slot + 1:slot + 1 + self.slots[slot]]
+        return [v if v >= 0 else self.pool[~v] for v in items]
+
+    def children(self, i):
+        """Indices of the direct child nodes of `i`, in field order."""
+        code, slots = self.kinds[i], self.slots
+        base = self.starts[i]
+        for k, is_list in enumerate(_IS_LIST[code]):
+            slot = slots[base + k]
+            if not is_list:
+                if slot >= 0:
+                    yield slot
+            elif slot >= 0:
+                for v in slots[slot + 1:slot + 1 + slots[slot]]:
+                    if v >= 0:
+                        yield v
+
+    def walk(self, i=None):
+        """Pre-order node indices under `i`, or under every root if omitted."""
+        stack = list(reversed(self.roots)) if i is None else [i]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(list(self.children(node))))
+
+    # --- Conversion ---
+
+    def to_nodes(self):
+        """Rebuild the `fluent_ast` statement list."""
+        kinds, starts, slots, pool = self.kinds, self.starts, self.slots, self.pool
+        built = [None] * len(kinds)
+        # Children come after their parents, so build from the end.
+        for i in range(len(kinds) - 1, -1, -1):
+            code = kinds[i]
+            base = starts[i]
+            args = []
+            for k, is_list in enumerate(_IS_LIST[code]):
+                slot = slots[base + k]
+                if not is_list:
+                    args.append(built[slot] if slot >= 0 else pool[~slot])
+                elif slot < 0:
+                    args.append(None)
+                else:
+                    args.append([built[v] if v >= 0 else pool[~v]
+                                 for v in slots[slot + 1:slot + 1 + slots[slot]]])
+            built[i] = KINDS[code](*args)
+        return [built[i] for i in self.roots]
+
+    def to_bytes(self):
+        # Arrays are written in native byte order, like array.tobytes().
+        return b"".join([
+            _HEADER.pack(_MAGIC, len(self.kinds), len(self.slots), len(self.roots)),
+            self.kinds.tobytes(), self.starts.tobytes(), self.slots.tobytes(), self.roots.tobytes(),
+            marshal.dumps(self.pool),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, nodes, nslots, nroots = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a flat AST")
+        tree = cls()
+        view = memoryview(data)
+        pos = _HEADER.size
+        for name, count in (("kinds", nodes), ("starts", nodes), ("slots", nslots), ("roots", nroots)):
+            column = getattr(tree, name)
+            size = count * column.itemsize
+            column.frombytes(view[pos:pos + size])
+            pos += size
+        tree.pool = marshal.loads(view[pos:])
+        tree._pool_index = {(type(value), value): i for i, value in enumerate(tree.pool)}
+        return tree
+
+
+def flatten(stmts):
+    return FlatAST.from_nodes(stmts)
+
@@ -1,62 +1,117 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Union
 
+from symbols import on_reset, symbol
+
+# Nodes are frozen and slotted. Leaves that recur all over a program (small
+# integers, booleans, variable names) are hash-consed by the parser: the
+# `interned` constructors return the shared instance of an existing leaf.
+# The table stops taking new entries at _MAX_INTERNED, after which leaves
+# not in it are built fresh; symbols.reset() empties it.
+_SMALL_INTS = range(-5, 257)
+_MAX_INTERNED = 1 << 16
+_interned = {}
+on_reset(_interned.clear)  # interned Vars carry symbol IDs
+
+
+def _intern(cls, value):
+    key = (cls, type(value), value)
+    node = _interned.get(key)
+    if node is None:
+        node = cls(value)
+        if len(_interned) < _MAX_INTERNED:
+            _interned[key] = node
+    return node
+
+
+def _reduce_by_init_fields(self):
+    # Rebuild through the constructor so derived fields (symbol IDs) are
+    # recomputed in the loading process rather than copied from this one.
+    return type(self), tuple(getattr(self, f.name) for f in fields(self) if f.init)
+
+
 # === Expressions ===
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Expr:
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Number(Expr):
     value: int
 
+    @classmethod
+    def interned(cls, value):
+        if type(value) is int and value in _SMALL_INTS:
+            return _intern(cls, value)
+        return cls(value)
+
+    def __reduce__(self):
+        return type(self).interned, (self.value,)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class String(Expr):
     value: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Var(Expr):
     name: str
+    sym: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "sym", symbol(self.name))
+
+    @classmethod
+    def interned(cls, name):
+        return _intern(cls, name)
 
+    def __reduce__(self):
+        return type(self).interned, (self.name,)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Binary(Expr):
     left: Expr
     op: str
     right: Expr
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Call(Expr):
     func: str
     args: List[Expr]
+    sym: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "sym", symbol(self.func))
+
+    __reduce__ = _reduce_by_init_fields
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IfExpr(Expr):
     condition: Expr
     then_branch: List['Stmt']
     else_branch: Optional[List['Stmt']]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MatchCase:
     pattern: Union[int, str, "_"]
     expr: Expr
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MatchExpr(Expr):
     matched_expr: Expr
     cases: List[MatchCase]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListLiteral(Expr):
     start: Expr
     end: Expr
@@ -64,64 +119,89 @@ class ListLiteral(Expr):
 # === Statements ===
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Stmt:
     pass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LetStmt(Stmt):
     name: str
     type_annotation: Optional[str]
     value: Expr
+    sym: int = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        object.__setattr__(self, "sym", symbol(self.name))
 
-@dataclass
+    __reduce__ = _reduce_by_init_fields
+
+
+@dataclass(frozen=True, slots=True)
 class FnParam:
     name: str
     type_annotation: str
+    sym: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "sym", symbol(self.name))
 
+    __reduce__ = _reduce_by_init_fields
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class FnDecl(Stmt):
     name: str
     params: List[FnParam]
-    return_type: Optional[str]
+    return_type: Optional["Type"]
     body: List[Stmt]
+    sym: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "sym", symbol(self.name))
+
+    __reduce__ = _reduce_by_init_fields
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExprStmt(Stmt):
     expr: Expr
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Return(Stmt):
     expr: Expr
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Boolean(Expr):
     value: bool
 
+    @classmethod
+    def interned(cls, value):
+        return _intern(cls, value)
+
+    def __reduce__(self):
+        return type(self).interned, (self.value,)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListLiteral(Expr):
     elements: list
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IndexExpr(Expr):
     target: Expr
     index: Expr
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimpleType:
     name: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ListType:
     element_type: 'Type'
 
@@ -0,0 +1,101 @@
+from lexer import Lexer, Token, TokenType
+
+
+class IncrementalLexer:
+    """Token stream of an editable buffer that re-lexes only what an edit touches.
+
+    Tokens are kept per source line together with the `Lexer.indents` stack in
+    effect before each line. An edit re-lexes the replaced lines, then keeps
+    going until the indent stack matches the old snapshot again; every line
+    after that point lexes exactly as before and is reused.
+    """
+
+    def __init__(self, source: str, tokens=None):
+        self.lines = source.splitlines()
+        if tokens is None:
+            tokens = Lexer(source).tokenize()
+        self._adopt(tokens)
+
+    def _adopt(self, tokens):
+        # Rebuild the per-line state from a previous full token stream.
+        # Indents are always exactly 2 spaces deeper, so INDENT/DEDENT tokens
+        # are enough to replay the indent stack.
+        self.line_tokens = [[] for _ in self.lines]
+        tail = []
+        for tok in tokens:
+            (self.line_tokens[tok.line] if tok.line < len(self.lines) else tail).append(tok)
+
+        stack = [0]
+        self.line_indents = []
+        for line_tokens in self.line_tokens:
+            self.line_indents.append(tuple(stack))
+            for tok in line_tokens:
+                if tok.type == TokenType.INDENT:
+                    stack.append(stack[-1] + 2)
+                elif tok.type == TokenType.DEDENT:
+                    stack.pop()
+        self.line_indents.append(tuple(stack))
+
+    @property
+    def source(self):
+        return "".join(line + "\n" for line in self.lines)
+
+    def edit(self, start: int, end: int, new_lines):
+        """Replace lines [start, end) with `new_lines` and re-lex the affected lines.
+
+        Returns the range of (new) line numbers that were re-lexed. On a
+        SyntaxError the buffer is left unchanged.
+        """
+        if not 0 <= start <= end <= len(self.lines):
+            raise IndexError(f"Invalid line range {start}..{end} for {len(self.lines)} lines")
+        new_lines = list(new_lines)
+        delta = len(new_lines) - (end - start)
+
+        lexer = Lexer('')
+        lexer.indents = list(self.line_indents[start])
+        relexed, indents = [], []
+
+        def lex(line, line_num):
+            indents.append(tuple(lexer.indents))
+            lexer.line_num = line_num
+            tokens = []
+            lexer._process_line(line, tokens)
+            relexed.append(tokens)
+
+        for offset, line in enumerate(new_lines):
+            lex(line, start + offset)
+        resume = end
+        while resume < len(self.lines) and tuple(lexer.indents) != self.line_indents[resume]:
+            lex(self.lines[resume], resume + delta)
+            resume += 1
+
+        if resume == len(self.lines):
+            # Re-lexed through the last line, so the EOF indent stack may differ.
+            self.line_indents[-1] = tuple(lexer.indents)
+        self.lines[start:end] = new_lines
+        self.line_tokens[start:resume] = relexed
+        self.line_indents[start:resume] = indents
+        return range(start, start + len(relexed))
+
+    def iter_tokens(self, start_line=0):
+        """Yield the tokens from `start_line` on, exactly as a full re-lex would."""
+        for line_num in range(start_line, len(self.lines)):
+            yield from self.tokens_for_line(line_num)
+        lexer = Lexer('')
+        lexer.indents = list(self.line_indents[-1])
+        lexer.line_num = len(self.lines)
+        tail = []
+        lexer._finish(tail)
+        yield from tail
+
+    def tokens_for_line(self, line_num: int):
+        tokens = self.line_tokens[line_num]
+        if tokens[0].line != line_num:
+            # Lines after an edit that added or removed lines keep their old
+            # tokens; renumber them lazily, the first time they are read.
+            tokens = [Token(tok.type, tok.value, line_num, tok.column) for tok in tokens]
+            self.line_tokens[line_num] = tokens
+        return tokens
+
+    def tokens(self):
+        return list(self.iter_tokens())
@@ -0,0 +1,82 @@
+from bisect import bisect_left, bisect_right
+
+from incremental_lexer import IncrementalLexer
+from lexer import TokenType
+from parser import Parser
+
+
+class IncrementalParser:
+    """Top-level statements of an editable buffer, reparsed per declaration.
+
+    Each top-level statement is tracked by the line it starts on; it spans up
+    to the start of the next one. An edit re-lexes through IncrementalLexer,
+    then reparses from the statement before the edited lines until a
+    statement starts on a line that also started one before the edit. From
+    there on the old statements, and their AST subtrees, are reused as is.
+    """
+
+    def __init__(self, source: str):
+        self.lexer = IncrementalLexer(source)
+        self.starts = []
+        self._stmts = []
+        self._stale = True
+
+    @property
+    def stmts(self):
+        if self._stale:
+            self._reparse(0, 0, resync=False)
+        return self._stmts
+
+    def edit(self, start: int, end: int, new_lines):
+        """Replace lines [start, end) with `new_lines` and reparse what changed.
+
+        Returns the range of statement indices that were reparsed. A
+        SyntaxError from the new text propagates; the next edit (or read of
+        `stmts`) then reparses the whole buffer.
+        """
+        new_lines = list(new_lines)
+        self.lexer.edit(start, end, new_lines)
+        if self._stale:
+            return self._reparse(0, 0, resync=False)
+        # An edit can also extend the statement that ends just above it.
+        first = bisect_right(self.starts, start - 1) - 1
+        if first < 0:
+            first, line = 0, 0
+        else:
+            line = self.starts[first]
+        delta = len(new_lines) - (end - start)
+        return self._reparse(first, line, start + len(new_lines), delta)
+
+    def _reparse(self, first, line, edit_end=0, delta=0, resync=True):
+        self._stale = True
+        parser = Parser.from_tokens(self.lexer.iter_tokens(line))
+        # DEDENTs at the start of a statement's line close the previous one.
+        while parser.peek().type == TokenType.DEDENT:
+            parser.advance()
+
+        stmts, starts = [], []
+        resume = len(self.starts)
+        while True:
+            while parser.peek().type == TokenType.NEWLINE:
+                parser.advance()
+            tok = parser.peek()
+            if tok.type == TokenType.EOF:
+                break
+            if resync and tok.line >= edit_end:
+                # Past the edit: a statement that started on this (shifted)
+                # line before parses to the same tree as it did then.
+                old_line = tok.line - delta
+                j = bisect_left(self.starts, old_line, first)
+                if j < len(self.starts) and self.starts[j] == old_line:
+                    resume = j
+                    break
+            starts.append(tok.line)
+            stmts.append(parser.parse_stmt())
+
+        self._stmts[first:resume] = stmts
+        self.starts[first:resume] = starts
+        if delta:
+            for k in range(first + len(starts), len(self.starts)):
+                self.starts[k] += delta
+        self._stale = False
+        return range(first, first + len(stmts))
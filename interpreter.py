@@ -1,23 +1,43 @@
+import importlib
+import os
+
 from fluent_ast import (
     Number, String, Binary, Var, LetStmt, ExprStmt, FnDecl,
     Expr, Stmt, Call, IfExpr, MatchExpr, MatchCase, Return, Boolean, ListLiteral, IndexExpr, SimpleType, ListType
 )
+from optimizer import ConstantFolder, fold_constants
+from parser import Parser
+from purity import MISSING, NO_KEY, MemoCache, memo_key, pure_functions, rebinds
+from resolver import UNBOUND, Block, Frame, Local, check_names, declared_functions, resolve_function
+from symbols import symbol, symbol_name
+from visitor import MethodTable, Visitor
 
 
 class Environment:
+    # Values are keyed by symbol ID (see symbols.py); get/set also take names.
+    __slots__ = ("values", "parent")
+
     def __init__(self, parent=None):
         self.values = {}
         self.parent = parent
 
     def get(self, name):
-        if name in self.values:
-            return self.values[name]
-        elif self.parent:
-            return self.parent.get(name)
-        raise NameError(f"Undefined variable '{name}'")
+        return self.lookup(symbol(name) if isinstance(name, str) else name)
+
+    def lookup(self, sym: int):
+        env = self
+        while env is not None:
+            values = env.values
+            if sym in values:
+                return values[sym]
+            env = env.parent
+        raise NameError(f"Undefined variable '{symbol_name(sym)}'")
 
     def set(self, name, value):
-        self.values[name] = value
+        self.values[symbol(name) if isinstance(name, str) else name] = value
+
+    def define(self, sym: int, value):
+        self.values[sym] = value
 
 
 class ReturnException(Exception):
@@ -25,6 +45,27 @@ class ReturnException(Exception):
         self.value = value
 
 
+class Completion:
+    """What a `return` statement evaluates to: blocks stop at one and hand
+    it up to the call, which takes `value` as its result. Only a return
+    nested in an operand (`1 + if ...`) still raises ReturnException."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TailCall:
+    """A call in tail position, handed back for the caller's loop to run in
+    place of the current body; `values` are the bindings it could see."""
+    __slots__ = ("fn", "args", "values")
+
+    def __init__(self, fn, args, values):
+        self.fn = fn
+        self.args = args
+        self.values = values
+
+
 class BuiltInFunction:
     def __init__(self, name, impl):
         self.name = name
@@ -34,17 +75,147 @@ class BuiltInFunction:
         return self.impl(*args)
 
 
-class Interpreter:
-    def __init__(self):
+# Statements that bind a name in the scope they run in.
+BINDING_STMTS = (LetStmt, FnDecl)
+MAX_FREE_ENVS = 1024
+
+# Execution engines by name: module and class of an Interpreter subclass.
+BACKENDS = {
+    "tree": ("interpreter", "Interpreter"),
+    "closure": ("closure_compiler", "ClosureInterpreter"),
+    "vm": ("vm", "VMInterpreter"),
+    "python": ("py_backend", "PythonInterpreter"),
+    "stack": ("stack_eval", "StackInterpreter"),
+}
+
+
+class Interpreter(Visitor):
+    """Tree-walking evaluator, and the entry point for every backend.
+
+    `Interpreter(backend=...)` returns an instance of the named backend's
+    class; without one it uses $FLUENT_BACKEND, else the tree walker.
+
+    With `tail_calls=True`, a call in tail position (the last statement of
+    a function body, or of an if branch or match arm in tail position)
+    replaces the running call instead of nesting in it, so recursion used
+    as a loop runs in constant stack and memory. The callee then gets the
+    bindings of the scopes it replaces copied into its own, so it sees
+    the same names as under plain dynamic scoping.
+
+    With `memoize=N`, each program is checked for pure functions (see
+    purity.py), plus any named in `pure`, and their results are cached by
+    argument, up to N per function. `memo_caches` maps function names to
+    their MemoCache, which counts hits and misses.
+
+    With `optimize=True`, programs go through optimizer.fold_constants
+    before they run.
+
+    Function bodies run in resolver Frames (see resolve_function), so a
+    name bound in the same function is read from its (depth, slot)
+    address; other names, and all names at top level or with tail_calls,
+    are looked up through the scopes by name.
+    """
+    backend = "tree"
+    supports_tail_calls = True
+    supports_memoize = True
+    _stmt_table = MethodTable("exec_", "_unsupported_stmt")
+    _expr_table = MethodTable("eval_", "_unsupported_expr")
+    _tail_table = MethodTable("tail_", "_tail_other")
+    _complete_table = MethodTable("complete_", "eval_expr")
+
+    def __new__(cls, backend=None, **options):
+        if cls is Interpreter:
+            backend = backend or os.environ.get("FLUENT_BACKEND") or "tree"
+            if backend not in BACKENDS:
+                raise ValueError(f"Unknown backend '{backend}'")
+            module, name = BACKENDS[backend]
+            cls = getattr(importlib.import_module(module), name)
+        return object.__new__(cls)
+
+    def __init__(self, backend=None, tail_calls=False, memoize=0, pure=(), optimize=False):
+        if tail_calls and not self.supports_tail_calls:
+            raise ValueError(f"The {self.backend} backend does not support tail_calls")
+        if memoize and not self.supports_memoize:
+            raise ValueError(f"The {self.backend} backend does not support memoize")
+        self.tail_calls = tail_calls
+        self.optimize = optimize
+        self.memoize = memoize
+        self.pure = frozenset(pure)
+        self.memo_caches = {}  # function name -> MemoCache
+        self._memo = {}  # id(FnDecl) -> (FnDecl, MemoCache) for the functions memoized now
+        self._bodies = {}  # id(FnDecl) -> (FnDecl, Scope, resolved body)
         self.global_env = Environment()
+        self._free_envs = []  # recycled scopes, see _new_env
         self._register_builtins()
 
     def eval_program(self, stmts: list[Stmt]):
+        """Run a whole program; names it can never resolve are reported before anything runs."""
+        check_names(stmts, self.global_env)
+        if self.optimize:
+            stmts = fold_constants(stmts)
+        if self.memoize:
+            self._plan_memo(stmts)
+        self._forget_rebound(stmts)
+        return self.run_program(stmts)
+
+    def _plan_memo(self, stmts: list[Stmt]):
+        """Memoize the pure functions `stmts` declare."""
+        if rebinds(stmts, self.global_env):
+            # Earlier results may have depended on a name bound differently now.
+            for cache in self.memo_caches.values():
+                cache.clear()
+            self._memo.clear()
+        known = {fn.name for fn, _ in self._memo.values()}
+        pure = pure_functions(stmts, known, self.pure)
+        for stmt in stmts:
+            if type(stmt) is FnDecl and stmt.name in pure:
+                cache = self.memo_caches.get(stmt.name)
+                if cache is None:
+                    cache = self.memo_caches[stmt.name] = MemoCache(self.memoize)
+                self._memo[id(stmt)] = (stmt, cache)
+
+    def run_program(self, stmts: list[Stmt]):
         result = None
         for stmt in stmts:
             result = self.eval_stmt(stmt, self.global_env)
         return result
 
+    def eval_stream(self, source):
+        """Parse and run `source` one top-level statement at a time.
+
+        `source` is program text, a text file or any iterable of lines. Each
+        statement runs as soon as it is parsed and is dropped afterwards, so
+        only the functions still bound in `global_env` outlive it and memory
+        does not grow with the length of the script. Nothing is memoized:
+        purity is decided per whole program.
+        """
+        self._memo.clear()
+        folder, consts = ConstantFolder(), {}  # constants of the top level so far
+        result = None
+        for stmt in Parser(source).iter_stmts():
+            for stmt in folder.fold_block([stmt], consts) if self.optimize else [stmt]:
+                self._forget_rebound([stmt])
+                result = self.eval_stmt(stmt, self.global_env)
+        return result
+
+    def _forget_rebound(self, stmts: list[Stmt]):
+        # Code is kept per FnDecl (by id, as nodes are unhashable). Once a
+        # top-level function is declared again, the old FnDecl is usually
+        # garbage: drop its code, so that redefining a function over and
+        # over does not grow memory. If the old one is still reachable
+        # some other way, calling it just compiles it again.
+        values = self.global_env.values
+        for stmt in stmts:
+            if type(stmt) in BINDING_STMTS:
+                old = values.get(stmt.sym)
+                if type(old) is FnDecl and old is not stmt:
+                    for fn in declared_functions(old):
+                        self._forget_function(fn)
+
+    def _forget_function(self, fn: FnDecl):
+        """Drop what is kept for `fn`; backends with caches of their own extend it."""
+        drop_cached(self._bodies, fn)
+
     def _register_builtins(self):
         self.global_env.set("print", BuiltInFunction("print", lambda *args: print(*args) or None))
         self.global_env.set("len", BuiltInFunction("len", self._len_builtin))
@@ -54,130 +225,387 @@ class Interpreter:
             return len(value)
         raise TypeError(f"len() expects a string or list, got {type(value).__name__}")
 
-    def eval_stmt(self, stmt: Stmt, env: Environment):
-        if isinstance(stmt, LetStmt):
-            value = self.eval_expr(stmt.value, env)
-            if stmt.type_annotation and not check_type(value, stmt.type_annotation):
-                raise TypeError(f"Type mismatch: expected {stmt.type_annotation}, got {type(value).__name__}")
-            env.set(stmt.name, value)
-            return value
-        elif isinstance(stmt, FnDecl):
-            env.set(stmt.name, stmt)
-            return stmt
-        elif isinstance(stmt, ExprStmt):
-            return self.eval_expr(stmt.expr, env)
-        elif isinstance(stmt, Return):
-            value = self.eval_expr(stmt.expr, env)
-            raise ReturnException(value)
+    def _new_env(self, parent: Environment):
+        # No value can hold on to a scope (functions are plain FnDecls), so
+        # a scope is dead once its call or block is done and can be reused.
+        free = self._free_envs
+        if free:
+            env = free.pop()
+            env.parent = parent
+            return env
+        return Environment(parent)
+
+    def _release_env(self, env: Environment):
+        if len(self._free_envs) < MAX_FREE_ENVS:
+            env.values.clear()
+            env.parent = None
+            self._free_envs.append(env)
+
+    def _new_frame(self, scope, parent):
+        # Frames are recycled per Scope, for the same reason as scopes.
+        free = scope.free
+        if free:
+            frame = free.pop()
+            if type(parent) is Frame:
+                frame.parent, frame.env = parent, parent.env
+            else:
+                frame.parent, frame.env = None, parent
+            return frame
+        return Frame(scope, parent)
+
+    def _release_frame(self, scope, frame: Frame):
+        if len(scope.free) < MAX_FREE_ENVS:
+            slots = frame.slots
+            for i in range(len(slots)):
+                slots[i] = UNBOUND
+            frame.parent = frame.env = None
+            scope.free.append(frame)
+
+    def _exec_block(self, stmts: list[Stmt], env: Environment, base: Environment = None):
+        """Run `stmts` in a child scope of `env`, returning the last value.
+
+        The scope is only opened at the first statement that binds a name;
+        the statements before it, and whole blocks that bind nothing, run
+        in `env` itself, which sees exactly the same names. A `return`
+        ends the block early with its Completion. With `base`, the block
+        is in tail position of a function called from `base`, and a call
+        ending it comes back as a TailCall.
+        """
+        if type(stmts) is Block:
+            return self._exec_resolved_block(stmts, env)
+        scope = env
+        try:
+            result = None
+            if base is None:
+                for stmt in stmts:
+                    if scope is env and type(stmt) in BINDING_STMTS:
+                        scope = self._new_env(env)
+                    result = self._exec_stmt(stmt, scope)
+                    if type(result) is Completion:
+                        break
+            else:
+                last = len(stmts) - 1
+                for i, stmt in enumerate(stmts):
+                    if scope is env and type(stmt) in BINDING_STMTS:
+                        scope = self._new_env(env)
+                    result = self._tail_stmt(stmt, scope, base) if i == last else self._exec_stmt(stmt, scope)
+                    if type(result) is Completion:
+                        break
+            return result
+        finally:
+            if scope is not env:
+                self._release_env(scope)
+
+    def _exec_resolved_block(self, stmts: Block, env):
+        # A branch of a resolved body: its Frame, if any, is opened up front,
+        # as the addresses in it count it from the first statement on.
+        scope = stmts.scope
+        if scope is None:
+            frame = env
         else:
-            raise NotImplementedError(f"Unsupported statement: {type(stmt)}")
+            frame = self._new_frame(scope, env)
+        try:
+            result = None
+            for stmt in stmts:
+                result = self._exec_stmt(stmt, frame)
+                if type(result) is Completion:
+                    break
+            return result
+        finally:
+            if frame is not env:
+                self._release_frame(scope, frame)
+
+    def eval_stmt(self, stmt: Stmt, env: Environment):
+        """Run `stmt` in `env`; a `return` raises ReturnException, as there is no call to return from."""
+        result = self._exec_stmt(stmt, env)
+        if type(result) is Completion:
+            raise ReturnException(result.value)
+        return result
+
+    def _exec_stmt(self, stmt: Stmt, env: Environment):
+        # Inside blocks and calls: a `return` gives its Completion.
+        return self._stmt_table[type(stmt)](self, stmt, env)
 
     def eval_expr(self, expr: Expr, env: Environment):
-        if isinstance(expr, Number):
-            return expr.value
-        elif isinstance(expr, String):
-            return expr.value
-        elif isinstance(expr, Var):
-            return env.get(expr.name)
-        elif isinstance(expr, ListLiteral):
-            return [self.eval_expr(elem, env) for elem in expr.elements]
-        elif isinstance(expr, IndexExpr):
-            target = self.eval_expr(expr.target, env)
-            index = self.eval_expr(expr.index, env)
-            if not isinstance(index, int):
-                raise TypeError(f"List index must be an integer, got {type(index).__name__}")
-            try:
-                return target[index]
-            except (TypeError, IndexError) as e:
-                raise RuntimeError(f"Indexing failed: {e}")
-        elif isinstance(expr, Boolean):
-            return expr.value
-        elif isinstance(expr, Binary):
-            if expr.op == "and":
-                return self.eval_expr(expr.left, env) and self.eval_expr(expr.right, env)
-            elif expr.op == "or":
-                return self.eval_expr(expr.left, env) or self.eval_expr(expr.right, env)
-            elif expr.op == "and not":
-                return self.eval_expr(expr.left, env) and not self.eval_expr(expr.right, env)
-            elif expr.op == "+":
-                return self.eval_expr(expr.left, env) + self.eval_expr(expr.right, env)
-            elif expr.op == "-":
-                return self.eval_expr(expr.left, env) - self.eval_expr(expr.right, env)
-            elif expr.op == "*":
-                return self.eval_expr(expr.left, env) * self.eval_expr(expr.right, env)
-            elif expr.op == "/":
-                return self.eval_expr(expr.left, env) / self.eval_expr(expr.right, env)
-            elif expr.op == ">":
-                return self.eval_expr(expr.left, env) > self.eval_expr(expr.right, env)
-            elif expr.op == "<":
-                return self.eval_expr(expr.left, env) < self.eval_expr(expr.right, env)
-            elif expr.op == ">=":
-                return self.eval_expr(expr.left, env) >= self.eval_expr(expr.right, env)
-            elif expr.op == "<=":
-                return self.eval_expr(expr.left, env) <= self.eval_expr(expr.right, env)
-            elif expr.op == "==":
-                return self.eval_expr(expr.left, env) == self.eval_expr(expr.right, env)
-            elif expr.op == "!=":
-                return self.eval_expr(expr.left, env) != self.eval_expr(expr.right, env)
+        return self._expr_table[type(expr)](self, expr, env)
+
+    # --- Statements ---
+
+    def exec_LetStmt(self, stmt: LetStmt, env: Environment):
+        value = self.eval_expr(stmt.value, env)
+        if stmt.type_annotation and not check_type(value, stmt.type_annotation):
+            raise TypeError(f"Type mismatch: expected {stmt.type_annotation}, got {type(value).__name__}")
+        env.define(stmt.sym, value)
+        return value
+
+    def exec_FnDecl(self, stmt: FnDecl, env: Environment):
+        env.define(stmt.sym, stmt)
+        return stmt
+
+    def exec_ExprStmt(self, stmt: ExprStmt, env: Environment):
+        expr = stmt.expr
+        if type(expr) is IfExpr or type(expr) is MatchExpr:
+            return self._complete_table[type(expr)](self, expr, env)
+        return self._expr_table[type(expr)](self, expr, env)
+
+    def exec_Return(self, stmt: Return, env: Environment):
+        return Completion(self.eval_expr(stmt.expr, env))
+
+    def _unsupported_stmt(self, stmt, env):
+        raise NotImplementedError(f"Unsupported statement: {type(stmt)}")
+
+    # --- Expressions ---
+
+    def eval_Number(self, expr: Number, env: Environment):
+        return expr.value
+
+    def eval_String(self, expr: String, env: Environment):
+        return expr.value
+
+    def eval_Boolean(self, expr: Boolean, env: Environment):
+        return expr.value
+
+    def eval_Var(self, expr: Var, env: Environment):
+        return env.lookup(expr.sym)
+
+    def eval_Local(self, expr: Local, frame: Frame):
+        depth = expr.depth
+        while depth:
+            frame = frame.parent
+            depth -= 1
+        return frame.slots[expr.slot]
+
+    def eval_ListLiteral(self, expr: ListLiteral, env: Environment):
+        return [self.eval_expr(elem, env) for elem in expr.elements]
+
+    def eval_IndexExpr(self, expr: IndexExpr, env: Environment):
+        target = self.eval_expr(expr.target, env)
+        index = self.eval_expr(expr.index, env)
+        if not isinstance(index, int):
+            raise TypeError(f"List index must be an integer, got {type(index).__name__}")
+        try:
+            return target[index]
+        except (TypeError, IndexError) as e:
+            raise RuntimeError(f"Indexing failed: {e}")
+
+    def eval_Binary(self, expr: Binary, env: Environment):
+        if expr.op == "and":
+            return self.eval_expr(expr.left, env) and self.eval_expr(expr.right, env)
+        elif expr.op == "or":
+            return self.eval_expr(expr.left, env) or self.eval_expr(expr.right, env)
+        elif expr.op == "and not":
+            return self.eval_expr(expr.left, env) and not self.eval_expr(expr.right, env)
+        elif expr.op == "+":
+            return self.eval_expr(expr.left, env) + self.eval_expr(expr.right, env)
+        elif expr.op == "-":
+            return self.eval_expr(expr.left, env) - self.eval_expr(expr.right, env)
+        elif expr.op == "*":
+            return self.eval_expr(expr.left, env) * self.eval_expr(expr.right, env)
+        elif expr.op == "/":
+            return self.eval_expr(expr.left, env) / self.eval_expr(expr.right, env)
+        elif expr.op == ">":
+            return self.eval_expr(expr.left, env) > self.eval_expr(expr.right, env)
+        elif expr.op == "<":
+            return self.eval_expr(expr.left, env) < self.eval_expr(expr.right, env)
+        elif expr.op == ">=":
+            return self.eval_expr(expr.left, env) >= self.eval_expr(expr.right, env)
+        elif expr.op == "<=":
+            return self.eval_expr(expr.left, env) <= self.eval_expr(expr.right, env)
+        elif expr.op == "==":
+            return self.eval_expr(expr.left, env) == self.eval_expr(expr.right, env)
+        elif expr.op == "!=":
+            return self.eval_expr(expr.left, env) != self.eval_expr(expr.right, env)
+        else:
+            raise NotImplementedError(f"Unsupported operator: {expr.op}")
+
+    def eval_IfExpr(self, expr: IfExpr, env: Environment):
+        branch = self._if_branch(expr, env)
+        if branch is None:
+            return None
+        result = self._exec_block(branch, env)
+        if type(result) is Completion:
+            raise ReturnException(result.value)
+        return result
+
+    def _if_branch(self, expr: IfExpr, env: Environment):
+        cond = self.eval_expr(expr.condition, env)
+        if not isinstance(cond, bool):
+            raise TypeError(f"If condition must be a boolean, got: {type(cond).__name__}")
+        return expr.then_branch if cond else expr.else_branch
+
+    def eval_MatchExpr(self, expr: MatchExpr, env: Environment):
+        return self.eval_expr(self._match_arm(expr, env), env)
+
+    # An if or match that is a statement of its own passes on the
+    # Completion of a return in it, which ends the enclosing block too.
+
+    def complete_IfExpr(self, expr: IfExpr, env: Environment):
+        branch = self._if_branch(expr, env)
+        if branch is None:
+            return None
+        return self._exec_block(branch, env)
+
+    def complete_MatchExpr(self, expr: MatchExpr, env: Environment):
+        arm = self._match_arm(expr, env)
+        return self._complete_table[type(arm)](self, arm, env)
+
+    def _match_arm(self, expr: MatchExpr, env: Environment):
+        return self._select_arm(expr, self.eval_expr(expr.matched_expr, env), env)
+
+    def _select_arm(self, expr: MatchExpr, value, env: Environment):
+        for case in expr.cases:
+            if case.pattern == "_":
+                matched = True
+            elif isinstance(case.pattern, int) or isinstance(case.pattern, str):
+                matched = value == case.pattern
+            elif isinstance(case.pattern, str):
+                matched = env.get(case.pattern) == value
             else:
-                raise NotImplementedError(f"Unsupported operator: {expr.op}")
-        elif isinstance(expr, IfExpr):
-            cond = self.eval_expr(expr.condition, env)
-            if not isinstance(cond, bool):
-                raise TypeError(f"If condition must be a boolean, got: {type(cond).__name__}")
-            branch = expr.then_branch if cond else expr.else_branch
-            if branch is None:
-                return None
-            local_env = Environment(parent=env)
+                matched = False
+            if matched:
+                return case.expr
+        raise ValueError(f"No match found for value: {value}")
+
+    def eval_Call(self, expr: Call, env: Environment):
+        fn = env.lookup(expr.sym)
+        args = [self.eval_expr(arg, env) for arg in expr.args]
+        if isinstance(fn, FnDecl):
+            if self._memo:
+                memo = self._memo.get(id(fn))
+                if memo is not None and memo[0] is fn:
+                    return self._call_memoized(fn, memo[1], args, env)
+            return self._call(fn, args, env)
+        elif isinstance(fn, BuiltInFunction):
+            return fn.call(args)
+        else:
+            raise TypeError(f"'{expr.func}' is not a function")
+
+    def _call(self, fn: FnDecl, args, env: Environment):
+        if self.tail_calls:
+            return self._call_in_loop(fn, args, env)
+        self._check_args(fn, args)
+        result = self._run_body(fn, args, env)
+        self._check_return(fn, result)
+        return result
+
+    def _call_memoized(self, fn: FnDecl, cache: MemoCache, args, env: Environment):
+        # Arguments are checked first, so a bad call fails even if it would hit.
+        self._check_args(fn, args)
+        key = memo_key(args)
+        if key is NO_KEY:
+            return self._call(fn, args, env)
+        result = cache.get(key)
+        if result is MISSING:
+            result = self._call(fn, args, env)
+            cache.put(key, result)
+        return result
+
+    def _check_args(self, fn: FnDecl, args):
+        if len(args) != len(fn.params):
+            raise ValueError(f"Function '{fn.name}' expects {len(fn.params)} arguments, got {len(args)}")
+        for param, arg in zip(fn.params, args):
+            if param.type_annotation and not check_type(arg, param.type_annotation):
+                raise TypeError(
+                    f"Type mismatch in parameter '{param.name}': expected {format_type(param.type_annotation)}, got {type(arg).__name__}")
+
+    def _check_return(self, fn: FnDecl, result):
+        if fn.return_type and not check_type(result, fn.return_type):
+            raise TypeError(
+                f"Return type mismatch in function '{fn.name}': expected {format_type(fn.return_type)}, got {type(result).__name__}")
+
+    def _run_body(self, fn: FnDecl, args, env: Environment):
+        """Run the body of `fn` called from `env` with checked `args`."""
+        scope, body = self._resolved(fn)
+        # A body that binds nothing needs no Frame of its own.
+        frame = self._new_frame(scope, env) if scope.syms else env
+        try:
+            for param, arg in zip(fn.params, args):
+                frame.define(param.sym, arg)
             result = None
-            for stmt in branch:
-                result = self.eval_stmt(stmt, local_env)
-            return result
-        elif isinstance(expr, MatchExpr):
-            value = self.eval_expr(expr.matched_expr, env)
-            for case in expr.cases:
-                if case.pattern == "_":
-                    matched = True
-                elif isinstance(case.pattern, int) or isinstance(case.pattern, str):
-                    matched = value == case.pattern
-                elif isinstance(case.pattern, str):
-                    matched = env.get(case.pattern) == value
-                else:
-                    matched = False
-                if matched:
-                    return self.eval_expr(case.expr, env)
-            raise ValueError(f"No match found for value: {value}")
-        elif isinstance(expr, Call):
-            fn = env.get(expr.func)
-            args = [self.eval_expr(arg, env) for arg in expr.args]
-            if isinstance(fn, FnDecl):
-                local_env = Environment(parent=env)
-                if len(expr.args) != len(fn.params):
-                    raise ValueError(f"Function '{fn.name}' expects {len(fn.params)} arguments, got {len(expr.args)}")
+            for stmt in body:
+                result = self._exec_stmt(stmt, frame)
+                if type(result) is Completion:
+                    break
+        except ReturnException as re:
+            return re.value
+        finally:
+            if frame is not env:
+                self._release_frame(scope, frame)
+        return result.value if type(result) is Completion else result
+
+    def _resolved(self, fn: FnDecl):
+        entry = self._bodies.get(id(fn))
+        if entry is None or entry[0] is not fn:
+            entry = self._bodies[id(fn)] = (fn, *resolve_function(fn))
+        return entry[1], entry[2]
+
+    def _call_in_loop(self, fn: FnDecl, args, env: Environment):
+        """Call `fn`, then each function it tail-calls in turn, from the same Python frame."""
+        pending = {}  # functions whose return type the final result must still match
+        # Each call's scope is dead once it tail-calls, so one Environment
+        # serves them all, taking the bindings the TailCall carries over.
+        local_env = self._new_env(env)
+        try:
+            while True:
+                self._check_args(fn, args)
+                if fn.return_type:
+                    pending[id(fn)] = fn
                 for param, arg in zip(fn.params, args):
-                    if param.type_annotation and not check_type(arg, param.type_annotation):
-                        raise TypeError(
-                            f"Type mismatch in parameter '{param.name}': expected {format_type(param.type_annotation)}, got {type(arg).__name__}")
-                    local_env.set(param.name, arg)
+                    local_env.define(param.sym, arg)
                 try:
-                    result = None
-                    for stmt in fn.body:
-                        result = self.eval_stmt(stmt, local_env)
-                    if fn.return_type and not check_type(result, fn.return_type):
-                        raise TypeError(
-                            f"Return type mismatch in function '{fn.name}': expected {format_type(fn.return_type)}, got {type(result).__name__}")
-                    return result
+                    result = self._exec_block(fn.body, local_env, env)
                 except ReturnException as re:
-                    if fn.return_type and not check_type(re.value, fn.return_type):
-                        raise TypeError(
-                            f"Return type mismatch in function '{fn.name}': expected {format_type(fn.return_type)}, got {type(re.value).__name__}")
-                    return re.value
-            elif isinstance(fn, BuiltInFunction):
-                return fn.call(args)
-            else:
-                raise TypeError(f"'{expr.func}' is not a function")
-        else:
-            raise NotImplementedError(f"Unsupported expression: {type(expr)}")
+                    result = re.value
+                if type(result) is Completion:
+                    result = result.value
+                    break
+                if type(result) is not TailCall:
+                    break
+                fn, args, local_env.values = result.fn, result.args, result.values
+        finally:
+            self._release_env(local_env)
+        for fn in reversed(pending.values()):
+            self._check_return(fn, result)
+        return result
+
+    # --- Tail position (tail_calls=True) ---
+
+    def _tail_stmt(self, stmt: Stmt, env: Environment, base: Environment):
+        if type(stmt) is ExprStmt or type(stmt) is Return:
+            return self._tail_table[type(stmt.expr)](self, stmt.expr, env, base)
+        return self._exec_stmt(stmt, env)
+
+    def _tail_other(self, expr: Expr, env: Environment, base: Environment):
+        return self.eval_expr(expr, env)
+
+    def tail_IfExpr(self, expr: IfExpr, env: Environment, base: Environment):
+        branch = self._if_branch(expr, env)
+        if branch is None:
+            return None
+        return self._exec_block(branch, env, base)
+
+    def tail_MatchExpr(self, expr: MatchExpr, env: Environment, base: Environment):
+        arm = self._match_arm(expr, env)
+        return self._tail_table[type(arm)](self, arm, env, base)
+
+    def tail_Call(self, expr: Call, env: Environment, base: Environment):
+        fn = env.lookup(expr.sym)
+        if not isinstance(fn, FnDecl):
+            return self.eval_Call(expr, env)
+        args = [self.eval_expr(arg, env) for arg in expr.args]
+        # Every scope between here and `base` ends with this call: flatten
+        # them, innermost last, so the callee can still see their names.
+        scopes = []
+        while env is not base:
+            scopes.append(env.values)
+            env = env.parent
+        values = dict(scopes.pop())
+        while scopes:
+            values.update(scopes.pop())
+        return TailCall(fn, args, values)
+
+    def _unsupported_expr(self, expr, env):
+        raise NotImplementedError(f"Unsupported expression: {type(expr)}")
 
     def apply_op(self, op: str, left, right):
         if op == "+":
@@ -204,6 +632,13 @@ class Interpreter:
             raise ValueError(f"Unknown operator: {op}")
 
 
+def drop_cached(cache, fn):
+    """Drop the entry of `fn` from a cache keyed by id(FnDecl), holding (fn, ...)."""
+    entry = cache.get(id(fn))
+    if entry is not None and entry[0] is fn:
+        del cache[id(fn)]
+
+
 def check_type(value, expected_type):
     if isinstance(expected_type, SimpleType):
         if expected_type.name == "Int":
@@ -221,6 +656,17 @@ def check_type(value, expected_type):
     return False
 
 
+_SIMPLE_TYPES = {"Int": int, "String": str, "Bool": bool}
+
+
+def type_predicate(annotation):
+    """A one-argument function equivalent to `check_type(value, annotation)`."""
+    if isinstance(annotation, SimpleType) and annotation.name in _SIMPLE_TYPES:
+        kind = _SIMPLE_TYPES[annotation.name]
+        return lambda value: isinstance(value, kind)
+    return lambda value: check_type(value, annotation)
+
+
 def format_type(t):
     if isinstance(t, SimpleType):
         return t.name
@@ -68,6 +68,43 @@ class Token:
         return f"<Token {self.type.name} '{self.value}' ({self.line}:{self.column})>"
 
 
+# Master scanning regex, tried at each offset of a line. It accepts exactly
+# what the original if/elif chain did, quirks included: keyword-like words such
+# as `and` or `true` come out of WORD, and `==` lexes as two ASSIGN tokens.
+_TOKEN_RE = re.compile(r'''
+    (?P<BAD_OP>>>>?)
+  | (?P<SYMBOL>_(?![^\W_])|->|=>|\.\.|>=|<=|!=|[-+*/=:,()\[\]<>])
+  | (?P<WORD>[a-zA-Z_][a-zA-Z0-9_]*)
+  | (?P<NUMBER>\d+)
+  | "(?P<STRING>[^"]*)"
+  | (?P<UNCLOSED>")
+  | (?P<SPACE>[ \t]+)
+''', re.VERBOSE)
+
+_SYMBOLS = {
+    '_': TokenType.UNDERSCORE,
+    '->': TokenType.ARROW,
+    '=>': TokenType.FAT_ARROW,
+    '..': TokenType.RANGE,
+    '>=': TokenType.GTE,
+    '<=': TokenType.LTE,
+    '!=': TokenType.NEQ,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.STAR,
+    '/': TokenType.SLASH,
+    '=': TokenType.ASSIGN,
+    ':': TokenType.COLON,
+    ',': TokenType.COMMA,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    '>': TokenType.GT,
+    '<': TokenType.LT,
+}
+
+
 class Lexer:
     KEYWORDS = {
         'fn': TokenType.FN,
@@ -79,158 +116,111 @@ class Lexer:
         'print': TokenType.PRINT,
     }
 
-    def __init__(self, source: str):
-        self.lines = source.splitlines()
-        self.line_num = 0
+    def __init__(self, source, first_line=0):
+        # `source` is either the program text or a text file object; lines are
+        # pulled from it lazily, so iter_tokens() never holds the whole input.
+        # `first_line` numbers a fragment as part of a larger file.
+        self.source = source
+        self.line_num = first_line
         self.indents = [0]
         self.tokens = []
 
+    @classmethod
+    def from_path(cls, path):
+        # Memory-maps the file and lexes its bytes; tokenize() then returns a
+        # compact buffer whose values are read from the map lazily.
+        from mapped_lexer import MappedLexer
+        return MappedLexer(path)
+
     def tokenize(self):
-        while self.line_num < len(self.lines):
-            line = self.lines[self.line_num]
-            # Optionally reject tabs:
-            if "\t" in line:
-                raise SyntaxError(f"Tabs not allowed (line {self.line_num + 1})")
-            self._process_line(line)
+        self.tokens.extend(self.iter_tokens())
+        return self.tokens
+
+    def iter_tokens(self):
+        pending = []
+        for line in self._iter_lines():
+            self._process_line(line, pending)
+            yield from pending
+            pending.clear()
             self.line_num += 1
+        self._finish(pending)
+        yield from pending
+
+    def _iter_lines(self):
+        # Chunks end in "\n"; splitting each one again reproduces
+        # str.splitlines() for the other line boundaries it recognises.
+        source = self.source
+        if not isinstance(source, str):
+            for chunk in source:
+                yield from chunk.splitlines()
+            return
+        start = 0
+        while start < len(source):
+            end = source.find('\n', start) + 1 or len(source)
+            yield from source[start:end].splitlines()
+            start = end
 
+    def _finish(self, tokens: list):
         # At end of file, dedent all remaining indent levels.
         while len(self.indents) > 1:
-            self.tokens.append(Token(TokenType.DEDENT, '', self.line_num, 0))
+            tokens.append(Token(TokenType.DEDENT, '', self.line_num, 0))
             self.indents.pop()
 
-        self.tokens.append(Token(TokenType.EOF, '', self.line_num, 0))
-        return self.tokens
+        tokens.append(Token(TokenType.EOF, '', self.line_num, 0))
 
-    def _process_line(self, line: str):
+    def _process_line(self, line: str, tokens: list):
+        # Optionally reject tabs:
+        if "\t" in line:
+            raise SyntaxError(f"Tabs not allowed (line {self.line_num + 1})")
         if line.strip() == '':
             # Emit a NEWLINE for blank lines (optional)
-            self.tokens.append(Token(TokenType.NEWLINE, '', self.line_num, 0))
+            tokens.append(Token(TokenType.NEWLINE, '', self.line_num, 0))
             return
 
         stripped = line.lstrip()
         indent = len(line) - len(stripped)
+        self._indent_to(indent, tokens)
+        self._tokenize_line(line, indent, tokens)
+        tokens.append(Token(TokenType.NEWLINE, '', self.line_num, len(line)))
 
+    def _indent_to(self, indent: int, tokens: list):
         # Check for unexpected indentation levels (enforce exactly 2-space indents)
         if indent > self.indents[-1]:
             expected = self.indents[-1] + 2
             if indent != expected:
                 raise SyntaxError(f"Unexpected indent on line {self.line_num + 1}: expected {expected} spaces, got {indent}")
             self.indents.append(indent)
-            self.tokens.append(Token(TokenType.INDENT, '', self.line_num, 0))
+            tokens.append(Token(TokenType.INDENT, '', self.line_num, 0))
         while indent < self.indents[-1]:
             self.indents.pop()
-            self.tokens.append(Token(TokenType.DEDENT, '', self.line_num, 0))
-
-        self._tokenize_line(stripped, start_column=(len(line) - len(stripped)))
-        self.tokens.append(Token(TokenType.NEWLINE, '', self.line_num, len(line)))
-
-    def _tokenize_line(self, text: str, start_column: int):
-        pos = 0
-        while pos < len(text):
-            current_col = start_column + pos
-            if text.startswith("_", pos) and (pos + 1 == len(text) or not text[pos + 1].isalnum()):
-                self.tokens.append(Token(TokenType.UNDERSCORE, "_", self.line_num, current_col))
-                pos += 1
-            elif m := re.match(r'[a-zA-Z_][a-zA-Z0-9_]*', text[pos:]):
-                word = m.group(0)
-                tok_type = self.KEYWORDS.get(word, TokenType.IDENT)
-                self.tokens.append(Token(tok_type, word, self.line_num, current_col))
-                pos += len(word)
-            elif m := re.match(r'\d+', text[pos:]):
-                num = m.group(0)
-                self.tokens.append(Token(TokenType.NUMBER, num, self.line_num, current_col))
-                pos += len(num)
-            elif text[pos] == '"':
-                end = text.find('"', pos + 1)
-                if end == -1:
-                    raise SyntaxError(f"Unclosed string starting at line {self.line_num + 1}, column {current_col}")
-                value = text[pos + 1:end]
-                self.tokens.append(Token(TokenType.STRING, value, self.line_num, current_col))
-                pos = end + 1
-            elif text.startswith("and", pos) and not text[pos + 3:pos + 4].isalnum():
-                self.tokens.append(Token(TokenType.AND, "and", self.line_num, current_col))
-                pos += 3
-            elif text.startswith("or", pos) and not text[pos + 2:pos + 3].isalnum():
-                self.tokens.append(Token(TokenType.OR, "or", self.line_num, current_col))
-                pos += 2
-            elif text.startswith("not", pos) and not text[pos + 3:pos + 4].isalnum():
-                self.tokens.append(Token(TokenType.NOT, "not", self.line_num, current_col))
-                pos += 3
-            elif text[pos:].startswith('->'):
-                self.tokens.append(Token(TokenType.ARROW, '->', self.line_num, current_col))
-                pos += 2
-            elif text[pos:].startswith('=>'):
-                self.tokens.append(Token(TokenType.FAT_ARROW, '=>', self.line_num, current_col))
-                pos += 2
-            elif text[pos:].startswith('..'):
-                self.tokens.append(Token(TokenType.RANGE, '..', self.line_num, current_col))
-                pos += 2
-            elif text[pos] == '+':
-                self.tokens.append(Token(TokenType.PLUS, '+', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '-':
-                self.tokens.append(Token(TokenType.MINUS, '-', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '*':
-                self.tokens.append(Token(TokenType.STAR, '*', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '/':
-                self.tokens.append(Token(TokenType.SLASH, '/', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '=':
-                self.tokens.append(Token(TokenType.ASSIGN, '=', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == ':':
-                self.tokens.append(Token(TokenType.COLON, ':', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == ',':
-                self.tokens.append(Token(TokenType.COMMA, ',', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '(':
-                self.tokens.append(Token(TokenType.LPAREN, '(', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == ')':
-                self.tokens.append(Token(TokenType.RPAREN, ')', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == '[':
-                self.tokens.append(Token(TokenType.LBRACKET, '[', self.line_num, current_col))
-                pos += 1
-            elif text[pos] == ']':
-                self.tokens.append(Token(TokenType.RBRACKET, ']', self.line_num, current_col))
-                pos += 1
-            elif text[pos] in ' \t':
-                pos += 1  # skip extra whitespace
-            elif text.startswith(">>>", pos):
-                raise SyntaxError(f"Unexpected operator '>>>' at line {self.line_num + 1}, column {current_col}")
-            elif text.startswith(">>", pos):
-                raise SyntaxError(f"Unexpected operator '>>' at line {self.line_num + 1}, column {current_col}")
-            elif text.startswith(">=", pos):
-                self.tokens.append(Token(TokenType.GTE, ">=", self.line_num, current_col))
-                pos += 2
-            elif text.startswith("<=", pos):
-                self.tokens.append(Token(TokenType.LTE, "<=", self.line_num, current_col))
-                pos += 2
-            elif text.startswith(">", pos):
-                self.tokens.append(Token(TokenType.GT, ">", self.line_num, current_col))
-                pos += 1
-            elif text.startswith("<", pos):
-                self.tokens.append(Token(TokenType.LT, "<", self.line_num, current_col))
-                pos += 1
-            elif text.startswith("==", pos):
-                self.tokens.append(Token(TokenType.EQ, "==", self.line_num, current_col))
-                pos += 2
-            elif text.startswith("!=", pos):
-                self.tokens.append(Token(TokenType.NEQ, "!=", self.line_num, current_col))
-                pos += 2
-            elif text.startswith("true", pos) and not text[pos + 4:pos + 5].isalnum():
-                self.tokens.append(Token(TokenType.BOOL, "true", self.line_num, current_col))
-                pos += 4
-            elif text.startswith("false", pos) and not text[pos + 5:pos + 6].isalnum():
-                self.tokens.append(Token(TokenType.BOOL, "false", self.line_num, current_col))
-                pos += 5
-            else:
-                raise SyntaxError(f"Unexpected character '{text[pos]}' at line {self.line_num + 1}, column {current_col}")
+            tokens.append(Token(TokenType.DEDENT, '', self.line_num, 0))
+
+    def _tokenize_line(self, line: str, pos: int, tokens: list):
+        # Scans `line` from offset `pos` with the master regex; the offset
+        # doubles as the token column, so the line is never sliced.
+        line_num = self.line_num
+        match = _TOKEN_RE.match
+        end = len(line)
+        while pos < end:
+            m = match(line, pos)
+            if m is None:
+                raise SyntaxError(f"Unexpected character '{line[pos]}' at line {line_num + 1}, column {pos}")
+            kind = m.lastgroup
+            if kind == 'WORD':
+                word = m.group()
+                tokens.append(Token(self.KEYWORDS.get(word, TokenType.IDENT), word, line_num, pos))
+            elif kind == 'SYMBOL':
+                symbol = m.group()
+                tokens.append(Token(_SYMBOLS[symbol], symbol, line_num, pos))
+            elif kind == 'NUMBER':
+                tokens.append(Token(TokenType.NUMBER, m.group(), line_num, pos))
+            elif kind == 'STRING':
+                tokens.append(Token(TokenType.STRING, m.group(kind), line_num, pos))
+            elif kind == 'UNCLOSED':
+                raise SyntaxError(f"Unclosed string starting at line {line_num + 1}, column {pos}")
+            elif kind == 'BAD_OP':
+                raise SyntaxError(f"Unexpected operator '{m.group()}' at line {line_num + 1}, column {pos}")
+            pos = m.end()
 
 
 # Example usage:
@@ -0,0 +1,139 @@
+import mmap
+import re
+from itertools import accumulate
+
+from lexer import Lexer, TokenType, _SYMBOLS, _TOKEN_RE
+from token_buffer import ByteTokenBuffer, TokenBuffer, TYPE_CODES
+
+# The master regex, matched against bytes. Its \d and \W classes are ASCII-only
+# here, which is why only pure-ASCII lines are scanned as bytes.
+_BYTE_TOKEN_RE = re.compile(_TOKEN_RE.pattern.encode(), re.VERBOSE)
+_BYTE_SYMBOLS = {symbol.encode(): TYPE_CODES[tok_type] for symbol, tok_type in _SYMBOLS.items()}
+_BYTE_KEYWORDS = {word.encode(): TYPE_CODES[tok_type] for word, tok_type in Lexer.KEYWORDS.items()}
+_SPACES = re.compile(rb' *')
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+# Line breaks and whitespace that str.splitlines()/str.strip() recognise but
+# a "\n"/"\r\n" split does not; files containing any are lexed as text.
+_TEXT_ONLY = re.compile(rb'[\x0b\x0c\x1c-\x1f]|\r(?!\n)|\xc2\x85|\xe2\x80[\xa8\xa9]')
+
+_IDENT = TYPE_CODES[TokenType.IDENT]
+_NUMBER = TYPE_CODES[TokenType.NUMBER]
+_STRING = TYPE_CODES[TokenType.STRING]
+_NEWLINE = TYPE_CODES[TokenType.NEWLINE]
+
+
+class MappedLexer(Lexer):
+    """Lexes a UTF-8 source file straight out of a read-only memory map.
+
+    Tokens go into a ByteTokenBuffer whose values stay byte offsets into the
+    map until read, so the file is never copied into a `str` or split into a
+    list of lines. Lines with non-ASCII bytes are decoded one at a time and
+    lexed as text, keeping columns and error messages identical to `Lexer`.
+    The map stays open until `close()`, or the end of a `with` block, and
+    the buffer's values cannot be read after that.
+    """
+
+    def __init__(self, path):
+        super().__init__('')
+        with open(path, 'rb') as f:
+            try:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def tokenize(self):
+        data = self.data
+        if _TEXT_ONLY.search(data):
+            return TokenBuffer.from_source(data[:].decode('utf-8'))
+
+        self.buffer = ByteTokenBuffer(data)
+        pos, size = 0, len(data)
+        while pos < size:
+            end = data.find(b'\n', pos)
+            next_pos = size if end == -1 else end + 1
+            if end == -1:
+                end = size
+            if end > pos and data[end - 1] == 0x0D:
+                end -= 1
+            if _NON_ASCII.search(data, pos, end):
+                self._process_text_line(pos, end)
+            else:
+                self._process_byte_line(pos, end)
+            self.line_num += 1
+            pos = next_pos
+
+        pending = []
+        self._finish(pending)
+        for tok in pending:
+            self.buffer.append(tok.type, size, size, tok.line, 0)
+        return self.buffer
+
+    def iter_tokens(self):
+        yield from self.tokenize()
+
+    def _process_byte_line(self, start: int, end: int):
+        data, buffer, line_num = self.data, self.buffer, self.line_num
+        types, starts, ends = buffer.types.append, buffer.starts.append, buffer.ends.append
+        lines, columns = buffer.lines.append, buffer.columns.append
+
+        def add(code, value_start, value_end, column):
+            types(code)
+            starts(value_start)
+            ends(value_end)
+            lines(line_num)
+            columns(column)
+
+        if data.find(b'\t', start, end) != -1:
+            raise SyntaxError(f"Tabs not allowed (line {line_num + 1})")
+        pos = _SPACES.match(data, start, end).end()
+        if pos == end:
+            add(_NEWLINE, start, start, 0)
+            return
+
+        pending = []
+        self._indent_to(pos - start, pending)
+        for tok in pending:
+            add(TYPE_CODES[tok.type], start, start, 0)
+
+        match = _BYTE_TOKEN_RE.match
+        while pos < end:
+            m = match(data, pos, end)
+            column = pos - start
+            if m is None:
+                raise SyntaxError(f"Unexpected character '{chr(data[pos])}' at line {line_num + 1}, column {column}")
+            kind = m.lastgroup
+            if kind == 'WORD':
+                add(_BYTE_KEYWORDS.get(m.group(), _IDENT), pos, m.end(), column)
+            elif kind == 'SYMBOL':
+                add(_BYTE_SYMBOLS[m.group()], pos, m.end(), column)
+            elif kind == 'NUMBER':
+                add(_NUMBER, pos, m.end(), column)
+            elif kind == 'STRING':
+                add(_STRING, m.start(kind), m.end(kind), column)
+            elif kind == 'UNCLOSED':
+                raise SyntaxError(f"Unclosed string starting at line {line_num + 1}, column {column}")
+            elif kind == 'BAD_OP':
+                raise SyntaxError(f"Unexpected operator '{m.group().decode()}' at line {line_num + 1}, column {column}")
+            pos = m.end()
+        add(_NEWLINE, end, end, end - start)
+
+    def _process_text_line(self, start: int, end: int):
+        line = self.data[start:end].decode('utf-8')
+        pending = []
+        self._process_line(line, pending)
+        # Byte offset of every character boundary, to map columns back to the map.
+        offsets = list(accumulate((len(ch.encode('utf-8')) for ch in line), initial=start))
+        for tok in pending:
+            value_start = tok.column + 1 if tok.type is TokenType.STRING else tok.column
+            self.buffer.append(tok.type, offsets[value_start], offsets[value_start + len(tok.value)],
+                               tok.line, tok.column)
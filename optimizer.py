@@ -0,0 +1,157 @@
+import operator
+
+from fluent_ast import (
+    Binary, Boolean, Call, ExprStmt, FnDecl, IfExpr, IndexExpr, LetStmt, ListLiteral, MatchCase, MatchExpr, Number,
+    Return, String
+)
+from visitor import MethodTable, Visitor
+
+_OPERATORS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+    ">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+    "and": lambda l, r: l and r, "or": lambda l, r: l or r, "and not": lambda l, r: l and not r,
+}
+_LITERALS = {int: Number, str: String, bool: Boolean}
+_BINDING_STMTS = (LetStmt, FnDecl)
+
+
+def _literal(value):
+    """The literal node for `value`, or None if Fluent has no literal of its type."""
+    node_type = _LITERALS.get(type(value))
+    return node_type(value) if node_type is not None else None
+
+
+def _is_literal(node):
+    return type(node) in (Number, String, Boolean)
+
+
+def fold_constants(stmts):
+    """A copy of the program `stmts` with work that does not depend on run
+    time done in advance; running it gives the same results and errors."""
+    return ConstantFolder().fold_block(stmts, {})
+
+
+class ConstantFolder(Visitor):
+    """Folds literal operands, constant lets, and ifs and matches on constants.
+
+    `consts` maps the names whose value is known at each point to their
+    literal: those bound by a `let` of a constant earlier in the same
+    block or an enclosing one. A name is forgotten when it is bound again.
+    Function bodies start with no constants: scoping is dynamic, so a
+    name a function does not bind itself depends on its caller. Anything
+    that could fail (`1 / 0`, an `if` on a number, a match with no arm for
+    its value) is left for run time to report.
+    """
+    _fold_table = MethodTable("fold_", "_unchanged")
+
+    def fold(self, node, consts):
+        return self._fold_table[type(node)](self, node, consts)
+
+    def fold_block(self, stmts, consts):
+        """Fold the statements of one block; `consts` is updated with its lets."""
+        folded = []
+        for stmt in stmts:
+            stmt = self.fold(stmt, consts)
+            if type(stmt) is ExprStmt and type(stmt.expr) is IfExpr:
+                branch = self._chosen_branch(stmt.expr)
+                # An if on a constant becomes the statements of its branch,
+                # unless they bind a name, which needs the branch's scope.
+                if branch and not any(type(s) in _BINDING_STMTS for s in branch):
+                    folded.extend(branch)
+                    continue
+            folded.append(stmt)
+        return folded
+
+    def _unchanged(self, node, consts):
+        return node
+
+    # --- Statements ---
+
+    def fold_LetStmt(self, stmt, consts):
+        value = self.fold(stmt.value, consts)
+        if _is_literal(value):
+            consts[stmt.name] = value
+        else:
+            consts.pop(stmt.name, None)
+        return LetStmt(stmt.name, stmt.type_annotation, value)
+
+    def fold_FnDecl(self, stmt, consts):
+        consts.pop(stmt.name, None)
+        return FnDecl(stmt.name, stmt.params, stmt.return_type, self.fold_block(stmt.body, {}))
+
+    def fold_ExprStmt(self, stmt, consts):
+        return ExprStmt(self.fold(stmt.expr, consts))
+
+    def fold_Return(self, stmt, consts):
+        return Return(self.fold(stmt.expr, consts))
+
+    # --- Expressions ---
+
+    def fold_Var(self, expr, consts):
+        return consts.get(expr.name, expr)
+
+    def fold_ListLiteral(self, expr, consts):
+        return ListLiteral([self.fold(elem, consts) for elem in expr.elements])
+
+    def fold_IndexExpr(self, expr, consts):
+        return IndexExpr(self.fold(expr.target, consts), self.fold(expr.index, consts))
+
+    def fold_Call(self, expr, consts):
+        return Call(expr.func, [self.fold(arg, consts) for arg in expr.args])
+
+    def fold_Binary(self, expr, consts):
+        left, right = self.fold(expr.left, consts), self.fold(expr.right, consts)
+        apply = _OPERATORS.get(expr.op)
+        if apply is not None and _is_literal(left):
+            if _is_literal(right):
+                try:
+                    folded = _literal(apply(left.value, right.value))
+                except Exception:
+                    folded = None  # raises at run time, if ever evaluated
+                if folded is not None:
+                    return folded
+            # A constant left operand decides whether the right one is evaluated.
+            elif expr.op in ("and", "and not") and not left.value or expr.op == "or" and left.value:
+                return left
+            elif expr.op in ("and", "or"):
+                return right
+        return Binary(left, expr.op, right)
+
+    def fold_IfExpr(self, expr, consts):
+        condition = self.fold(expr.condition, consts)
+        then_branch = self.fold_block(expr.then_branch, dict(consts))
+        else_branch = self.fold_block(expr.else_branch, dict(consts)) if expr.else_branch is not None else None
+        if type(condition) is not Boolean:
+            return IfExpr(condition, then_branch, else_branch)
+        branch = then_branch if condition.value else else_branch
+        if branch is not None and len(branch) == 1 and type(branch[0]) is ExprStmt:
+            return branch[0].expr
+        # Keep the branch in its own scope, and the dead one dropped.
+        return IfExpr(condition, branch, None) if condition.value else IfExpr(condition, [], branch)
+
+    def _chosen_branch(self, expr):
+        """The branch a folded `if` always takes, or None if that is not known."""
+        if type(expr.condition) is not Boolean:
+            return None
+        return expr.then_branch if expr.condition.value else expr.else_branch
+
+    def fold_MatchExpr(self, expr, consts):
+        subject = self.fold(expr.matched_expr, consts)
+        cases, seen = [], set()
+        for case in expr.cases:
+            pattern = case.pattern
+            if pattern != "_" and not isinstance(pattern, (int, str)):
+                continue  # never matches
+            if _is_literal(subject):
+                if pattern == "_" or subject.value == pattern:
+                    return self.fold(case.expr, consts)  # the arm the constant always takes
+                continue
+            if (type(pattern), pattern) in seen:
+                continue  # an earlier arm takes the same values
+            seen.add((type(pattern), pattern))
+            cases.append(MatchCase(pattern, self.fold(case.expr, consts)))
+            if pattern == "_":
+                break  # arms after a wildcard are unreachable
+        # A constant that no arm takes is left to fail at run time.
+        return MatchExpr(subject, cases)
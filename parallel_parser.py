@@ -0,0 +1,74 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from parser import Parser
+
+# A top-level statement starts on a non-blank line with no indentation; only
+# the `else` of a top-level if/else begins at column 0 without starting one.
+_CONTINUATION = re.compile(r'else(?![a-zA-Z0-9_])')
+
+# Below this many lines a process pool costs more than it saves.
+MIN_PARALLEL_LINES = 2000
+
+
+def split_top_level(source: str, chunks: int):
+    """Split `source` into at most `chunks` runs of whole top-level statements.
+
+    Returns (first_line, text) pairs in source order; the texts concatenate
+    back to `source`, and each one lexes and parses on its own because every
+    cut is at a line where the indent stack is empty.
+    """
+    lines = source.splitlines(keepends=True)
+    target = max(1, -(-len(lines) // max(1, chunks)))
+    parts, first = [], 0
+    for i in range(target, len(lines)):
+        if i - first < target:
+            continue
+        line = lines[i]
+        if line.strip() and not line[0].isspace() and not _CONTINUATION.match(line):
+            parts.append((first, "".join(lines[first:i])))
+            first = i
+    parts.append((first, "".join(lines[first:])))
+    return parts
+
+
+def _parse_chunk(part):
+    first_line, text = part
+    return Parser(text, first_line).parse()
+
+
+def parse_parallel(source: str, workers=None, min_lines=MIN_PARALLEL_LINES):
+    """Parse `source` like `Parser(source).parse()`, spreading it over processes.
+
+    The source is cut at top-level statement boundaries, the pieces are
+    parsed in a process pool and the statement lists are concatenated in
+    order. If any piece fails, the whole source is parsed again in this
+    process, so errors are exactly those of `Parser(source).parse()`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or source.count("\n") < min_lines:
+        return Parser(source).parse()
+
+    # A few pieces per worker keeps them busy when statement sizes vary.
+    parts = split_top_level(source, workers * 4)
+    if len(parts) == 1:
+        return Parser(source).parse()
+    stmts = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(parts))) as pool:
+        futures = [pool.submit(_parse_chunk, part) for part in parts]
+        for part, future in zip(parts, futures):
+            try:
+                stmts.extend(future.result())
+            except RecursionError:
+                # Trees too deep to pickle back are parsed here instead.
+                stmts.extend(_parse_chunk(part))
+            except SyntaxError:
+                # A piece ends where the source does not, so its error can
+                # differ from the whole source's (a dangling `else` sees the
+                # end of input rather than the next statement).
+                pool.shutdown(cancel_futures=True)
+                break
+        else:
+            return stmts
+    return Parser(source).parse()
@@ -1,7 +1,13 @@
+from collections import deque
+
 from fluent_ast import LetStmt, Number, String, Var, Binary, FnDecl, FnParam, \
     ExprStmt, Call, IfExpr, MatchExpr, MatchCase, Boolean, ListLiteral, IndexExpr, ListType, SimpleType
 from lexer import Lexer, TokenType, Token
 
+# Bump whenever the parser or the AST classes change what a source parses to;
+# cached ASTs (see ast_cache.py) are keyed on it.
+PARSER_VERSION = "4"
+
 PRECEDENCE = {
     "or": 1,
     "and": 2,
@@ -17,18 +23,55 @@ PRECEDENCE = {
     "/": 5
 }
 
+# Calls and indexing bind tighter than any binary operator.
+POSTFIX_PRECEDENCE = max(PRECEDENCE.values()) + 2
 
-class Parser:
-    def __init__(self, source: str):
-        self.tokens = Lexer(source).tokenize()
-        self.pos = 0
 
-    def peek(self):
-        return self.tokens[self.pos]
+def _tokens_from_path(path):
+    # Copies of the tokens of a mapped file, which is unmapped as soon as the
+    # last one (EOF) is copied, or when lexing fails.
+    with Lexer.from_path(path) as lexer:
+        tokens = lexer.tokenize()
+        for index in range(len(tokens) - 1):
+            tok = tokens[index]
+            yield Token(tok.type, tok.value, tok.line, tok.column)
+        eof = tokens[-1]
+        eof = Token(eof.type, eof.value, eof.line, eof.column)
+    yield eof
+
+
+class Parser:
+    def __init__(self, source, first_line=0):
+        # Tokens are pulled from the lexer on demand through a small lookahead
+        # buffer, so only the tokens of the statement being parsed are alive.
+        self.token_stream = Lexer(source, first_line).iter_tokens()
+        self.lookahead = deque()
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        # Parse an already-lexed sequence: a token list, a TokenBuffer or any
+        # iterable of Token-like objects ending in EOF.
+        parser = cls.__new__(cls)
+        parser.token_stream = iter(tokens)
+        parser.lookahead = deque()
+        return parser
+
+    @classmethod
+    def from_path(cls, path):
+        return cls.from_tokens(_tokens_from_path(path))
+
+    def peek(self, offset=0):
+        lookahead = self.lookahead
+        while len(lookahead) <= offset:
+            try:
+                lookahead.append(next(self.token_stream))
+            except StopIteration:
+                raise SyntaxError("Unexpected end of input") from None
+        return lookahead[offset]
 
     def advance(self):
-        tok = self.tokens[self.pos]
-        self.pos += 1
+        tok = self.peek()
+        self.lookahead.popleft()
         return tok
 
     def expect(self, type_):
@@ -38,14 +81,17 @@ class Parser:
         return tok
 
     def parse(self):
-        stmts = []
+        return list(self.iter_stmts())
+
+    def iter_stmts(self):
+        # Yields each top-level statement as soon as it is parsed; nothing
+        # past it has been read from the source yet.
         while self.peek().type != TokenType.EOF:
             # Skip over empty lines
             if self.peek().type == TokenType.NEWLINE:
                 self.advance()
                 continue
-            stmts.append(self.parse_stmt())
-        return stmts
+            yield self.parse_stmt()
 
     def parse_if_expr(self):
         self.expect(TokenType.IF)
@@ -115,104 +161,79 @@ class Parser:
             return ListType(element_type=element_type)
         return SimpleType(name=type_name)
 
-    def parse_atom(self):
-        tok = self.peek()
+    def parse_expr(self, min_precedence=0):
+        # Pratt loop: a prefix handler starts the expression, then infix and
+        # postfix handlers extend it while they bind at least as tightly as
+        # `min_precedence`. Calls and indexing always bind.
+        left = self.parse_unary()
+        infix_table = self.INFIX
+        while True:
+            infix = infix_table.get(self.peek().type)
+            if infix is None:
+                break
+            precedence, handler, op = infix
+            if precedence < min_precedence:
+                break
+            left = handler(self, left, op, precedence)
+        return left
 
-        if tok.type == TokenType.MATCH:
-            return self.parse_match_expr()
-        elif tok.type == TokenType.IF:
-            return self.parse_if_expr()
-        elif tok.type == TokenType.LBRACKET:
-            self.advance()
-            elements = []
-            if self.peek().type != TokenType.RBRACKET:
-                elements.append(self.parse_expr())
-                while self.peek().type == TokenType.COMMA:
-                    self.advance()
-                    elements.append(self.parse_expr())
-            self.expect(TokenType.RBRACKET)
-            return ListLiteral(elements)
-        elif tok.type == TokenType.LPAREN:
-            self.advance()
-            expr = self.parse_expr()
-            self.expect(TokenType.RPAREN)
-            return expr
-        elif tok.type == TokenType.NUMBER:
-            return self.parse_number()
-        elif tok.type == TokenType.STRING:
-            return self.parse_string()
-        elif tok.type == TokenType.BOOL:
-            self.advance()
-            return Boolean(tok.value == "true")
-        elif tok.type == TokenType.IDENT:
-            return self.parse_var()
-        else:
+    def parse_unary(self):
+        tok = self.peek()
+        prefix = self.PREFIX.get(tok.type)
+        if prefix is None:
             raise SyntaxError(f"Unsupported expression starting with {tok.type}")
+        return prefix(self)
 
-    def parse_expr(self, min_precedence=0):
-        left = self.parse_unary()
+    def parse_not(self):
+        self.expect(TokenType.NOT)
+        operand = self.parse_unary()
+        return Binary(left=Boolean.interned(True), op="and not", right=operand)
 
-        while True:
-            tok = self.peek()
+    def parse_group(self):
+        self.expect(TokenType.LPAREN)
+        expr = self.parse_expr()
+        self.expect(TokenType.RPAREN)
+        return expr
 
-            # Function call (e.g. foo(1, 2))
-            if tok.type == TokenType.LPAREN:
+    def parse_list(self):
+        self.expect(TokenType.LBRACKET)
+        elements = []
+        if self.peek().type != TokenType.RBRACKET:
+            elements.append(self.parse_expr())
+            while self.peek().type == TokenType.COMMA:
                 self.advance()
-                args = []
-                if self.peek().type != TokenType.RPAREN:
-                    args.append(self.parse_expr())
-                    while self.peek().type == TokenType.COMMA:
-                        self.advance()
-                        args.append(self.parse_expr())
-                self.expect(TokenType.RPAREN)
-                if isinstance(left, Var):
-                    left = Call(func=left.name, args=args)
-                else:
-                    raise SyntaxError(f"Cannot call non-variable expression at line {tok.line + 1}")
-                continue
+                elements.append(self.parse_expr())
+        self.expect(TokenType.RBRACKET)
+        return ListLiteral(elements)
 
-            if tok.type == TokenType.LBRACKET:
-                self.advance()
-                index_expr = self.parse_expr()
-                self.expect(TokenType.RBRACKET)
-                left = IndexExpr(target=left, index=index_expr)
-                continue
+    def parse_bool(self):
+        tok = self.expect(TokenType.BOOL)
+        return Boolean.interned(tok.value == "true")
 
-            binary_ops = {
-                TokenType.PLUS: "+",
-                TokenType.MINUS: "-",
-                TokenType.STAR: "*",
-                TokenType.SLASH: "/",
-                TokenType.GT: ">",
-                TokenType.LT: "<",
-                TokenType.GTE: ">=",
-                TokenType.LTE: "<=",
-                TokenType.EQ: "==",
-                TokenType.NEQ: "!=",
-                TokenType.AND: "and",
-                TokenType.OR: "or",
-            }
-
-            if tok.type in binary_ops:
-                op = binary_ops[tok.type]
-                precedence = PRECEDENCE[op]
-                if precedence < min_precedence:
-                    break
-                self.advance()
-                right = self.parse_expr(precedence + 1)
-                left = Binary(left=left, op=op, right=right)
-            else:
-                break
+    def parse_binary(self, left, op, precedence):
+        self.advance()
+        right = self.parse_expr(precedence + 1)
+        return Binary(left=left, op=op, right=right)
 
-        return left
+    def parse_call(self, left, op, precedence):
+        # Function call (e.g. foo(1, 2))
+        tok = self.advance()
+        args = []
+        if self.peek().type != TokenType.RPAREN:
+            args.append(self.parse_expr())
+            while self.peek().type == TokenType.COMMA:
+                self.advance()
+                args.append(self.parse_expr())
+        self.expect(TokenType.RPAREN)
+        if isinstance(left, Var):
+            return Call(func=left.name, args=args)
+        raise SyntaxError(f"Cannot call non-variable expression at line {tok.line + 1}")
 
-    def parse_unary(self):
-        tok = self.peek()
-        if tok.type == TokenType.NOT:
-            self.advance()
-            operand = self.parse_unary()
-            return Binary(left=Boolean(True), op="and not", right=operand)
-        return self.parse_atom()
+    def parse_index(self, left, op, precedence):
+        self.advance()
+        index_expr = self.parse_expr()
+        self.expect(TokenType.RBRACKET)
+        return IndexExpr(target=left, index=index_expr)
 
     def parse_match_expr(self):
         self.expect(TokenType.MATCH)
@@ -246,7 +267,7 @@ class Parser:
 
     def parse_number(self):
         tok = self.expect(TokenType.NUMBER)
-        return Number(value=int(tok.value))
+        return Number.interned(int(tok.value))
 
     def parse_string(self):
         tok = self.expect(TokenType.STRING)
@@ -254,7 +275,7 @@ class Parser:
 
     def parse_var(self):
         tok = self.expect(TokenType.IDENT)
-        return Var(name=tok.value)
+        return Var.interned(tok.value)
 
     def parse_fn_decl(self):
         self.expect(TokenType.FN)
@@ -273,7 +294,7 @@ class Parser:
         return_type = None
         if self.peek().type == TokenType.ARROW:
             self.advance()
-            return_type = self.expect(TokenType.IDENT).value
+            return_type = self.parse_type()
 
         # Parse block
         self.expect(TokenType.NEWLINE)
@@ -293,6 +314,36 @@ class Parser:
         type_annotation = self.parse_type()
         return FnParam(name=name_tok.value, type_annotation=type_annotation)
 
+    PREFIX = {
+        TokenType.MATCH: parse_match_expr,
+        TokenType.IF: parse_if_expr,
+        TokenType.LBRACKET: parse_list,
+        TokenType.LPAREN: parse_group,
+        TokenType.NUMBER: parse_number,
+        TokenType.STRING: parse_string,
+        TokenType.BOOL: parse_bool,
+        TokenType.IDENT: parse_var,
+        TokenType.NOT: parse_not,
+    }
+
+    # token type -> (precedence, handler, operator)
+    INFIX = {
+        TokenType.LPAREN: (POSTFIX_PRECEDENCE, parse_call, None),
+        TokenType.LBRACKET: (POSTFIX_PRECEDENCE, parse_index, None),
+        TokenType.PLUS: (PRECEDENCE["+"], parse_binary, "+"),
+        TokenType.MINUS: (PRECEDENCE["-"], parse_binary, "-"),
+        TokenType.STAR: (PRECEDENCE["*"], parse_binary, "*"),
+        TokenType.SLASH: (PRECEDENCE["/"], parse_binary, "/"),
+        TokenType.GT: (PRECEDENCE[">"], parse_binary, ">"),
+        TokenType.LT: (PRECEDENCE["<"], parse_binary, "<"),
+        TokenType.GTE: (PRECEDENCE[">="], parse_binary, ">="),
+        TokenType.LTE: (PRECEDENCE["<="], parse_binary, "<="),
+        TokenType.EQ: (PRECEDENCE["=="], parse_binary, "=="),
+        TokenType.NEQ: (PRECEDENCE["!="], parse_binary, "!="),
+        TokenType.AND: (PRECEDENCE["and"], parse_binary, "and"),
+        TokenType.OR: (PRECEDENCE["or"], parse_binary, "or"),
+    }
+
 
 if __name__ == '__main__':
     source = 'let x = 42'
@@ -1,76 +1,87 @@
 from fluent_ast import *
 from parser import Parser
+from visitor import NodeVisitor
 
-def pretty_print(node, indent=0):
-    pad = "  " * indent
-
-    if isinstance(node, list):
-        for n in node:
-            pretty_print(n, indent)
-        return
 
-    if isinstance(node, FnDecl):
+class PrettyPrinter(NodeVisitor):
+    def visit_FnDecl(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}FnDecl(name={node.name})")
         for param in node.params:
-            pretty_print(param, indent + 1)
-        pretty_print(node.body, indent + 1)
+            self.visit(param, indent + 1)
+        self.visit(node.body, indent + 1)
 
-    elif isinstance(node, FnParam):
+    def visit_FnParam(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Param(name={node.name}, type={node.type_annotation})")
 
-    elif isinstance(node, LetStmt):
+    def visit_LetStmt(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}LetStmt(name={node.name})")
-        pretty_print(node.value, indent + 1)
+        self.visit(node.value, indent + 1)
 
-    elif isinstance(node, ExprStmt):
+    def visit_ExprStmt(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}ExprStmt")
-        pretty_print(node.expr, indent + 1)
+        self.visit(node.expr, indent + 1)
 
-    elif isinstance(node, Number):
+    def visit_Number(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Number(value={node.value})")
 
-    elif isinstance(node, String):
+    def visit_String(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}String(value={repr(node.value)})")
 
-    elif isinstance(node, Var):
+    def visit_Var(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Var(name={node.name})")
 
-    elif isinstance(node, Binary):
+    def visit_Binary(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Binary(op={node.op})")
-        pretty_print(node.left, indent + 1)
-        pretty_print(node.right, indent + 1)
+        self.visit(node.left, indent + 1)
+        self.visit(node.right, indent + 1)
 
-    elif isinstance(node, Call):
+    def visit_Call(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Call(func={node.func})")
         for arg in node.args:
-            pretty_print(arg, indent + 1)
+            self.visit(arg, indent + 1)
 
-    elif isinstance(node, IfExpr):
+    def visit_IfExpr(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}IfExpr")
         print(f"{pad}  Condition:")
-        pretty_print(node.condition, indent + 2)
+        self.visit(node.condition, indent + 2)
         print(f"{pad}  Then:")
-        pretty_print(node.then_branch, indent + 2)
+        self.visit(node.then_branch, indent + 2)
         if node.else_branch:
             print(f"{pad}  Else:")
-            pretty_print(node.else_branch, indent + 2)
+            self.visit(node.else_branch, indent + 2)
 
-    elif isinstance(node, MatchExpr):
+    def visit_MatchExpr(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}MatchExpr")
         print(f"{pad}  Matched:")
-        pretty_print(node.matched_expr, indent + 2)
+        self.visit(node.matched_expr, indent + 2)
         print(f"{pad}  Cases:")
         for case in node.cases:
-            pretty_print(case, indent + 2)
+            self.visit(case, indent + 2)
 
-    elif isinstance(node, MatchCase):
+    def visit_MatchCase(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}MatchCase(pattern={node.pattern})")
-        pretty_print(node.expr, indent + 1)
+        self.visit(node.expr, indent + 1)
 
-    else:
+    def generic_visit(self, node, indent):
+        pad = "  " * indent
         print(f"{pad}Unknown({node})")
 
 
+def pretty_print(node, indent=0):
+    PrettyPrinter().visit(node, indent)
+
 if __name__ == '__main__':
     source = """
 fn classify(x: Int)
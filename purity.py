@@ -0,0 +1,170 @@
+from collections import OrderedDict
+
+from fluent_ast import FnDecl
+from symbols import symbol
+from visitor import NodeVisitor
+
+# Builtins whose result depends on their arguments only.
+PURE_BUILTINS = frozenset({"len"})
+
+NO_KEY = object()  # memo_key of arguments that cannot be hashed
+MISSING = object()
+
+
+class _Binders(NodeVisitor):
+    """Every name a let, parameter or function declaration binds under the visited nodes."""
+
+    def __init__(self):
+        self.names = set()
+
+    def visit_FnDecl(self, node):
+        self.names.add(node.name)
+        self.names.update(param.name for param in node.params)
+        self.visit_list(node.body)
+
+    def visit_LetStmt(self, node):
+        self.names.add(node.name)
+        self.visit(node.value)
+
+
+class _Body(NodeVisitor):
+    """What one function body depends on besides its arguments: the names
+    it reads or calls without binding them first, in source order."""
+
+    def __init__(self, fn):
+        self.scopes = [{param.name for param in fn.params}]
+        self.reads = set()
+        self.calls = set()
+        self.opaque = False  # declares a function or calls a local value
+
+    def bound(self, name):
+        return any(name in scope for scope in self.scopes)
+
+    def visit_FnDecl(self, node):
+        self.opaque = True
+
+    def visit_LetStmt(self, node):
+        self.visit(node.value)
+        self.scopes[-1].add(node.name)
+
+    def visit_Var(self, node):
+        if not self.bound(node.name):
+            self.reads.add(node.name)
+
+    def visit_Call(self, node):
+        if self.bound(node.func):
+            self.opaque = True
+        else:
+            self.calls.add(node.func)
+        self.visit_list(node.args)
+
+    def visit_IfExpr(self, node):
+        self.visit(node.condition)
+        for branch in (node.then_branch, node.else_branch or []):
+            self.scopes.append(set())
+            self.visit_list(branch)
+            self.scopes.pop()
+
+
+def pure_functions(stmts, known=(), declared=()):
+    """Names of the top-level functions in `stmts` whose result depends only on their arguments.
+
+    Such a function binds every name it reads (apart from other functions),
+    prints nothing and calls only pure functions: the PURE_BUILTINS, pure
+    functions of `stmts`, and those in `known` from earlier programs. Scoping
+    is dynamic, so a function name counts only if nothing in `stmts` binds
+    it again, not even as a local. Functions named in `declared` are taken
+    to be pure without looking at them.
+    """
+    binders = _Binders()
+    functions = {}
+    for stmt in stmts:
+        if type(stmt) is FnDecl and stmt.name not in functions:
+            functions[stmt.name] = stmt
+            binders.names.update(param.name for param in stmt.params)
+            binders.visit_list(stmt.body)
+        else:
+            binders.visit(stmt)
+    rebound = binders.names
+    stable = {name for name in functions.keys() | set(known) | PURE_BUILTINS if name not in rebound}
+
+    pure, bodies = set(), {}
+    for name, fn in functions.items():
+        body = bodies[name] = _Body(fn)
+        body.visit_list(fn.body)
+        if name in declared or name in stable and not body.opaque and body.reads <= stable:
+            pure.add(name)
+    # Assume every candidate pure, so that recursion does not rule itself
+    # out, and drop those calling anything impure until nothing changes.
+    # A builtin or known name that `stmts` declare again is judged by the
+    # new declaration, like any other function of `stmts`.
+    others = stable - functions.keys()
+    changed = True
+    while changed:
+        callable_ = pure | others
+        impure = {name for name in pure if name not in declared and not bodies[name].calls <= callable_}
+        pure -= impure
+        changed = bool(impure)
+    return pure
+
+
+def rebinds(stmts, env):
+    """Whether `stmts` bind, anywhere, a name `env` defines already."""
+    binders = _Binders()
+    binders.visit_list(stmts)
+    return any(symbol(name) in env.values for name in binders.names)
+
+
+def memo_key(args):
+    """A hashable key, equal for two argument lists exactly when they hold
+    equal values of the same types; NO_KEY when an argument has no key."""
+    if len(args) == 1:
+        return _freeze(args[0])
+    key = tuple(_freeze(arg) for arg in args)
+    return NO_KEY if NO_KEY in key else key
+
+
+def _freeze(value):
+    kind = type(value)
+    if kind is int or kind is str or value is None:
+        return value  # never equal to one another, nor to a tagged tuple
+    if kind is list:
+        elements = tuple(_freeze(elem) for elem in value)
+        return NO_KEY if NO_KEY in elements else (list, elements)
+    if kind is bool or kind is float:
+        return kind, value  # True == 1 == 1.0
+    return NO_KEY
+
+
+class MemoCache:
+    """Results of one pure function by memo_key, the least recently used
+    dropped beyond `maxsize`; `hits` and `misses` count lookups."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f"<MemoCache hits={self.hits} misses={self.misses} size={len(self.entries)}/{self.maxsize}>"
+
+    def get(self, key):
+        value = self.entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,582 @@
+import hashlib
+import importlib.util
+import itertools
+import marshal
+import re
+import weakref
+
+from ast_cache import ContentCache
+from fluent_ast import Binary, Boolean, ExprStmt, FnDecl, SimpleType
+from interpreter import (
+    BuiltInFunction, Environment, Interpreter, ReturnException, check_type, drop_cached, format_type
+)
+from symbols import symbol
+from visitor import MethodTable, NodeVisitor, Visitor
+
+_PY_TYPES = {"Int": "int", "String": "str", "Bool": "bool"}
+_ARITHMETIC = frozenset({"+", "-", "*", "/"})
+_COMPARISONS = frozenset({">", "<", ">=", "<=", "==", "!="})
+# Generated code that can be evaluated again, or later, with the same result.
+_TRIVIAL = re.compile(r"\w+|K\[\d+\]")
+
+
+def _ident(name):
+    return re.sub(r"\W", "_", name)
+
+
+def _indent(lines):
+    return ["    " + line for line in lines]
+
+
+class _Scan(NodeVisitor):
+    """Finds every FnDecl under the visited nodes, and the names they read
+    from their callers' scopes: under dynamic scoping those are the only
+    locals a call has to pass on."""
+
+    def __init__(self):
+        self.functions = []
+        self.free = set()
+        self.scopes = [None]  # None: the environment itself
+
+    def bind(self, name):
+        if self.scopes[-1] is not None:
+            self.scopes[-1].add(name)
+
+    def use(self, name):
+        for scope in reversed(self.scopes):
+            if scope is None or name in scope:
+                return
+        self.free.add(name)
+
+    def visit_FnDecl(self, node):
+        self.bind(node.name)
+        self.functions.append(node)
+        outer, self.scopes = self.scopes, [{param.name for param in node.params}]
+        self.visit_list(node.body)
+        self.scopes = outer
+
+    def visit_LetStmt(self, node):
+        self.visit(node.value)
+        self.bind(node.name)
+
+    def visit_IfExpr(self, node):
+        self.visit(node.condition)
+        for branch in (node.then_branch, node.else_branch):
+            if branch is not None:
+                self.scopes.append(set())
+                self.visit_list(branch)
+                self.scopes.pop()
+
+    def visit_Var(self, node):
+        self.use(node.name)
+
+    def visit_Call(self, node):
+        self.use(node.func)
+        self.visit_list(node.args)
+
+
+class PythonGenerator(Visitor):
+    """Translates Fluent statements into the source of a Python module.
+
+    Each FnDecl becomes `def fN_name(scope, *params)` and the statements
+    themselves `def main(scope)`. Parameters and lets inside functions and
+    blocks are Python locals, one per binding; other names are looked up
+    in `scope`, the Environment the caller passed. Calls hand the callee
+    an Environment holding the caller's visible locals whose names appear
+    in `dynamic` (read by some function without binding them), which keeps
+    dynamic scoping without building one for every call. `if`/`match`
+    become conditional expressions, or statements when a branch needs them.
+    """
+    _expr_table = MethodTable("expr_", "_unsupported_expr")
+    _stmt_table = MethodTable("stmt_", "_unsupported_stmt")
+
+    def __init__(self, dynamic):
+        self.dynamic = dynamic
+        self.consts = []      # objects the module refers to as K[i]
+        self._const_index = {}
+        self.symbols = {}     # Fluent name -> module global holding its symbol ID
+        self.sites = []       # module globals caching [function, code] per call
+        self.functions = []   # (FnDecl, Python function name)
+        self._counter = itertools.count()
+        self.lines = []
+        self.scopes = [None]
+        self.function = None
+
+    def module(self, stmts, functions):
+        defs = []
+        for fn in functions:
+            name = f"f{len(self.functions)}_{_ident(fn.name)}"
+            self.functions.append((fn, name))
+            defs += self.compile_function(fn, name)
+        defs += self.compile_main(stmts)
+        header = [f"{py} = symbol({name!r})" for name, py in self.symbols.items()]
+        header += [f"{site} = [UNSET, None]" for site in self.sites]
+        return "\n".join(header + defs) + "\n"
+
+    def compile_main(self, stmts):
+        self.lines, self.scopes, self.function = [], [None], None
+        value = self.block(stmts)
+        return ["def main(scope):", *_indent(self.lines), f"    return {value}"]
+
+    def compile_function(self, fn, name):
+        self.lines, self.function = [], fn
+        params, locals_ = {}, []
+        for param in fn.params:
+            params[param.name] = local = self.local(param.name)
+            locals_.append(local)
+            test = self.type_test(local, param.type_annotation)
+            if test:
+                self.lines.append(f"if not {test}:")
+                self.lines.append(f"    param_error({param.name!r}, {self.const(param.type_annotation)}, {local})")
+        self.scopes = [params]
+        self.emit_return(self.block(fn.body))
+        return [f"def {name}({', '.join(['scope', *locals_])}):", *_indent(self.lines)]
+
+    # --- Names ---
+
+    def local(self, name):
+        return f"v{next(self._counter)}_{_ident(name)}"
+
+    def temp(self):
+        return f"_t{next(self._counter)}"
+
+    def symbol(self, name):
+        if name not in self.symbols:
+            self.symbols[name] = f"s{len(self.symbols)}_{_ident(name)}"
+        return self.symbols[name]
+
+    def const(self, value):
+        index = self._const_index.get(id(value))
+        if index is None:
+            index = self._const_index[id(value)] = len(self.consts)
+            self.consts.append(value)
+        return f"K[{index}]"
+
+    def resolve(self, name):
+        for scope in reversed(self.scopes):
+            if scope is None:
+                break
+            if name in scope:
+                return scope[name]
+        return f"scope.lookup({self.symbol(name)})"
+
+    def call_scope(self):
+        visible = {}
+        for scope in self.scopes:
+            if scope:
+                visible.update(scope)
+        pairs = [f"{self.symbol(name)}: {local}" for name, local in visible.items() if name in self.dynamic]
+        return f"extend(scope, {{{', '.join(pairs)}}})" if pairs else "scope"
+
+    def type_test(self, value, annotation):
+        """Python source for `check_type(value, annotation)`, or None when it always holds."""
+        if isinstance(annotation, SimpleType):
+            if annotation.name not in _PY_TYPES:
+                return None
+            return f"isinstance({value}, {_PY_TYPES[annotation.name]})"
+        return f"check_type({value}, {self.const(annotation)})"
+
+    # --- Code layout ---
+
+    def capture(self, compile, *args):
+        """Run `compile(*args)` into a fresh line buffer; returns (lines, value)."""
+        outer, self.lines = self.lines, []
+        try:
+            value = compile(*args)
+        finally:
+            lines, self.lines = self.lines, outer
+        return lines, value
+
+    def operands(self, items):
+        """Code for each node (or ready-made code) in `items`, evaluated left to right.
+
+        When an operand needs statements, earlier operands are first saved
+        in temporaries so they still run before those statements.
+        """
+        codes = []
+        for item in items:
+            mark = len(self.lines)
+            code = item if isinstance(item, str) else self.expr(item)
+            if len(self.lines) > mark:
+                spills = []
+                for i, prev in enumerate(codes):
+                    if not _TRIVIAL.fullmatch(prev):
+                        codes[i] = self.temp()
+                        spills.append(f"{codes[i]} = {prev}")
+                self.lines[mark:mark] = spills
+            codes.append(code)
+        return codes
+
+    def block(self, stmts):
+        value = "None"
+        for i, stmt in enumerate(stmts):
+            if i and not _TRIVIAL.fullmatch(value):
+                self.lines.append(value)
+            value = self.stmt(stmt)
+        return value
+
+    def branch(self, stmts):
+        self.scopes.append({})
+        try:
+            return self.block(stmts)
+        finally:
+            self.scopes.pop()
+
+    def emit_return(self, value):
+        return_type = self.function.return_type
+        test = self.type_test("_r", return_type) if return_type else None
+        if test:
+            self.lines.append(f"_r = {value}")
+            self.lines.append(f"if not {test}:")
+            self.lines.append(f"    return_error({self.function.name!r}, {self.const(return_type)}, _r)")
+            value = "_r"
+        self.lines.append(f"return {value}")
+
+    def stmt(self, stmt):
+        return self._stmt_table[type(stmt)](self, stmt)
+
+    def expr(self, expr):
+        return self._expr_table[type(expr)](self, expr)
+
+    # --- Statements ---
+
+    def stmt_LetStmt(self, stmt):
+        value = self.expr(stmt.value)
+        target = self.local(stmt.name)
+        self.lines.append(f"{target} = {value}")
+        test = self.type_test(target, stmt.type_annotation) if stmt.type_annotation else None
+        if test:
+            self.lines.append(f"if not {test}:")
+            self.lines.append(f"    let_error({self.const(stmt.type_annotation)}, {target})")
+        if self.scopes[-1] is None:
+            self.lines.append(f"scope.values[{self.symbol(stmt.name)}] = {target}")
+        else:
+            self.scopes[-1][stmt.name] = target
+        return target
+
+    def stmt_FnDecl(self, stmt):
+        fn = self.const(stmt)
+        if self.scopes[-1] is None:
+            self.lines.append(f"scope.values[{self.symbol(stmt.name)}] = {fn}")
+        else:
+            self.scopes[-1][stmt.name] = fn
+        return fn
+
+    def stmt_ExprStmt(self, stmt):
+        return self.expr(stmt.expr)
+
+    def stmt_Return(self, stmt):
+        value = self.expr(stmt.expr)
+        if self.function is None:
+            self.lines.append(f"raise ReturnException({value})")
+        else:
+            self.emit_return(value)
+        return "None"
+
+    def _unsupported_stmt(self, stmt):
+        self.lines.append(f"unsupported('statement', {self.const(stmt)})")
+        return "None"
+
+    # --- Expressions ---
+
+    def expr_Number(self, expr):
+        return f"({expr.value!r})" if expr.value < 0 else repr(expr.value)
+
+    def expr_String(self, expr):
+        return repr(expr.value)
+
+    expr_Boolean = expr_String
+
+    def expr_Var(self, expr):
+        return self.resolve(expr.name)
+
+    def expr_ListLiteral(self, expr):
+        return f"[{', '.join(self.operands(expr.elements))}]"
+
+    def expr_IndexExpr(self, expr):
+        target, index = self.operands([expr.target, expr.index])
+        return f"index({target}, {index})"
+
+    def expr_Binary(self, expr):
+        op = expr.op
+        if op in _ARITHMETIC or op in _COMPARISONS:
+            left, right = self.operands([expr.left, expr.right])
+            return f"({left} {op} {right})"
+        if op not in ("and", "or", "and not"):
+            return f"unsupported_op({op!r})"
+        left = self.expr(expr.left)
+        lines, right = self.capture(self.expr, expr.right)
+        if op == "and not":
+            right = f"(not {right})"
+        if not lines:
+            return f"({left} {'or' if op == 'or' else 'and'} {right})"
+        result = self.temp()
+        self.lines.append(f"{result} = {left}")
+        self.lines.append(f"if {'not ' if op == 'or' else ''}{result}:")
+        self.lines.extend(_indent(lines + [f"{result} = {right}"]))
+        return result
+
+    def expr_IfExpr(self, expr):
+        cond = self.expr(expr.condition)
+        then_lines, then_value = self.capture(self.branch, expr.then_branch)
+        else_lines, else_value = [], "None"
+        if expr.else_branch is not None:
+            else_lines, else_value = self.capture(self.branch, expr.else_branch)
+        # Comparisons of Fluent values always give a bool.
+        checked = type(expr.condition) is Boolean or \
+            (type(expr.condition) is Binary and expr.condition.op in _COMPARISONS)
+        if not then_lines and not else_lines:
+            if checked:
+                return f"({then_value} if {cond} else {else_value})"
+            test = self.temp()
+            return f"({then_value} if ({test} := {cond}) is True else {else_value} if {test} is False " \
+                   f"else bad_condition({test}))"
+        result = self.temp()
+        if checked:
+            self.lines.append(f"if {cond}:")
+        else:
+            test = self.temp()
+            self.lines.append(f"{test} = {cond}")
+            self.lines.append(f"if {test} is not True and {test} is not False:")
+            self.lines.append(f"    bad_condition({test})")
+            self.lines.append(f"if {test}:")
+        self.lines.extend(_indent(then_lines + [f"{result} = {then_value}"]))
+        self.lines.append("else:")
+        self.lines.extend(_indent(else_lines + [f"{result} = {else_value}"]))
+        return result
+
+    def expr_MatchExpr(self, expr):
+        subject = self.expr(expr.matched_expr)
+        value = self.temp()
+        arms, default = [], ([], f"no_match({value})")
+        for case in expr.cases:
+            if case.pattern == "_":
+                default = self.capture(self.expr, case.expr)
+                break
+            if isinstance(case.pattern, (int, str)):
+                arms.append((repr(case.pattern), *self.capture(self.expr, case.expr)))
+        if arms and not default[0] and not any(lines for _, lines, _ in arms):
+            code = default[1]
+            for i, (pattern, _, arm) in reversed(list(enumerate(arms))):
+                test = f"({value} := {subject})" if i == 0 else value
+                code = f"{arm} if {test} == {pattern} else {code}"
+            return f"({code})"
+        self.lines.append(f"{value} = {subject}")
+        if not arms:
+            self.lines.extend(default[0])
+            return default[1]
+        result = self.temp()
+        for i, (pattern, lines, arm) in enumerate(arms):
+            self.lines.append(f"{'if' if i == 0 else 'elif'} {value} == {pattern}:")
+            self.lines.extend(_indent(lines + [f"{result} = {arm}"]))
+        self.lines.append("else:")
+        self.lines.extend(_indent(default[0] + [f"{result} = {default[1]}"]))
+        return result
+
+    def expr_Call(self, expr):
+        site, fn = f"c{len(self.sites)}", self.temp()
+        self.sites.append(site)
+        # Inline cache: reuse the code of the function last called from here.
+        target = f"({site}[1] if ({fn} := {self.resolve(expr.func)}) is {site}[0] " \
+                 f"else refill({site}, {fn}, {expr.func!r}, {len(expr.args)}))"
+        target, *args = self.operands([target, *expr.args])
+        return f"{target}({', '.join([self.call_scope(), *args])})"
+
+    def _unsupported_expr(self, expr):
+        return f"unsupported('expression', {self.const(expr)})"
+
+
+# --- Runtime support for generated modules ---
+
+_UNSET = object()
+
+
+def _extend(parent, values):
+    env = Environment(parent)
+    env.values = values
+    return env
+
+
+def _index(target, index):
+    if not isinstance(index, int):
+        raise TypeError(f"List index must be an integer, got {type(index).__name__}")
+    try:
+        return target[index]
+    except (TypeError, IndexError) as e:
+        raise RuntimeError(f"Indexing failed: {e}")
+
+
+def _bad_condition(value):
+    raise TypeError(f"If condition must be a boolean, got: {type(value).__name__}")
+
+
+def _no_match(value):
+    raise ValueError(f"No match found for value: {value}")
+
+
+def _let_error(annotation, value):
+    raise TypeError(f"Type mismatch: expected {annotation}, got {type(value).__name__}")
+
+
+def _param_error(name, annotation, value):
+    raise TypeError(
+        f"Type mismatch in parameter '{name}': expected {format_type(annotation)}, got {type(value).__name__}")
+
+
+def _return_error(name, annotation, value):
+    raise TypeError(
+        f"Return type mismatch in function '{name}': expected {format_type(annotation)}, got {type(value).__name__}")
+
+
+def _unsupported(kind, node):
+    raise NotImplementedError(f"Unsupported {kind}: {type(node)}")
+
+
+def _unsupported_op(op):
+    raise NotImplementedError(f"Unsupported operator: {op}")
+
+
+def _failing(error):
+    def fail(scope, *args):
+        raise error
+    return fail
+
+
+_RUNTIME = {
+    "symbol": symbol, "check_type": check_type, "ReturnException": ReturnException, "UNSET": _UNSET,
+    "extend": _extend, "index": _index, "bad_condition": _bad_condition, "no_match": _no_match,
+    "let_error": _let_error, "param_error": _param_error, "return_error": _return_error,
+    "unsupported": _unsupported, "unsupported_op": _unsupported_op,
+}
+
+
+class CodeCache(ContentCache):
+    """Compiled generated modules keyed by a hash of their Python source.
+
+    Entries are marshalled code objects. The key includes the bytecode
+    magic number, since marshal data only loads on the Python that wrote it.
+    """
+    SUFFIX = ".code"
+
+    def key(self, source: str):
+        digest = hashlib.sha256(importlib.util.MAGIC_NUMBER)
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, source: str):
+        key = self.key(source)
+        payload = self.get_bytes(key)
+        if payload is None:
+            return None
+        try:
+            return marshal.loads(payload)
+        except Exception:
+            self.discard(key)
+            return None
+
+    def put(self, source: str, code):
+        self.put_bytes(self.key(source), marshal.dumps(code))
+
+    def compile(self, source: str):
+        code = self.get(source)
+        if code is None:
+            code = compile(source, "<fluent>", "exec")
+            try:
+                self.put(source, code)
+            except OSError:
+                pass  # an unwritable cache must never break a run
+        return code
+
+
+class PythonInterpreter(Interpreter):
+    """Translates Fluent to Python source and runs it as CPython bytecode.
+
+    Every unit handed to run_program/eval_stmt/eval_expr is generated by
+    `PythonGenerator` with all the functions declared in it, compiled once
+    and executed. Set `code_cache` to a CodeCache to keep compiled modules
+    on disk. Scoping, type checks and error messages match the tree walker.
+    """
+    backend = "python"
+    supports_tail_calls = False
+    supports_memoize = False
+    code_cache = None
+
+    def __init__(self, backend=None, **options):
+        super().__init__(**options)
+        self._functions = {}  # id(FnDecl) -> (FnDecl, Python function, arity)
+        self._dynamic = set()
+        # main() of each live module -> names of its call-site globals. Weak,
+        # so that a module no longer used can go, along with the functions
+        # its sites cache.
+        self._sites = weakref.WeakKeyDictionary()
+
+    def run_program(self, stmts):
+        return self.load(stmts)(self.global_env)
+
+    def eval_stmt(self, stmt, env):
+        return self.load([stmt])(env)
+
+    def eval_expr(self, expr, env):
+        return self.load([ExprStmt(expr)])(env)
+
+    def load(self, stmts):
+        """Compile `stmts` and the functions they declare; returns `main(scope)`."""
+        scan = _Scan()
+        scan.visit_list(stmts)
+        return self._build(stmts, scan)["main"]
+
+    def compiled_function(self, fn):
+        entry = self._functions.get(id(fn))
+        if entry is None or entry[0] is not fn:
+            scan = _Scan()
+            scan.visit(fn)
+            self._build([], scan)
+            entry = self._functions[id(fn)]
+        return entry
+
+    def generate(self, stmts):
+        """The Python source this backend runs for `stmts`."""
+        scan = _Scan()
+        scan.visit_list(stmts)
+        return PythonGenerator(self._dynamic | scan.free).module(stmts, scan.functions)
+
+    def _build(self, stmts, scan):
+        if not scan.free <= self._dynamic:
+            self._dynamic |= scan.free
+            # Code generated before does not pass these names on to callees.
+            self._functions.clear()
+            for main, sites in list(self._sites.items()):
+                for site in sites:
+                    main.__globals__[site][0] = _UNSET
+            self._sites.clear()
+        generator = PythonGenerator(self._dynamic)
+        source = generator.module(stmts, scan.functions)
+        if self.code_cache is not None:
+            code = self.code_cache.compile(source)
+        else:
+            code = compile(source, "<fluent>", "exec")
+        namespace = dict(_RUNTIME, K=generator.consts, refill=self._refill)
+        exec(code, namespace)
+        for fn, name in generator.functions:
+            self._functions[id(fn)] = (fn, namespace[name], len(fn.params))
+        if generator.sites:
+            self._sites[namespace["main"]] = generator.sites
+        return namespace
+
+    def _forget_function(self, fn):
+        super()._forget_function(fn)
+        drop_cached(self._functions, fn)
+
+    def _refill(self, site, fn, name, nargs):
+        """Code for a call to `fn` whose inline cache missed."""
+        if isinstance(fn, FnDecl):
+            _, run, arity = self.compiled_function(fn)
+            if arity != nargs:
+                return _failing(ValueError(f"Function '{fn.name}' expects {arity} arguments, got {nargs}"))
+            site[0], site[1] = fn, run
+            return run
+        if isinstance(fn, BuiltInFunction):
+            run = lambda scope, *args: fn.call(list(args))
+            site[0], site[1] = fn, run
+            return run
+        return _failing(TypeError(f"'{name}' is not a function"))
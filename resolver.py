@@ -0,0 +1,255 @@
+from dataclasses import dataclass
+
+from fluent_ast import Binary, Call, Expr, ExprStmt, FnDecl, IfExpr, IndexExpr, LetStmt, ListLiteral, MatchCase, \
+    MatchExpr, Return
+from symbols import symbol
+from visitor import MethodTable, NodeVisitor, Visitor
+
+UNBOUND = object()  # a slot whose let has not run yet
+
+
+class Scope:
+    """Slot layout of a frame: one slot per name bound in a function body or an if branch."""
+    __slots__ = ("syms", "index", "free")
+
+    def __init__(self):
+        self.syms = []
+        self.index = {}  # symbol ID -> slot
+        self.free = []  # released Frames of this layout, for an interpreter to reuse
+
+    def __len__(self):
+        return len(self.syms)
+
+    def bind(self, sym):
+        slot = self.index.get(sym)
+        if slot is None:
+            slot = self.index[sym] = len(self.syms)
+            self.syms.append(sym)
+        return slot
+
+
+class Frame:
+    """Fixed-size activation record for a Scope.
+
+    `parent` is the enclosing frame, or the caller's for a function body;
+    the first frame above top-level code has None, and every frame keeps
+    that Environment in `env`.
+    """
+    __slots__ = ("index", "slots", "parent", "env")
+
+    def __init__(self, scope, parent):
+        self.index = scope.index
+        self.slots = [UNBOUND] * len(scope.syms)
+        if type(parent) is Frame:
+            self.parent, self.env = parent, parent.env
+        else:
+            self.parent, self.env = None, parent
+
+    # The Environment methods the tree walker uses.
+
+    def lookup(self, sym):
+        return lookup(self, sym)
+
+    def define(self, sym, value):
+        self.slots[self.index[sym]] = value
+
+
+def lookup(frame, sym):
+    """Find `sym` by name from `frame`: through enclosing and calling
+    frames, then their Environment."""
+    env = frame.env
+    while frame is not None:
+        index = frame.index
+        if sym in index:
+            value = frame.slots[index[sym]]
+            if value is not UNBOUND:
+                return value
+        frame = frame.parent
+    return env.lookup(sym)
+
+
+class Resolver:
+    """Lexical addresses for a compiler walking one function body, or top-level code.
+
+    The compiler opens a Scope per function body and if branch and binds
+    names in the order their lets run; `address` then gives a use the
+    (depth, slot) of the binding it sees, depth counting frames outwards
+    from the use. Only bindings that precede the use get an address, so
+    the slot is always set when it is read. Fluent scoping is dynamic, so
+    names a function does not bind itself (and everything at top level)
+    get None and are looked up by name at run time. AST nodes are shared
+    (parsed Vars are interned), so addresses are handed out during the walk rather
+    than stored per node.
+    """
+
+    def __init__(self, fn=None):
+        self.chain = []  # enclosing scopes, innermost last; empty at top level
+        if fn is not None:
+            self.push(Scope())
+            for param in fn.params:
+                self.chain[0].bind(param.sym)
+
+    def push(self, scope):
+        self.chain.append(scope)
+        return scope
+
+    def pop(self):
+        self.chain.pop()
+
+    def bind(self, sym):
+        """Slot for a new binding of `sym`, or None at top level (the Environment)."""
+        return self.chain[-1].bind(sym) if self.chain else None
+
+    def address(self, sym):
+        for depth, scope in enumerate(reversed(self.chain)):
+            slot = scope.index.get(sym)
+            if slot is not None:
+                return depth, slot
+        return None
+
+
+class _Names(NodeVisitor):
+    """Every name bound anywhere under the visited nodes, and every use in source order."""
+
+    def __init__(self):
+        self.bound = set()
+        self.used = []
+
+    def visit_FnDecl(self, node):
+        self.bound.add(node.name)
+        self.bound.update(param.name for param in node.params)
+        self.visit_list(node.body)
+
+    def visit_LetStmt(self, node):
+        self.bound.add(node.name)
+        self.visit(node.value)
+
+    def visit_Var(self, node):
+        self.used.append(node.name)
+
+    def visit_Call(self, node):
+        self.used.append(node.func)
+        self.visit_list(node.args)
+
+
+class _Declarations(NodeVisitor):
+    def __init__(self):
+        self.functions = []
+
+    def visit_FnDecl(self, node):
+        self.functions.append(node)
+        self.visit_list(node.body)
+
+
+def declared_functions(fn):
+    """`fn` and every function declared anywhere in its body."""
+    declarations = _Declarations()
+    declarations.visit(fn)
+    return declarations.functions
+
+
+def check_names(stmts, env):
+    """Raise NameError for the first name used in `stmts` that nothing in
+    them binds and `env` does not define: whatever the calling context,
+    no lookup of it can succeed."""
+    names = _Names()
+    names.visit_list(stmts)
+    for name in names.used:
+        if name in names.bound:
+            continue
+        sym, scope = symbol(name), env
+        while scope is not None and sym not in scope.values:
+            scope = scope.parent
+        if scope is None:
+            raise NameError(f"Undefined variable '{name}'")
+
+
+# --- Resolved bodies for the tree walker ---
+
+_BINDING_STMTS = (LetStmt, FnDecl)
+
+
+@dataclass(frozen=True, slots=True)
+class Local(Expr):
+    """A read of a name bound in the same function, at its (depth, slot) address."""
+    name: str
+    depth: int
+    slot: int
+
+
+class Block(list):
+    """The statements of an if branch in a resolved body, with the Scope of
+    the Frame they run in; None if they bind nothing and need no Frame."""
+    __slots__ = ("scope",)
+
+    def __init__(self, stmts, scope):
+        super().__init__(stmts)
+        self.scope = scope
+
+
+def resolve_function(fn):
+    """The Scope of a call's Frame and a copy of the body of `fn` for the
+    tree walker: reads with an address become Local nodes and if branches
+    Blocks. Nested function declarations are kept as they are."""
+    resolver = BodyResolver(fn)
+    body = [resolver.resolve(stmt) for stmt in fn.body]
+    return resolver.chain[0], body
+
+
+class BodyResolver(Resolver, Visitor):
+    _resolve_table = MethodTable("resolve_", "_unchanged")
+
+    def resolve(self, node):
+        return self._resolve_table[type(node)](self, node)
+
+    def resolve_block(self, stmts):
+        if not any(type(stmt) in _BINDING_STMTS for stmt in stmts):
+            return Block([self.resolve(stmt) for stmt in stmts], None)
+        scope = self.push(Scope())
+        try:
+            return Block([self.resolve(stmt) for stmt in stmts], scope)
+        finally:
+            self.pop()
+
+    def _unchanged(self, node):
+        return node
+
+    def resolve_LetStmt(self, stmt):
+        value = self.resolve(stmt.value)  # before the bind: `let x = x + 1` reads the outer x
+        self.bind(stmt.sym)
+        return LetStmt(stmt.name, stmt.type_annotation, value)
+
+    def resolve_FnDecl(self, stmt):
+        self.bind(stmt.sym)
+        return stmt
+
+    def resolve_ExprStmt(self, stmt):
+        return ExprStmt(self.resolve(stmt.expr))
+
+    def resolve_Return(self, stmt):
+        return Return(self.resolve(stmt.expr))
+
+    def resolve_Var(self, expr):
+        address = self.address(expr.sym)
+        return expr if address is None else Local(expr.name, *address)
+
+    def resolve_ListLiteral(self, expr):
+        return ListLiteral([self.resolve(elem) for elem in expr.elements])
+
+    def resolve_IndexExpr(self, expr):
+        return IndexExpr(self.resolve(expr.target), self.resolve(expr.index))
+
+    def resolve_Call(self, expr):
+        return Call(expr.func, [self.resolve(arg) for arg in expr.args])
+
+    def resolve_Binary(self, expr):
+        return Binary(self.resolve(expr.left), expr.op, self.resolve(expr.right))
+
+    def resolve_IfExpr(self, expr):
+        else_branch = expr.else_branch
+        return IfExpr(self.resolve(expr.condition), self.resolve_block(expr.then_branch),
+                      self.resolve_block(else_branch) if else_branch is not None else None)
+
+    def resolve_MatchExpr(self, expr):
+        return MatchExpr(self.resolve(expr.matched_expr),
+                         [MatchCase(case.pattern, self.resolve(case.expr)) for case in expr.cases])
@@ -0,0 +1,274 @@
+import operator
+
+from fluent_ast import Boolean, FnDecl, Number, Stmt, String, Var
+from interpreter import BINDING_STMTS, BuiltInFunction, Interpreter, ReturnException, check_type
+from visitor import MethodTable
+
+_OPERATORS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+    ">": operator.gt, "<": operator.lt, ">=": operator.ge, "<=": operator.le,
+    "==": operator.eq, "!=": operator.ne,
+}
+_CONSTANTS = (Number, String, Boolean)
+
+
+# --- Continuations ---
+#
+# A task on the explicit stack is `(continuation, data, env)`, or
+# `(None, node, env)` to evaluate `node`. A continuation is called as
+# `continuation(interpreter, data, env, todo, values)` once everything
+# pushed after it has run, with their results on top of `values`.
+
+def _discard(interp, data, env, todo, values):
+    values.pop()
+
+
+def _release(interp, data, env, todo, values):
+    interp._release_env(env)
+
+
+def _binary(interp, apply, env, todo, values):
+    right = values.pop()
+    values[-1] = apply(values[-1], right)
+
+
+def _binary_var(interp, expr, env, todo, values):
+    # Right operand is a name, read once the left one is done.
+    values[-1] = _OPERATORS[expr.op](values[-1], env.lookup(expr.right.sym))
+
+
+def _binary_const(interp, expr, env, todo, values):
+    values[-1] = _OPERATORS[expr.op](values[-1], expr.right.value)
+
+
+def _short_circuit(interp, expr, env, todo, values):
+    # `and`, `or` and `and not`, with the left operand on top.
+    if (expr.op == "or") == bool(values[-1]):
+        return
+    values.pop()
+    if expr.op == "and not":
+        todo.append((_negate, None, env))
+    todo.append((None, expr.right, env))
+
+
+def _negate(interp, data, env, todo, values):
+    values[-1] = not values[-1]
+
+
+def _build_list(interp, count, env, todo, values):
+    elements = values[-count:]
+    del values[-count:]
+    values.append(elements)
+
+
+def _index(interp, data, env, todo, values):
+    index = values.pop()
+    target = values[-1]
+    if not isinstance(index, int):
+        raise TypeError(f"List index must be an integer, got {type(index).__name__}")
+    try:
+        values[-1] = target[index]
+    except (TypeError, IndexError) as e:
+        raise RuntimeError(f"Indexing failed: {e}")
+
+
+def _branch(interp, expr, env, todo, values):
+    cond = values.pop()
+    if not isinstance(cond, bool):
+        raise TypeError(f"If condition must be a boolean, got: {type(cond).__name__}")
+    branch = expr.then_branch if cond else expr.else_branch
+    if branch is None:
+        values.append(None)
+    else:
+        interp.push_block(branch, env, todo, values)
+
+
+def _match(interp, expr, env, todo, values):
+    todo.append((None, interp._select_arm(expr, values.pop(), env), env))
+
+
+def _call(interp, expr, env, todo, values):
+    # The callee is on `values` under its arguments.
+    count = len(expr.args)
+    if count:
+        args = values[-count:]
+        del values[-count:]
+    else:
+        args = []
+    fn = values.pop()
+    if isinstance(fn, FnDecl):
+        interp._check_args(fn, args)
+        interp.push_call(fn, args, env, todo, values)
+    elif isinstance(fn, BuiltInFunction):
+        values.append(fn.call(args))
+    else:
+        raise TypeError(f"'{expr.func}' is not a function")
+
+
+def _returned(interp, data, env, todo, values):
+    # Marks the bottom of a call: `data` is (FnDecl, height of `values`
+    # below the call) and `env` the call's own scope, if it opened one.
+    interp._check_return(data[0], values[-1])
+    if env is not None:
+        interp._release_env(env)
+
+
+def _let(interp, stmt, env, todo, values):
+    value = values[-1]
+    if stmt.type_annotation and not check_type(value, stmt.type_annotation):
+        raise TypeError(f"Type mismatch: expected {stmt.type_annotation}, got {type(value).__name__}")
+    env.define(stmt.sym, value)
+
+
+def _return(interp, data, env, todo, values):
+    value = values.pop()
+    while todo:
+        task = todo[-1]
+        if task[0] is _returned:
+            del values[task[1][1]:]
+            values.append(value)
+            return
+        todo.pop()
+    raise ReturnException(value)
+
+
+class StackInterpreter(Interpreter):
+    """Evaluates the AST like the tree walker, but on an explicit stack.
+
+    Instead of recursing in Python for every nested expression, block and
+    call, evaluation pushes tasks: nodes still to evaluate and the
+    continuations that consume their values. Fluent recursion of any
+    shape, not only tail calls, is then bounded by memory rather than by
+    the Python recursion limit. Scoping, type checks and error messages
+    are those of the tree walker.
+    """
+    backend = "stack"
+    supports_tail_calls = False
+    supports_memoize = False
+    _push_table = MethodTable("push_", "_unsupported_node")
+
+    def __init__(self, backend=None, **options):
+        super().__init__(**options)
+
+    def eval_stmt(self, stmt, env):
+        if not isinstance(stmt, Stmt):
+            self._unsupported_node(stmt, env, None, None, "statement")
+        return self.run(stmt, env)
+
+    def eval_expr(self, expr, env):
+        if isinstance(expr, Stmt):
+            self._unsupported_node(expr, env, None, None, "expression")
+        return self.run(expr, env)
+
+    def run(self, node, env):
+        """Evaluate the statement or expression `node` in `env`."""
+        todo = [(None, node, env)]
+        values = []
+        pop = todo.pop
+        table = self._push_table
+        while todo:
+            task, node, env = pop()
+            if task is not None:
+                task(self, node, env, todo, values)
+            elif type(node) is Var:
+                values.append(env.lookup(node.sym))
+            elif type(node) in _CONSTANTS:
+                values.append(node.value)
+            else:
+                table[type(node)](self, node, env, todo, values)
+        return values[-1]
+
+    def push_block(self, stmts, env, todo, values):
+        """Schedule `stmts` as a block run from `env`; it leaves its last value."""
+        if any(type(stmt) in BINDING_STMTS for stmt in stmts):
+            env = self._new_env(env)
+            todo.append((_release, None, env))
+        self.push_sequence(stmts, env, todo, values)
+
+    def push_sequence(self, stmts, env, todo, values):
+        """Schedule `stmts` to run in `env`; the last one's value is left on `values`."""
+        if not stmts:
+            values.append(None)
+            return
+        last = len(stmts) - 1
+        for i in range(last, -1, -1):
+            todo.append((None, stmts[i], env))
+            if i:
+                todo.append((_discard, None, None))
+
+    def push_call(self, fn, args, env, todo, values):
+        """Schedule the body of `fn` called from `env` with checked `args`."""
+        if not fn.params:
+            todo.append((_returned, (fn, len(values)), None))
+            self.push_block(fn.body, env, todo, values)
+            return
+        local_env = self._new_env(env)
+        for param, arg in zip(fn.params, args):
+            local_env.define(param.sym, arg)
+        todo.append((_returned, (fn, len(values)), local_env))
+        self.push_sequence(fn.body, local_env, todo, values)
+
+    # --- Statements ---
+
+    def push_LetStmt(self, stmt, env, todo, values):
+        todo.append((_let, stmt, env))
+        todo.append((None, stmt.value, env))
+
+    def push_FnDecl(self, stmt, env, todo, values):
+        env.define(stmt.sym, stmt)
+        values.append(stmt)
+
+    def push_ExprStmt(self, stmt, env, todo, values):
+        todo.append((None, stmt.expr, env))
+
+    def push_Return(self, stmt, env, todo, values):
+        todo.append((_return, None, env))
+        todo.append((None, stmt.expr, env))
+
+    # --- Expressions ---
+
+    def push_ListLiteral(self, expr, env, todo, values):
+        if not expr.elements:
+            values.append([])
+            return
+        todo.append((_build_list, len(expr.elements), env))
+        for elem in reversed(expr.elements):
+            todo.append((None, elem, env))
+
+    def push_IndexExpr(self, expr, env, todo, values):
+        todo.append((_index, None, env))
+        todo.append((None, expr.index, env))
+        todo.append((None, expr.target, env))
+
+    def push_Binary(self, expr, env, todo, values):
+        op = expr.op
+        if op in ("and", "or", "and not"):
+            todo.append((_short_circuit, expr, env))
+        elif op not in _OPERATORS:
+            raise NotImplementedError(f"Unsupported operator: {op}")
+        elif type(expr.right) is Var:
+            todo.append((_binary_var, expr, env))
+        elif type(expr.right) in _CONSTANTS:
+            todo.append((_binary_const, expr, env))
+        else:
+            todo.append((_binary, _OPERATORS[op], env))
+            todo.append((None, expr.right, env))
+        todo.append((None, expr.left, env))
+
+    def push_IfExpr(self, expr, env, todo, values):
+        todo.append((_branch, expr, env))
+        todo.append((None, expr.condition, env))
+
+    def push_MatchExpr(self, expr, env, todo, values):
+        todo.append((_match, expr, env))
+        todo.append((None, expr.matched_expr, env))
+
+    def push_Call(self, expr, env, todo, values):
+        values.append(env.lookup(expr.sym))
+        todo.append((_call, expr, env))
+        for arg in reversed(expr.args):
+            todo.append((None, arg, env))
+
+    def _unsupported_node(self, node, env, todo, values, kind=None):
+        kind = kind or ("statement" if isinstance(node, Stmt) else "expression")
+        raise NotImplementedError(f"Unsupported {kind}: {type(node)}")
@@ -0,0 +1,42 @@
+# Process-wide identifier table. Every name the parser sees, and every name
+# a node is built with, maps to a dense integer ID; environments and later
+# passes key on the ID and only turn it back into a name for messages.
+#
+# The table holds one entry per distinct name, never dropped: it grows with
+# the vocabulary of everything parsed in the process, not with program size.
+# A long-lived process that keeps loading unrelated programs can call
+# reset() between them to start over.
+_ids = {}
+_names = []
+_reset_hooks = []
+
+
+def symbol(name: str) -> int:
+    sym = _ids.get(name)
+    if sym is None:
+        sym = _ids[name] = len(_names)
+        _names.append(name)
+    return sym
+
+
+def symbol_name(sym: int) -> str:
+    return _names[sym]
+
+
+def symbol_count() -> int:
+    return len(_names)
+
+
+def on_reset(hook):
+    """Call `hook()` on every reset(); for caches of anything carrying IDs."""
+    _reset_hooks.append(hook)
+    return hook
+
+
+def reset():
+    """Forget every name. IDs are reused afterwards, so nodes, environments
+    and compiled code from before the reset must not be used after it."""
+    _ids.clear()
+    _names.clear()
+    for hook in _reset_hooks:
+        hook()
@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from ast_cache import ASTCache, load_program
+from parser import Parser
+
+SOURCE = '''fn fib(n: Int) -> Int
+  match n
+    0 => 0
+    _ => fib(n - 1) + fib(n - 2)
+let x = fib(10)
+'''
+
+
+class TestASTCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = tmp.name
+        self.cache = ASTCache(self.directory)
+
+    def test_hit_skips_parsing(self):
+        expected = self.cache.parse(SOURCE)
+        with mock.patch.object(Parser, "parse", side_effect=AssertionError("parsed again")):
+            self.assertEqual(self.cache.parse(SOURCE), expected)
+
+    def test_key_includes_parser_version(self):
+        key = self.cache.key(SOURCE)
+        with mock.patch("ast_cache.PARSER_VERSION", "other"):
+            self.assertNotEqual(self.cache.key(SOURCE), key)
+        self.assertNotEqual(self.cache.key(SOURCE + " "), key)
+
+    def test_corrupt_entry_falls_back_to_parsing(self):
+        expected = self.cache.parse(SOURCE)
+        path = self.cache.path_for(self.cache.key(SOURCE))
+        for damage in (lambda d: d[:len(d) // 2], lambda d: d[:-1] + bytes([d[-1] ^ 1]), lambda d: b"junk"):
+            with open(path, "rb") as f:
+                data = f.read()
+            with open(path, "wb") as f:
+                f.write(damage(data))
+            self.assertIsNone(self.cache.get(SOURCE))
+            self.assertEqual(self.cache.parse(SOURCE), expected)
+
+    def test_evicts_least_recently_used(self):
+        sources = [f"let v = {i}" for i in range(4)]
+        for i, source in enumerate(sources):
+            self.cache.parse(source)
+            os.utime(self.cache.path_for(self.cache.key(source)), (i, i))
+        entry_size = os.path.getsize(self.cache.path_for(self.cache.key(sources[0])))
+        self.cache.get(sources[0])  # touch: now the most recently used
+        self.cache.max_bytes = entry_size * 2
+        self.cache.evict()
+        cached = [s for s in sources if self.cache.get(s) is not None]
+        self.assertEqual(cached, [sources[0], sources[3]])
+
+    def test_syntax_errors_are_not_cached(self):
+        with self.assertRaises(SyntaxError):
+            self.cache.parse("let = 1")
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_load_program(self):
+        path = os.path.join(self.directory, "prog.fl")
+        with open(path, "w") as f:
+            f.write(SOURCE)
+        self.assertEqual(load_program(path, self.cache), Parser(SOURCE).parse())
+        self.assertEqual(len(self.cache.entries()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
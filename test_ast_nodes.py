@@ -0,0 +1,55 @@
+import copy
+import pickle
+import unittest
+from unittest import mock
+from dataclasses import FrozenInstanceError
+import fluent_ast
+from fluent_ast import Number, Var, Boolean, Binary, String
+from parser import Parser
+
+
+class TestAstNodes(unittest.TestCase):
+
+    def test_leaves_are_shared(self):
+        self.assertIs(Var.interned("x"), Var.interned("x"))
+        self.assertIs(Number.interned(7), Number.interned(7))
+        self.assertIs(Boolean.interned(True), Boolean.interned(True))
+        self.assertIsNot(Number.interned(1), Number.interned(True))
+        self.assertIsNot(Var("x"), Var.interned("x"))
+
+    def test_large_numbers_are_equal_but_not_shared(self):
+        self.assertEqual(Number.interned(10 ** 6), Number.interned(10 ** 6))
+        self.assertIsNot(Number.interned(10 ** 6), Number.interned(10 ** 6))
+
+    def test_shared_leaves_are_not_reinitialized(self):
+        node = Var.interned("reinit")
+        with mock.patch.object(Var, "__post_init__") as post_init:
+            self.assertIs(Var.interned("reinit"), node)
+        post_init.assert_not_called()
+
+    def test_table_is_bounded(self):
+        with mock.patch.object(fluent_ast, "_MAX_INTERNED", len(fluent_ast._interned)):
+            self.assertIsNot(Var.interned("past_the_limit"), Var.interned("past_the_limit"))
+            self.assertIs(Boolean.interned(True), Boolean.interned(True))
+
+    def test_parsed_leaves_are_shared(self):
+        stmts = Parser("let a = x + 1\nlet b = x + 1\n").parse()
+        self.assertIs(stmts[0].value.left, stmts[1].value.left)
+        self.assertIs(stmts[0].value.right, stmts[1].value.right)
+
+    def test_nodes_are_frozen_and_slotted(self):
+        node = Binary(Number(1), "+", String("a"))
+        with self.assertRaises(FrozenInstanceError):
+            node.op = "-"
+        self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_copy_and_pickle_keep_interning(self):
+        tree = Binary(Var("x"), "*", Number(2))
+        restored = pickle.loads(pickle.dumps(tree))
+        self.assertEqual(restored, tree)
+        self.assertIs(restored.left, Var.interned("x"))
+        self.assertIs(copy.deepcopy(tree).right, Number.interned(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
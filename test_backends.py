@@ -0,0 +1,102 @@
+import os
+import unittest
+from unittest import mock
+from fluent_ast import Binary, Call, ExprStmt, FnDecl, FnParam, Number, Return, SimpleType, Var
+from interpreter import BACKENDS, Interpreter
+from parser import Parser
+
+PROGRAMS = {
+    "fib": '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+fib(15)
+''',
+    "lists": '''let xs: List[Int] = [1, 2, 3]
+fn second(ys: List[Int])
+  ys[1]
+second(xs) * len(xs) + len("four")
+''',
+    "branches": '''fn classify(x: Int)
+  if x > 2
+    let big = "many"
+    big
+  else
+    match x
+      1 => "one"
+      _ => "other"
+[classify(5), classify(1), classify(0)]
+''',
+    "dynamic_scope": '''fn inner()
+  depth
+fn outer(depth: Int)
+  inner()
+outer(7)
+''',
+    "shadowing": '''fn show()
+  x
+fn outer(x: Int)
+  if x > 0
+    let x = 100
+    show()
+  else
+    show()
+[outer(1), outer(0)]
+''',
+    "booleans": '''let t = 1 < 2
+let f = 2 <= 1
+if t
+  [t, f, 3 != 4, 10 / 4, 7 - 9]
+''',
+}
+
+ERRORS = {
+    "undefined": ("missing + 1\n", NameError, "Undefined variable 'missing'"),
+    "arity": ("fn f(a: Int)\n  a\nf(1, 2)\n", ValueError, "expects 1 arguments, got 2"),
+    "param_type": ('fn f(a: Int)\n  a\nf("x")\n', TypeError, "parameter 'a'"),
+    "return_type": ('fn f(a: Int) -> Int\n  "a"\nf(1)\n', TypeError, "Return type mismatch"),
+    "if_condition": ("if 1\n  2\n", TypeError, "If condition must be a boolean"),
+    "no_match": ("match 3\n  1 => 1\n", ValueError, "No match found for value: 3"),
+    "not_function": ("let x = 1\nx()\n", TypeError, "'x' is not a function"),
+    "index": ("[1][5]\n", RuntimeError, "Indexing failed"),
+    "let_type": ('let x: Int = "s"\n', TypeError, "Type mismatch"),
+}
+
+
+class TestBackends(unittest.TestCase):
+
+    def test_programs_agree(self):
+        for name, source in PROGRAMS.items():
+            expected = Interpreter("tree").eval_program(Parser(source).parse())
+            for backend in BACKENDS:
+                with self.subTest(program=name, backend=backend):
+                    self.assertEqual(Interpreter(backend).eval_program(Parser(source).parse()), expected)
+
+    def test_errors_agree(self):
+        for name, (source, error, message) in ERRORS.items():
+            for backend in BACKENDS:
+                with self.subTest(program=name, backend=backend):
+                    with self.assertRaisesRegex(error, message):
+                        Interpreter(backend).eval_program(Parser(source).parse())
+
+    def test_return_from_hand_built_function(self):
+        fn = FnDecl("g", [FnParam("x", SimpleType("Int"))], SimpleType("Int"),
+                    [Return(Binary(Var("x"), "*", Number(3))), ExprStmt(Number(0))])
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                interpreter = Interpreter(backend)
+                interpreter.eval_stmt(fn, interpreter.global_env)
+                self.assertEqual(interpreter.eval_expr(Call("g", [Number(2)]), interpreter.global_env), 6)
+
+    def test_backend_selection(self):
+        self.assertEqual(Interpreter("closure").backend, "closure")
+        with mock.patch.dict(os.environ, {"FLUENT_BACKEND": "closure"}):
+            self.assertEqual(Interpreter().backend, "closure")
+            self.assertEqual(Interpreter("tree").backend, "tree")
+        with self.assertRaisesRegex(ValueError, "Unknown backend 'nope'"):
+            Interpreter("nope")
+
+
+if __name__ == '__main__':
+    unittest.main()
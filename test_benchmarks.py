@@ -0,0 +1,41 @@
+import unittest
+from benchmarks.corpus import SHAPES, generate
+from benchmarks.frontend import check, count_nodes, fit_exponent
+from parser import Parser
+
+
+class TestCorpus(unittest.TestCase):
+
+    def test_every_shape_parses_and_grows(self):
+        for shape in SHAPES:
+            with self.subTest(shape=shape):
+                small = count_nodes(Parser(generate(shape, 5)).parse())
+                large = count_nodes(Parser(generate(shape, 10)).parse())
+                self.assertGreater(large, small)
+
+
+class TestScalingChecks(unittest.TestCase):
+
+    def result(self, exponent, scale=1.0):
+        sizes = [100, 200, 400, 800]
+        rows = [{"size": n, "tokens_per_sec": 1000 * scale, "nodes_per_sec": 500 * scale} for n in sizes]
+        return {"rows": rows, "lex_exponent": exponent, "parse_exponent": 1.0}
+
+    def test_fit_exponent(self):
+        sizes = [10, 20, 40, 80]
+        self.assertAlmostEqual(fit_exponent(sizes, [n * 1e-6 for n in sizes]), 1.0)
+        self.assertAlmostEqual(fit_exponent(sizes, [n * n * 1e-6 for n in sizes]), 2.0)
+
+    def test_quadratic_growth_fails(self):
+        self.assertEqual(check({"s": self.result(1.0)}, max_exponent=1.3), [])
+        self.assertEqual(len(check({"s": self.result(2.0)}, max_exponent=1.3)), 1)
+
+    def test_baseline_regressions(self):
+        baseline = {"s": self.result(1.0)}
+        self.assertEqual(check({"s": self.result(1.05)}, 1.3, baseline), [])
+        self.assertEqual(len(check({"s": self.result(1.0, scale=0.5)}, 1.3, baseline)), 2)
+        self.assertEqual(len(check({"s": self.result(1.25)}, 1.3, baseline)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
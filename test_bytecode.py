@@ -0,0 +1,49 @@
+import sys
+import unittest
+from bytecode import Compiler, disassemble
+from interpreter import Interpreter
+from parser import Parser
+
+FIB = '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+'''
+
+
+class TestCompiler(unittest.TestCase):
+
+    def test_function_locals_use_slots(self):
+        fn = Parser(FIB).parse()[0]
+        code = Compiler.compile_function(fn)
+        self.assertEqual(code.slot_names, ["n"])
+        listing = disassemble(code)
+        self.assertIn("LOAD_FAST            0      n", listing)
+        self.assertIn("LOAD_NAME", listing)  # fib itself resolves dynamically
+        self.assertIn("MATCH", listing)
+        self.assertIn("BINARY_CONST", listing)
+
+    def test_top_level_lets_bind_in_environment(self):
+        code = Compiler.compile_program(Parser("let x = 1\nif x > 0\n  let y = x\n  y\n").parse())
+        self.assertEqual(code.slot_names, ["y"])
+        listing = disassemble(code)
+        self.assertIn("STORE_ENV            ", listing)
+        self.assertIn("STORE_FAST           0      y", listing)
+
+
+class TestVM(unittest.TestCase):
+
+    def test_recursion_deeper_than_python_stack(self):
+        depth = sys.getrecursionlimit() + 500
+        source = f"fn down(n: Int)\n  match n\n    0 => 0\n    _ => down(n - 1)\ndown({depth})\n"
+        self.assertEqual(Interpreter("vm").eval_program(Parser(source).parse()), 0)
+
+    def test_global_env_updated(self):
+        interpreter = Interpreter("vm")
+        interpreter.eval_program(Parser(FIB + "let r = fib(10)\n").parse())
+        self.assertEqual(interpreter.global_env.get("r"), 55)
+
+
+if __name__ == '__main__':
+    unittest.main()
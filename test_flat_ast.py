@@ -0,0 +1,80 @@
+import unittest
+from flat_ast import FlatAST, flatten
+from fluent_ast import Binary, Number, Var
+from parser import Parser
+
+SOURCE = '''fn classify(x: Int, xs: List[Int]) -> String
+  if x > xs[0]
+    "many"
+  else
+    match x
+      0 => "none"
+      _ => "few"
+let total: Int = 1 + 2 * len([3, 4])
+classify(total, [1, 2])
+'''
+
+
+class TestFlatAST(unittest.TestCase):
+
+    def setUp(self):
+        self.stmts = Parser(SOURCE).parse()
+        self.flat = flatten(self.stmts)
+
+    def test_round_trip(self):
+        self.assertEqual(self.flat.to_nodes(), self.stmts)
+
+    def test_bytes_round_trip(self):
+        restored = FlatAST.from_bytes(self.flat.to_bytes())
+        self.assertEqual(restored.to_nodes(), self.stmts)
+        self.assertEqual(list(restored.walk()), list(self.flat.walk()))
+
+    def test_walk_visits_every_node_once(self):
+        self.assertEqual(sorted(self.flat.walk()), list(range(len(self.flat))))
+
+    def test_fields_read_without_nodes(self):
+        flat = self.flat
+        fn, let = flat.roots[0], flat.roots[1]
+        self.assertEqual(flat.get(fn, "name"), "classify")
+        self.assertEqual(flat.get(flat.get(fn, "return_type"), "name"), "String")
+        self.assertEqual([flat.get(p, "name") for p in flat.get(fn, "params")], ["x", "xs"])
+        value = flat.get(let, "value")
+        self.assertIs(flat.kind(value), Binary)
+        self.assertEqual(flat.get(value, "op"), "+")
+
+    def test_missing_else_is_none(self):
+        flat = flatten(Parser("if x\n  1\n").parse())
+        self.assertIsNone(flat.get(flat.get(flat.roots[0], "expr"), "else_branch"))
+
+    def test_evaluate_arithmetic_in_place(self):
+        tree = Binary(Number(2), "*", Binary(Var("y"), "+", Number(3)))
+        flat = flatten([tree])
+        env = {"y": 4}
+        ops = {"+": int.__add__, "*": int.__mul__}
+        values = {}
+        # Children have higher indices, so a reverse sweep sees them first.
+        for i in reversed(range(len(flat))):
+            kind = flat.kind(i)
+            if kind is Number:
+                values[i] = flat.get(i, "value")
+            elif kind is Var:
+                values[i] = env[flat.get(i, "name")]
+            else:
+                values[i] = ops[flat.get(i, "op")](values[flat.get(i, "left")], values[flat.get(i, "right")])
+        self.assertEqual(values[flat.roots[0]], 14)
+
+    def test_deep_chain(self):
+        tree = Number(0)
+        for i in range(5000):
+            tree = Binary(tree, "+", Number(i))
+        flat = flatten([tree])
+        self.assertEqual(len(flat), 10001)
+        rebuilt = flat.to_nodes()[0]
+        self.assertEqual(rebuilt.right, Number(4999))
+        for _ in range(5000):
+            rebuilt = rebuilt.left
+        self.assertEqual(rebuilt, Number(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
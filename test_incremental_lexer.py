@@ -0,0 +1,83 @@
+import random
+import unittest
+from incremental_lexer import IncrementalLexer
+from lexer import Lexer
+
+SOURCE = '''fn fib(n: Int) -> Int
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+
+fn classify(x: Int)
+  if x > 2
+    "many"
+  else
+    "few"
+let y = fib(10)
+'''
+
+
+class TestIncrementalLexer(unittest.TestCase):
+
+    def assertMatchesFullLex(self, inc):
+        self.assertEqual(inc.tokens(), Lexer(inc.source).tokenize())
+
+    def test_initial_tokens(self):
+        self.assertMatchesFullLex(IncrementalLexer(SOURCE))
+
+    def test_adopts_previous_token_stream(self):
+        inc = IncrementalLexer(SOURCE, Lexer(SOURCE).tokenize())
+        inc.edit(2, 3, ["    0 => 1"])
+        self.assertMatchesFullLex(inc)
+
+    def test_edit_inside_line(self):
+        inc = IncrementalLexer(SOURCE)
+        relexed = inc.edit(4, 5, ["    _ => fib(n - 1) * 2"])
+        self.assertEqual(relexed, range(4, 5))
+        self.assertMatchesFullLex(inc)
+
+    def test_insert_and_delete_lines(self):
+        inc = IncrementalLexer(SOURCE)
+        inc.edit(1, 1, ["  let a = 1", "  let b = 2"])
+        self.assertMatchesFullLex(inc)
+        inc.edit(7, 12, [])
+        self.assertMatchesFullLex(inc)
+
+    def test_indent_change_relexes_until_resync(self):
+        inc = IncrementalLexer(SOURCE)
+        relexed = inc.edit(7, 8, ["  if x > 2", "    if x > 3", "      1"])
+        self.assertMatchesFullLex(inc)
+        self.assertLess(len(relexed), 6)
+
+    def test_edit_at_end_changes_eof_dedents(self):
+        inc = IncrementalLexer(SOURCE)
+        end = len(inc.lines)
+        inc.edit(end, end, ["fn g()", "  if y", "    1"])
+        self.assertMatchesFullLex(inc)
+
+    def test_syntax_error_leaves_buffer_unchanged(self):
+        inc = IncrementalLexer(SOURCE)
+        before = inc.tokens()
+        with self.assertRaises(SyntaxError):
+            inc.edit(2, 3, ["     0 => 0"])
+        self.assertEqual(inc.tokens(), before)
+
+    def test_random_edits(self):
+        rng = random.Random(7)
+        snippets = ["", "let a = 1", "  a + 1", "    b", "fn f(x: Int)", "  match x", "    _ => x"]
+        inc = IncrementalLexer(SOURCE)
+        for _ in range(200):
+            start = rng.randrange(len(inc.lines) + 1)
+            end = rng.randrange(start, min(len(inc.lines), start + 3) + 1)
+            new_lines = rng.choices(snippets, k=rng.randrange(3))
+            try:
+                Lexer("\n".join(inc.lines[:start] + new_lines + inc.lines[end:])).tokenize()
+            except SyntaxError:
+                continue
+            inc.edit(start, end, new_lines)
+            self.assertMatchesFullLex(inc)
+
+
+if __name__ == "__main__":
+    unittest.main()
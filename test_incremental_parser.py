@@ -0,0 +1,88 @@
+import random
+import unittest
+from incremental_parser import IncrementalParser
+from parser import Parser
+
+SOURCE = '''let limit = 10
+
+fn fib(n: Int) -> Int
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+fn classify(x: Int)
+  if x > limit
+    "many"
+  else
+    "few"
+if limit > 2
+  1
+else
+  2
+let y = fib(limit)
+'''
+
+
+class TestIncrementalParser(unittest.TestCase):
+
+    def assertMatchesFullParse(self, inc):
+        self.assertEqual(inc.stmts, Parser(inc.lexer.source).parse())
+
+    def test_initial_parse(self):
+        inc = IncrementalParser(SOURCE)
+        self.assertMatchesFullParse(inc)
+        self.assertEqual(inc.starts, [0, 2, 7, 12, 16])
+
+    def test_edit_reuses_other_declarations(self):
+        inc = IncrementalParser(SOURCE)
+        before = list(inc.stmts)
+        reparsed = inc.edit(5, 6, ["    1 => 2"])
+        self.assertEqual(reparsed, range(1, 2))
+        self.assertMatchesFullParse(inc)
+        for i in (0, 2, 3, 4):
+            self.assertIs(inc.stmts[i], before[i])
+
+    def test_inserting_lines_shifts_later_statements(self):
+        inc = IncrementalParser(SOURCE)
+        last = inc.stmts[-1]
+        inc.edit(2, 2, ["fn one() -> Int", "  1"])
+        self.assertMatchesFullParse(inc)
+        self.assertEqual(inc.starts, [0, 2, 4, 9, 14, 18])
+        self.assertIs(inc.stmts[-1], last)
+
+    def test_edit_can_extend_previous_statement(self):
+        inc = IncrementalParser(SOURCE)
+        inc.edit(7, 7, ["    2 => 1"])
+        self.assertMatchesFullParse(inc)
+
+    def test_else_line_is_not_a_statement_boundary(self):
+        inc = IncrementalParser(SOURCE)
+        inc.edit(14, 15, ["else"])
+        self.assertMatchesFullParse(inc)
+
+    def test_recovers_after_syntax_error(self):
+        inc = IncrementalParser(SOURCE)
+        with self.assertRaises(SyntaxError):
+            inc.edit(16, 17, ["let y = "])
+        inc.edit(16, 17, ["let y = 3"])
+        self.assertMatchesFullParse(inc)
+
+    def test_random_edits(self):
+        rng = random.Random(3)
+        snippets = ["", "let a = 1", "  a + 1", "    b", "fn f(x: Int)", "  match x", "    _ => x", "else"]
+        inc = IncrementalParser(SOURCE)
+        for _ in range(300):
+            start = rng.randrange(len(inc.lexer.lines) + 1)
+            end = rng.randrange(start, min(len(inc.lexer.lines), start + 2) + 1)
+            new_lines = rng.choices(snippets, k=rng.randrange(4))
+            lines = inc.lexer.lines[:start] + new_lines + inc.lexer.lines[end:]
+            try:
+                expected = Parser("".join(line + "\n" for line in lines)).parse()
+            except SyntaxError:
+                continue
+            inc.edit(start, end, new_lines)
+            self.assertEqual(inc.stmts, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import io
 import unittest
 from lexer import Lexer, TokenType
 
@@ -153,5 +154,104 @@ class TestLexerErrors(unittest.TestCase):
             Lexer(source).tokenize()
 
 
+class TestIterTokens(unittest.TestCase):
+
+    def test_matches_tokenize(self):
+        source = "fn f(x: Int)\n  match x\n    0 => 1\n\n    _ => x\r\nlet y = f(2)\n"
+        self.assertEqual(list(Lexer(source).iter_tokens()), Lexer(source).tokenize())
+
+    def test_reads_text_file_object(self):
+        source = "fn f(x: Int)\n  if x > 1\n    x\nlet y = 2"
+        self.assertEqual(list(Lexer(io.StringIO(source)).iter_tokens()), Lexer(source).tokenize())
+
+    def test_is_lazy(self):
+        def lines():
+            yield "let x = 1\n"
+            raise AssertionError("read past the first line")
+
+        tokens = Lexer(lines()).iter_tokens()
+        self.assertEqual(next(tokens).type, TokenType.LET)
+
+    def test_trailing_dedents_and_eof(self):
+        types = [t.type for t in Lexer("fn f\n  if x\n    1").iter_tokens()]
+        self.assertEqual(types[-3:], [TokenType.DEDENT, TokenType.DEDENT, TokenType.EOF])
+
+
+class TestScannerTokens(unittest.TestCase):
+    # Tokens and errors of the original if/elif scanner, quirks included.
+    SOURCES = [
+        ('fn fib(n: Int) -> Int\n  match n\n    0 => 0\n    _ => fib(n - 1) + fib(n - 2)', [
+            ('FN', 'fn', 0, 0), ('IDENT', 'fib', 0, 3), ('LPAREN', '(', 0, 6), ('IDENT', 'n', 0, 7),
+            ('COLON', ':', 0, 8), ('IDENT', 'Int', 0, 10), ('RPAREN', ')', 0, 13), ('ARROW', '->', 0, 15),
+            ('IDENT', 'Int', 0, 18), ('NEWLINE', '', 0, 21), ('INDENT', '', 1, 0), ('MATCH', 'match', 1, 2),
+            ('IDENT', 'n', 1, 8), ('NEWLINE', '', 1, 9), ('INDENT', '', 2, 0), ('NUMBER', '0', 2, 4),
+            ('FAT_ARROW', '=>', 2, 6), ('NUMBER', '0', 2, 9), ('NEWLINE', '', 2, 10), ('UNDERSCORE', '_', 3, 4),
+            ('FAT_ARROW', '=>', 3, 6), ('IDENT', 'fib', 3, 9), ('LPAREN', '(', 3, 12), ('IDENT', 'n', 3, 13),
+            ('MINUS', '-', 3, 15), ('NUMBER', '1', 3, 17), ('RPAREN', ')', 3, 18), ('PLUS', '+', 3, 20),
+            ('IDENT', 'fib', 3, 22), ('LPAREN', '(', 3, 25), ('IDENT', 'n', 3, 26), ('MINUS', '-', 3, 28),
+            ('NUMBER', '2', 3, 30), ('RPAREN', ')', 3, 31), ('NEWLINE', '', 3, 32), ('DEDENT', '', 4, 0),
+            ('DEDENT', '', 4, 0), ('EOF', '', 4, 0),
+        ]),
+        ('a and b or not c', [
+            ('IDENT', 'a', 0, 0), ('IDENT', 'and', 0, 2), ('IDENT', 'b', 0, 6), ('IDENT', 'or', 0, 8),
+            ('IDENT', 'not', 0, 11), ('IDENT', 'c', 0, 15), ('NEWLINE', '', 0, 16), ('EOF', '', 1, 0),
+        ]),
+        ('true false _ __x _1 x_', [
+            ('IDENT', 'true', 0, 0), ('IDENT', 'false', 0, 5), ('UNDERSCORE', '_', 0, 11), ('UNDERSCORE', '_', 0, 13),
+            ('IDENT', '_x', 0, 14), ('IDENT', '_1', 0, 17), ('IDENT', 'x_', 0, 20), ('NEWLINE', '', 0, 22),
+            ('EOF', '', 1, 0),
+        ]),
+        ('x == y != z >= 1 <= 2 > 3 < 4', [
+            ('IDENT', 'x', 0, 0), ('ASSIGN', '=', 0, 2), ('ASSIGN', '=', 0, 3), ('IDENT', 'y', 0, 5),
+            ('NEQ', '!=', 0, 7), ('IDENT', 'z', 0, 10), ('GTE', '>=', 0, 12), ('NUMBER', '1', 0, 15),
+            ('LTE', '<=', 0, 17), ('NUMBER', '2', 0, 20), ('GT', '>', 0, 22), ('NUMBER', '3', 0, 24),
+            ('LT', '<', 0, 26), ('NUMBER', '4', 0, 28), ('NEWLINE', '', 0, 29), ('EOF', '', 1, 0),
+        ]),
+        ('let xs: List[Int] = [0..10]', [
+            ('LET', 'let', 0, 0), ('IDENT', 'xs', 0, 4), ('COLON', ':', 0, 6), ('IDENT', 'List', 0, 8),
+            ('LBRACKET', '[', 0, 12), ('IDENT', 'Int', 0, 13), ('RBRACKET', ']', 0, 16), ('ASSIGN', '=', 0, 18),
+            ('LBRACKET', '[', 0, 20), ('NUMBER', '0', 0, 21), ('RANGE', '..', 0, 22), ('NUMBER', '10', 0, 24),
+            ('RBRACKET', ']', 0, 26), ('NEWLINE', '', 0, 27), ('EOF', '', 1, 0),
+        ]),
+        ('print("a" , "")   + "b c"', [
+            ('PRINT', 'print', 0, 0), ('LPAREN', '(', 0, 5), ('STRING', 'a', 0, 6), ('COMMA', ',', 0, 10),
+            ('STRING', '', 0, 12), ('RPAREN', ')', 0, 14), ('PLUS', '+', 0, 18), ('STRING', 'b c', 0, 20),
+            ('NEWLINE', '', 0, 25), ('EOF', '', 1, 0),
+        ]),
+        ('\u0663\u0664 + 1', [
+            ('NUMBER', '\u0663\u0664', 0, 0), ('PLUS', '+', 0, 3), ('NUMBER', '1', 0, 5), ('NEWLINE', '', 0, 6),
+            ('EOF', '', 1, 0),
+        ]),
+        ('  \n\nlet a = 1\n\n', [
+            ('NEWLINE', '', 0, 0), ('NEWLINE', '', 1, 0), ('LET', 'let', 2, 0), ('IDENT', 'a', 2, 4),
+            ('ASSIGN', '=', 2, 6), ('NUMBER', '1', 2, 8), ('NEWLINE', '', 2, 9), ('NEWLINE', '', 3, 0),
+            ('EOF', '', 4, 0),
+        ]),
+    ]
+    BAD_SOURCES = [
+        ('let name = "John', 'Unclosed string starting at line 1, column 11'),
+        ('let x = 42 @', "Unexpected character '@' at line 1, column 11"),
+        ('a >> b', "Unexpected operator '>>' at line 1, column 2"),
+        ('a >>> b', "Unexpected operator '>>>' at line 1, column 2"),
+        ('a.b', "Unexpected character '.' at line 1, column 1"),
+        ('_\u00e9', "Unexpected character '\u00e9' at line 1, column 1"),
+        ('fn t\n   let a = 1', 'Unexpected indent on line 2: expected 2 spaces, got 3'),
+        ('fn t\n\tlet a = 1', 'Tabs not allowed (line 2)'),
+    ]
+
+    def test_tokens(self):
+        for source, expected in self.SOURCES:
+            with self.subTest(source=source):
+                tokens = [(t.type.name, t.value, t.line, t.column) for t in Lexer(source).tokenize()]
+                self.assertEqual(tokens, expected)
+
+    def test_errors(self):
+        for source, message in self.BAD_SOURCES:
+            with self.subTest(source=source):
+                with self.assertRaises(SyntaxError) as ctx:
+                    Lexer(source).tokenize()
+                self.assertEqual(str(ctx.exception), message)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from lexer import Lexer
+from mapped_lexer import MappedLexer
+from parser import Parser
+
+SOURCE = '''fn fib(n: Int) -> Int
+  match n
+    0 => 0
+    _ => fib(n - 1) + fib(n - 2)
+let greeting = "héllo, wörld" + "!"
+let x = fib(10)
+'''
+
+
+class TestMappedLexer(unittest.TestCase):
+
+    def write(self, data: bytes):
+        fd, path = tempfile.mkstemp(suffix=".fl")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def assertSameTokens(self, text, data=None):
+        path = self.write(text.encode("utf-8") if data is None else data)
+        with Lexer.from_path(path) as lexer:
+            self.assertEqual(list(lexer.tokenize()), Lexer(text).tokenize())
+
+    def test_ascii_and_utf8_lines(self):
+        self.assertSameTokens(SOURCE)
+        self.assertSameTokens('let s = "é" + t  ')
+
+    def test_line_endings(self):
+        text = "fn f(x: Int)\r\n  x\r\n\r\nlet y = 1"
+        self.assertSameTokens(text)
+        self.assertSameTokens("a\rb\x0cc\n", "a\rb\x0cc\n".encode())
+
+    def test_empty_and_blank_files(self):
+        self.assertSameTokens("")
+        self.assertSameTokens("\n   \n")
+
+    def test_same_errors(self):
+        for text in ['let name = "John', "let x = 42 @", "a >>> b", "fn t\n   let a = 1",
+                     "fn t\n\tlet a = 1", "let é = 1"]:
+            with self.subTest(text=text):
+                with self.assertRaises(SyntaxError) as expected:
+                    Lexer(text).tokenize()
+                with self.assertRaises(SyntaxError) as actual, \
+                        Lexer.from_path(self.write(text.encode())) as lexer:
+                    lexer.tokenize()
+                self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_parser_from_path(self):
+        path = self.write(SOURCE.encode("utf-8"))
+        self.assertEqual(Parser.from_path(path).parse(), Parser(SOURCE).parse())
+
+    def test_close(self):
+        with Lexer.from_path(self.write(SOURCE.encode("utf-8"))) as lexer:
+            lexer.tokenize()
+        self.assertTrue(lexer.data.closed)
+        lexer.close()  # closing twice is harmless
+        with Lexer.from_path(self.write(b"")) as lexer:
+            self.assertEqual(list(lexer.tokenize()), Lexer("").tokenize())
+
+    def test_parser_from_path_closes_map(self):
+        closed = []
+        original = MappedLexer.close
+
+        def close(lexer):
+            closed.append(lexer.data.closed)
+            original(lexer)
+        with mock.patch.object(MappedLexer, "close", close):
+            Parser.from_path(self.write(SOURCE.encode("utf-8"))).parse()
+            self.assertEqual(closed, [False])
+            with self.assertRaises(SyntaxError):
+                Parser.from_path(self.write(b"let x = 42 @")).parse()
+            self.assertEqual(closed, [False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from fluent_ast import Binary, Boolean, ExprStmt, FnDecl, FnParam, IfExpr, LetStmt, MatchCase, MatchExpr, Number, Return, SimpleType, String, Var
+from interpreter import BACKENDS, Interpreter
+from optimizer import fold_constants
+from parser import Parser
+from test_backends import ERRORS, PROGRAMS
+
+
+def fold(source):
+    return fold_constants(Parser(source).parse())
+
+
+class TestFoldConstants(unittest.TestCase):
+
+    def test_literal_arithmetic(self):
+        self.assertEqual(fold('24 * 60 * 60\n"ab" + "c"\n1 < 2\n'),
+                         [ExprStmt(Number(86400)), ExprStmt(String("abc")), ExprStmt(Boolean(True))])
+
+    def test_failing_operations_left_alone(self):
+        self.assertEqual(fold("1 / 0\n"), [ExprStmt(Binary(Number(1), "/", Number(0)))])
+        self.assertEqual(fold('"a" - 1\n'), [ExprStmt(Binary(String("a"), "-", Number(1)))])
+        # No literal for the float 0.5.
+        self.assertEqual(fold("1 / 2\n"), [ExprStmt(Binary(Number(1), "/", Number(2)))])
+
+    def test_let_constants(self):
+        stmts = fold("let day = 24 * 60\nfn week(n: Int)\n  let k = day * 7\n  n * k\nday + 1\n")
+        self.assertEqual(stmts[0], LetStmt("day", None, Number(1440)))
+        # Inside the function `day` may be a caller's local; `k` is its own.
+        self.assertEqual(stmts[1].body, [LetStmt("k", None, Binary(Var("day"), "*", Number(7))),
+                                         ExprStmt(Binary(Var("n"), "*", Var("k")))])
+        self.assertEqual(stmts[2], ExprStmt(Number(1441)))
+
+    def test_rebinding_forgets_constant(self):
+        stmts = fold("let x = 1\nfn f(n: Int)\n  n\nlet x = f(2)\nx + 1\n")
+        self.assertEqual(stmts[-1], ExprStmt(Binary(Var("x"), "+", Number(1))))
+
+    def test_branch_scope_respected(self):
+        stmts = fold("let x = 1\nlet y = 5\nif y > 2\n  let x = y * 2\n  x\nx\n")
+        self.assertEqual(stmts[2], ExprStmt(IfExpr(Boolean(True), [LetStmt("x", None, Number(10)), ExprStmt(Number(10))], None)))
+        self.assertEqual(stmts[3], ExprStmt(Number(1)))
+
+    def test_constant_if_collapses(self):
+        self.assertEqual(fold("let n = 3\nif n > 2\n  n * 2\nelse\n  0\n"), [LetStmt("n", None, Number(3)), ExprStmt(Number(6))])
+        self.assertEqual(fold("if 2 > 3\n  1\n"), [ExprStmt(IfExpr(Boolean(False), [], None))])
+        self.assertEqual(fold("if 1\n  2\n"), [ExprStmt(IfExpr(Number(1), [ExprStmt(Number(2))], None))])
+
+    def test_constant_if_statement_spliced(self):
+        stmts = [FnDecl("f", [FnParam("a", SimpleType("Int"))], None, [
+            ExprStmt(IfExpr(Binary(Number(1), "<", Number(2)), [Return(Var("a"))], None)),
+            ExprStmt(Number(0)),
+        ])]
+        self.assertEqual(fold_constants(stmts)[0].body, [Return(Var("a")), ExprStmt(Number(0))])
+
+    def test_match_arms(self):
+        source = "let mode = 2\nmatch mode\n  1 => 10\n  2 => 20\n  _ => 30\n"
+        self.assertEqual(fold(source)[1], ExprStmt(Number(20)))
+        stmts = fold("fn f(n: Int)\n  match n\n    1 => 10\n    1 => 11\n    _ => 30\n    2 => 40\n")
+        self.assertEqual(stmts[0].body[0].expr.cases, [MatchCase(1, Number(10)), MatchCase("_", Number(30))])
+        self.assertEqual(fold("match 5\n  1 => 10\n")[0], ExprStmt(MatchExpr(Number(5), [])))
+
+    def test_short_circuit_on_constant(self):
+        stmts = [ExprStmt(Binary(Binary(Number(2), "<", Number(1)), "and", Var("x"))),
+                 ExprStmt(Binary(Boolean(True), "and", Var("x")))]
+        self.assertEqual(fold_constants(stmts), [ExprStmt(Boolean(False)), ExprStmt(Var("x"))])
+
+
+class TestOptimizedPrograms(unittest.TestCase):
+
+    def test_programs_agree(self):
+        for name, source in PROGRAMS.items():
+            expected = Interpreter("tree").eval_program(Parser(source).parse())
+            for backend in BACKENDS:
+                with self.subTest(program=name, backend=backend):
+                    interpreter = Interpreter(backend, optimize=True)
+                    self.assertEqual(interpreter.eval_program(Parser(source).parse()), expected)
+
+    def test_errors_agree(self):
+        for name, (source, error, message) in ERRORS.items():
+            with self.subTest(program=name):
+                with self.assertRaisesRegex(error, message):
+                    Interpreter("tree", optimize=True).eval_program(Parser(source).parse())
+
+    def test_stream(self):
+        interpreter = Interpreter("tree", optimize=True)
+        self.assertEqual(interpreter.eval_stream("let n = 4\nif n > 2\n  n * 10\n"), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from benchmarks.corpus import many_functions
+from parallel_parser import parse_parallel, split_top_level
+from parser import Parser
+
+SOURCE = '''let limit = 10
+fn classify(x: Int)
+  if x > limit
+    "many"
+  else
+    "few"
+if limit > 2
+  1
+else
+  2
+fn fib(n: Int) -> Int
+  match n
+    0 => 0
+    _ => fib(n - 1) + fib(n - 2)
+let y = fib(limit)
+'''
+
+
+class TestSplitTopLevel(unittest.TestCase):
+
+    def test_pieces_rejoin_to_source(self):
+        parts = split_top_level(SOURCE, 16)
+        self.assertEqual("".join(text for _, text in parts), SOURCE)
+
+    def test_cuts_only_at_statement_starts(self):
+        starts = [first for first, _ in split_top_level(SOURCE, 16)]
+        self.assertEqual(starts, [0, 1, 6, 10, 14])
+
+    def test_else_stays_with_its_if(self):
+        for _, text in split_top_level(SOURCE, 16):
+            self.assertFalse(text.startswith("else"))
+
+
+class TestParseParallel(unittest.TestCase):
+
+    def test_matches_sequential_parse(self):
+        source = many_functions(200) + SOURCE
+        self.assertEqual(parse_parallel(source, workers=2, min_lines=0), Parser(source).parse())
+
+    def test_small_source_parses_in_process(self):
+        self.assertEqual(parse_parallel(SOURCE), Parser(SOURCE).parse())
+
+    def test_error_line_is_relative_to_whole_source(self):
+        source = many_functions(100) + "let x = (1\n"
+        with self.assertRaises(SyntaxError) as ctx:
+            Parser(source).parse()
+        with self.assertRaises(SyntaxError) as parallel:
+            parse_parallel(source, workers=2, min_lines=0)
+        self.assertEqual(str(parallel.exception), str(ctx.exception))
+        self.assertIn("line 501", str(parallel.exception))
+
+    def test_error_at_a_cut_matches_sequential_parse(self):
+        # The if/else ends a piece: parsed alone, the missing else branch
+        # meets the end of the piece instead of the `fn` after it.
+        source = many_functions(14) + "if x\n  1\nelse\n" + many_functions(100)
+        self.assertTrue(any(text.endswith("else\n") for _, text in split_top_level(source, 8)))
+        with self.assertRaises(SyntaxError) as ctx:
+            Parser(source).parse()
+        with self.assertRaises(SyntaxError) as parallel:
+            parse_parallel(source, workers=2, min_lines=0)
+        self.assertEqual(str(parallel.exception), str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import unittest
 from parser import Parser
-from fluent_ast import LetStmt, Number, String, Var, Binary, FnDecl, FnParam, Call, IfExpr, MatchExpr, MatchCase, SimpleType
+from lexer import Token, TokenType
+from fluent_ast import LetStmt, Number, String, Var, Binary, FnDecl, FnParam, Call, IfExpr, MatchExpr, MatchCase, SimpleType, \
+    Boolean, ExprStmt, IndexExpr, ListLiteral, ListType
 
 
 class TestParser(unittest.TestCase):
@@ -98,7 +101,7 @@ fn double(x: Int) -> Int
 '''
         fn = self.parse(src)[0]
         self.assertEqual(fn.name, "double")
-        self.assertEqual(fn.return_type, "Int")
+        self.assertEqual(fn.return_type, SimpleType("Int"))
 
     def test_fn_multiple_params(self):
         src = '''
@@ -219,5 +222,74 @@ let result = match input
         self.assertEqual(m.cases[1].pattern, "_")
 
 
+    def test_parse_from_file_object(self):
+        src = "fn inc(x: Int) -> Int\n  x + 1\nlet y = inc(1)\n"
+        self.assertEqual(Parser(io.StringIO(src)).parse(), self.parse(src))
+
+    def test_unexpected_end_of_input(self):
+        parser = Parser("let x = 1")
+        parser.parse()
+        self.assertEqual(parser.advance().type, TokenType.EOF)
+        with self.assertRaises(SyntaxError):
+            parser.advance()
+
+
+class TestExpressionTrees(unittest.TestCase):
+    # Trees and errors of the recursive-descent expression parser the Pratt
+    # parser replaced, quirks included.
+    a, b, c, d, e = (Var(name) for name in "abcde")
+    SOURCES = [
+        ("a + b * c - d / e",
+         [ExprStmt(Binary(Binary(a, "+", Binary(b, "*", c)), "-", Binary(d, "/", e)))]),
+        ("a < b + 1 != c >= d",
+         [ExprStmt(Binary(Binary(Binary(a, "<", Binary(b, "+", Number(1))), "!=", c), ">=", d))]),
+        ("f(x, g(y)[0], [1, 2][i]) * (a + b)",
+         [ExprStmt(Binary(Call("f", [Var("x"), IndexExpr(Call("g", [Var("y")]), Number(0)),
+                                     IndexExpr(ListLiteral([Number(1), Number(2)]), Var("i"))]),
+                          "*", Binary(a, "+", b)))]),
+        ("xs[0][1] + f()",
+         [ExprStmt(Binary(IndexExpr(IndexExpr(Var("xs"), Number(0)), Number(1)), "+", Call("f", [])))]),
+        ("let y = match x\n  0 => a + 1\n  _ => if a > b\n    a\n  else\n    b * 2",
+         [LetStmt("y", None, MatchExpr(Var("x"), [
+             MatchCase(0, Binary(a, "+", Number(1))),
+             MatchCase("_", IfExpr(Binary(a, ">", b), [ExprStmt(a)], [ExprStmt(Binary(b, "*", Number(2)))])),
+         ]))]),
+        ("fn f(a: Int, b: List[Int]) -> Int\n  let c = b[a] - 1\n  c * f(a - 1, b)",
+         [FnDecl("f", [FnParam("a", SimpleType("Int")), FnParam("b", ListType(SimpleType("Int")))], SimpleType("Int"), [
+             LetStmt("c", None, Binary(IndexExpr(b, a), "-", Number(1))),
+             ExprStmt(Binary(c, "*", Call("f", [Binary(a, "-", Number(1)), b]))),
+         ])]),
+    ]
+    BAD_SOURCES = [
+        ("(a + b)(1)", "Cannot call non-variable expression at line 1"),
+        ("let x = + 1", "Unsupported expression starting with TokenType.PLUS"),
+        ("f(1, 2", "Expected TokenType.RPAREN, got TokenType.NEWLINE at line 1"),
+        ("a * ]", "Unsupported expression starting with TokenType.RBRACKET"),
+    ]
+
+    def test_trees(self):
+        for source, expected in self.SOURCES:
+            with self.subTest(source=source):
+                self.assertEqual(Parser(source).parse(), expected)
+
+    def test_errors(self):
+        for source, message in self.BAD_SOURCES:
+            with self.subTest(source=source):
+                with self.assertRaises(SyntaxError) as ctx:
+                    Parser(source).parse()
+                self.assertEqual(str(ctx.exception), message)
+
+    def test_not_binds_to_the_operand_only(self):
+        # The lexer emits `not` as an identifier, so feed NOT tokens directly.
+        tokens = [Token(TokenType.NOT, "not", 0, 0), Token(TokenType.NOT, "not", 0, 4),
+                  Token(TokenType.IDENT, "a", 0, 8), Token(TokenType.LBRACKET, "[", 0, 9),
+                  Token(TokenType.NUMBER, "0", 0, 10), Token(TokenType.RBRACKET, "]", 0, 11),
+                  Token(TokenType.PLUS, "+", 0, 13), Token(TokenType.IDENT, "b", 0, 15),
+                  Token(TokenType.NEWLINE, "", 0, 16), Token(TokenType.EOF, "", 1, 0)]
+        not_ = Binary(Boolean(True), "and not", Binary(Boolean(True), "and not", self.a))
+        self.assertEqual(Parser.from_tokens(tokens).parse(),
+                         [ExprStmt(Binary(IndexExpr(not_, Number(0)), "+", self.b))])
+
+
 if __name__ == "__main__":
     unittest.main()
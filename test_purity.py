@@ -0,0 +1,145 @@
+import contextlib
+import io
+import unittest
+from fluent_ast import Call, ExprStmt, FnDecl, FnParam, SimpleType, Var
+from interpreter import Interpreter
+from parser import Parser
+from purity import NO_KEY, MemoCache, memo_key, pure_functions
+
+FIB = '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+'''
+
+
+def parse(source):
+    return Parser(source).parse()
+
+
+class TestPureFunctions(unittest.TestCase):
+
+    # A `len` of the program's own, which prints.
+    LOUD_LEN = FnDecl("len", [FnParam("x", SimpleType("Int"))], None,
+                      [ExprStmt(Call("print", [Var("x")])), ExprStmt(Var("x"))])
+
+    def test_recursion_and_builtins(self):
+        source = FIB + '''fn is_even(n: Int)
+  match n
+    0 => 1
+    _ => is_odd(n - 1)
+fn is_odd(n: Int)
+  match n
+    0 => 0
+    _ => is_even(n - 1)
+fn size(xs: List[Int])
+  let m = len(xs)
+  m * 2
+'''
+        self.assertEqual(pure_functions(parse(source)), {"fib", "is_even", "is_odd", "size"})
+
+    def test_free_names_and_printing(self):
+        stmts = parse("let k = 3\nfn scaled(n: Int)\n  n * k\nfn uses(n: Int)\n  scaled(n)\n") + [
+            FnDecl("shout", [FnParam("s", SimpleType("String"))], None, [ExprStmt(Call("print", [Var("s")]))]),
+        ]
+        self.assertEqual(pure_functions(stmts), set())
+
+    def test_shadowed_function_name(self):
+        # Scoping is dynamic: inside `outer`, `fib` is a number.
+        source = FIB + "fn outer(fib: Int)\n  fib + 1\n"
+        self.assertEqual(pure_functions(parse(source)), {"outer"})
+
+    def test_redeclared_builtin(self):
+        stmts = [self.LOUD_LEN] + parse("fn size(n: Int)\n  len(n)\n")
+        self.assertEqual(pure_functions(stmts), set())
+
+    def test_declared_and_known(self):
+        stmts = parse("let k = 3\nfn scaled(n: Int)\n  n * k\nfn twice(n: Int)\n  scaled(n) + old(n)\n")
+        self.assertEqual(pure_functions(stmts, known={"old"}, declared={"scaled"}), {"scaled", "twice"})
+
+
+class TestMemoKey(unittest.TestCase):
+
+    def test_types_kept_apart(self):
+        keys = [memo_key([1]), memo_key([True]), memo_key([1.0]), memo_key(["1"]), memo_key([[1]]), memo_key([1, 1])]
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(memo_key([[1, [2]], "a"]), memo_key([[1, [2]], "a"]))
+
+    def test_unhashable(self):
+        fn = FnDecl("f", [], None, [])
+        self.assertIs(memo_key([fn]), NO_KEY)
+        self.assertIs(memo_key([1, [fn]]), NO_KEY)
+
+
+class TestMemoCache(unittest.TestCase):
+
+    def test_lru_and_counts(self):
+        cache = MemoCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)  # evicts "b", used least recently
+        self.assertEqual(sorted(cache.entries), ["a", "c"])
+        cache.get("b")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 2))
+
+
+class TestMemoizedInterpreter(unittest.TestCase):
+
+    def test_fib_is_memoized(self):
+        interpreter = Interpreter("tree", memoize=128)
+        self.assertEqual(interpreter.eval_program(parse(FIB + "fib(60)\n")), 1548008755920)
+        cache = interpreter.memo_caches["fib"]
+        self.assertEqual((cache.misses, cache.hits), (61, 58))
+
+    def test_small_cache_gives_same_results(self):
+        source = FIB + "[fib(15), fib(14), fib(15)]\n"
+        expected = Interpreter("tree").eval_program(parse(source))
+        interpreter = Interpreter("tree", memoize=2)
+        self.assertEqual(interpreter.eval_program(parse(source)), expected)
+        self.assertLessEqual(len(interpreter.memo_caches["fib"]), 2)
+
+    def test_argument_errors_still_raised(self):
+        interpreter = Interpreter("tree", memoize=8)
+        interpreter.eval_program(parse(FIB + "fib(3)\n"))
+        with self.assertRaisesRegex(TypeError, "parameter 'n'"):
+            interpreter.eval_program(parse('fib("3")\n'))
+
+    def test_dynamic_reads_not_memoized(self):
+        source = '''fn inner(n: Int)
+  n + depth
+fn outer(depth: Int)
+  inner(1)
+[outer(1), outer(2)]
+'''
+        interpreter = Interpreter("tree", memoize=8)
+        self.assertEqual(interpreter.eval_program(parse(source)), [2, 3])
+        self.assertEqual(interpreter.memo_caches, {})
+
+    def test_rebinding_clears_caches(self):
+        interpreter = Interpreter("tree", memoize=8)
+        interpreter.eval_program(parse("fn one()\n  1\nfn two()\n  one() + one()\ntwo()\n"))
+        self.assertEqual(interpreter.eval_program(parse("fn one()\n  10\ntwo()\n")), 20)
+
+    def test_redeclared_builtin_not_memoized(self):
+        stmts = [TestPureFunctions.LOUD_LEN] + parse("fn f(n: Int)\n  len(n)\n[f(1), f(1)]\n")
+        interpreter = Interpreter("tree", memoize=16)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(interpreter.eval_program(stmts), [1, 1])
+        self.assertEqual(out.getvalue(), "1\n1\n")
+        self.assertNotIn("f", interpreter.memo_caches)
+
+    def test_pure_annotation(self):
+        interpreter = Interpreter("tree", memoize=8, pure={"scaled"})
+        interpreter.eval_program(parse("let k = 3\nfn scaled(n: Int)\n  n * k\n[scaled(2), scaled(2)]\n"))
+        self.assertEqual(interpreter.memo_caches["scaled"].hits, 1)
+
+    def test_other_backends_reject_memoize(self):
+        with self.assertRaisesRegex(ValueError, "does not support memoize"):
+            Interpreter("vm", memoize=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from fluent_ast import Boolean, Call, ExprStmt, IfExpr, LetStmt, ListLiteral, Number, Var
+from interpreter import Interpreter
+from parser import Parser
+from py_backend import CodeCache
+
+FIB = '''fn fib(n: Int)
+  match n
+    0 => 0
+    1 => 1
+    _ => fib(n - 1) + fib(n - 2)
+fib(20)
+'''
+
+
+class TestPythonBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = Interpreter("python")
+
+    def test_functions_become_python_functions(self):
+        source = self.interpreter.generate(Parser(FIB).parse())
+        self.assertIn("def f0_fib(scope, v0_n):", source)
+        self.assertIn("isinstance(v0_n, int)", source)
+        # Nothing reads `n` from a caller, so calls pass the scope through.
+        self.assertNotIn("extend(", source)
+
+    def test_callers_pass_names_read_dynamically(self):
+        source = "fn inner()\n  depth\nfn outer(depth: Int)\n  inner()\n"
+        self.assertIn("extend(scope, {", self.interpreter.generate(Parser(source).parse()))
+
+    def test_later_function_reading_caller_local(self):
+        # f is compiled before anything reads `x` dynamically, then must be regenerated.
+        result = self.interpreter.eval_stream(
+            "fn g()\n  1\nfn f(x: Int)\n  g()\nlet a = f(5)\nfn g()\n  x\nf(5)\n")
+        self.assertEqual(result, 5)
+        self.assertEqual(self.interpreter.global_env.get("a"), 1)
+
+    def test_operands_run_left_to_right(self):
+        # The if needs statements; the print before it must still run first.
+        expr = ListLiteral([
+            Call("print", [Number(1)]),
+            IfExpr(Boolean(True), [LetStmt("y", None, Number(2)), ExprStmt(Call("print", [Var("y")]))], None),
+        ])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(self.interpreter.eval_expr(expr, self.interpreter.global_env), [None, None])
+        self.assertEqual(out.getvalue(), "1\n2\n")
+
+    def test_code_cache_skips_compiling(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.interpreter.code_cache = CodeCache(directory)
+            self.assertEqual(self.interpreter.eval_program(Parser(FIB).parse()), 6765)
+            again = Interpreter("python")
+            again.code_cache = CodeCache(directory)
+            with mock.patch("builtins.compile", side_effect=AssertionError("compiled again")):
+                self.assertEqual(again.eval_program(Parser(FIB).parse()), 6765)
+
+
+if __name__ == '__main__':
+    unittest.main()
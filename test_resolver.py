@@ -0,0 +1,85 @@
+import unittest
+from interpreter import BACKENDS, Environment, Interpreter
+from parser import Parser
+from fluent_ast import Binary, Var
+from resolver import UNBOUND, Frame, Local, Resolver, Scope, check_names, lookup, resolve_function
+from symbols import symbol
+
+
+class TestResolver(unittest.TestCase):
+
+    def test_addresses_count_frames_outwards(self):
+        fn = Parser("fn f(a: Int, b: Int)\n  a\n").parse()[0]
+        resolver = Resolver(fn)
+        self.assertEqual(resolver.address(symbol("b")), (0, 1))
+        resolver.push(Scope())
+        self.assertEqual(resolver.bind(symbol("c")), 0)
+        self.assertEqual(resolver.address(symbol("c")), (0, 0))
+        self.assertEqual(resolver.address(symbol("a")), (1, 0))
+        resolver.pop()
+        self.assertIsNone(resolver.address(symbol("c")))
+
+    def test_top_level_binds_in_environment(self):
+        self.assertIsNone(Resolver().bind(symbol("x")))
+
+    def test_dynamic_lookup_skips_unset_slots(self):
+        env = Environment()
+        env.set("x", "global")
+        scope = Scope()
+        scope.bind(symbol("x"))
+        caller = Frame(scope, env)
+        callee = Frame(Scope(), caller)
+        self.assertIs(caller.slots[0], UNBOUND)
+        self.assertEqual(lookup(callee, symbol("x")), "global")
+        caller.slots[0] = "caller"
+        self.assertEqual(lookup(callee, symbol("x")), "caller")
+
+
+class TestResolvedBodies(unittest.TestCase):
+
+    def test_reads_of_locals_get_addresses(self):
+        fn = Parser("fn f(a: Int)\n  if a > 0\n    let b = a\n    b + a + c\n  else\n    a\n").parse()[0]
+        scope, body = resolve_function(fn)
+        self.assertEqual(scope.syms, [symbol("a")])
+        then_branch, else_branch = body[0].expr.then_branch, body[0].expr.else_branch
+        self.assertEqual(then_branch.scope.syms, [symbol("b")])
+        self.assertEqual(then_branch[0].value, Local("a", 1, 0))
+        self.assertEqual(then_branch[1].expr, Binary(Binary(Local("b", 0, 0), "+", Local("a", 1, 0)), "+", Var("c")))
+        self.assertIsNone(else_branch.scope)
+        self.assertEqual(else_branch[0].expr, Local("a", 0, 0))
+
+    def test_tree_walker_keeps_dynamic_scoping(self):
+        source = ("fn show()\n  x\n"
+                  "fn f(x: Int)\n  if x > 0\n    let x = x + 10\n    show()\n  else\n    show()\n"
+                  "let a = f(1)\nlet b = f(0)\n")
+        interpreter = Interpreter("tree")
+        interpreter.eval_program(Parser(source).parse())
+        self.assertEqual((interpreter.global_env.get("a"), interpreter.global_env.get("b")), (11, 0))
+
+    def test_bodies_of_replaced_functions_are_dropped(self):
+        # With optimize, every run declares a new copy of each function.
+        interpreter = Interpreter("tree", optimize=True)
+        stmts = Parser("fn f(x: Int)\n  fn g(y: Int)\n    y\n  g(x)\nf(1)\n").parse()
+        for _ in range(5):
+            self.assertEqual(interpreter.eval_program(stmts), 1)
+        self.assertEqual(len(interpreter._bodies), 2)
+
+
+class TestCheckNames(unittest.TestCase):
+
+    def test_names_bound_anywhere_pass(self):
+        # `depth` is only bound by the caller; dynamic scoping finds it.
+        check_names(Parser("fn inner()\n  depth\nfn outer(depth: Int)\n  inner()\n").parse(), Environment())
+
+    def test_undefined_name_reported_before_running(self):
+        source = "let x = 1\nfn never_called()\n  missing\n"
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                interpreter = Interpreter(backend)
+                with self.assertRaisesRegex(NameError, "Undefined variable 'missing'"):
+                    interpreter.eval_program(Parser(source).parse())
+                self.assertNotIn(symbol("x"), interpreter.global_env.values)
+
+
+if __name__ == '__main__':
+    unittest.main()
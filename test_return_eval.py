@@ -1,6 +1,9 @@
 import unittest
-from fluent_ast import FnDecl, FnParam, Return, ExprStmt, String, IfExpr, Binary, Var, Number, Call, SimpleType
-from interpreter import Interpreter
+from unittest import mock
+from fluent_ast import (
+    FnDecl, FnParam, Return, ExprStmt, String, IfExpr, Binary, Var, Number, Call, SimpleType, MatchExpr, MatchCase
+)
+from interpreter import Interpreter, ReturnException
 
 
 class TestReturnStatement(unittest.TestCase):
@@ -46,6 +49,67 @@ class TestReturnStatement(unittest.TestCase):
         result = self.interpreter.eval_expr(call, self.interpreter.global_env)
         self.assertEqual(result, "not positive")
 
+    def sign_fn(self):
+        # if x < 0: return "negative"; match x: 0 => if ...: return "zero"; then len(x) fails if reached
+        return FnDecl(
+            name="sign",
+            params=[FnParam("x", SimpleType("Int"))],
+            return_type=SimpleType("String"),
+            body=[
+                ExprStmt(IfExpr(Binary(Var("x"), "<", Number(0)), [Return(String("negative"))], None)),
+                ExprStmt(MatchExpr(Var("x"), [
+                    MatchCase(0, IfExpr(Binary(Var("x"), "<", Number(1)), [Return(String("zero"))], None)),
+                    MatchCase("_", Number(0)),
+                ])),
+                ExprStmt(Call("len", [Var("x")])),
+            ]
+        )
+
+    def call(self, fn, *args):
+        self.interpreter.eval_stmt(fn, self.interpreter.global_env)
+        call = Call(func=fn.name, args=[Number(arg) for arg in args])
+        return self.interpreter.eval_expr(call, self.interpreter.global_env)
+
+    def test_return_skips_rest_of_body(self):
+        self.assertEqual(self.call(self.sign_fn(), -3), "negative")
+        self.assertEqual(self.call(self.sign_fn(), 0), "zero")
+        with self.assertRaisesRegex(TypeError, "len"):
+            self.call(self.sign_fn(), 4)
+
+    def test_early_return_raises_nothing(self):
+        with mock.patch.object(ReturnException, "__init__", side_effect=AssertionError("raised")):
+            self.assertEqual(self.call(self.sign_fn(), 0), "zero")
+
+    def test_return_inside_operand(self):
+        fn = FnDecl(
+            name="f",
+            params=[FnParam("x", SimpleType("Int"))],
+            return_type=None,
+            body=[ExprStmt(Binary(Number(10), "+", IfExpr(Binary(Var("x"), ">", Number(0)), [Return(Var("x"))], [ExprStmt(Number(1))])))]
+        )
+        self.assertEqual(self.call(fn, 5), 5)
+        self.assertEqual(self.call(fn, 0), 11)
+
+    def test_early_return_type_checked(self):
+        fn = FnDecl(
+            name="early",
+            params=[],
+            return_type=SimpleType("Int"),
+            body=[ExprStmt(IfExpr(Binary(Number(1), "<", Number(2)), [Return(String("no"))], None)), ExprStmt(Number(1))]
+        )
+        with self.assertRaisesRegex(TypeError, "Return type mismatch in function 'early'"):
+            self.call(fn)
+
+    def test_eval_stmt_raises_top_level_return(self):
+        env = self.interpreter.global_env
+        with self.assertRaises(ReturnException) as caught:
+            self.interpreter.eval_stmt(Return(Number(3)), env)
+        self.assertEqual(caught.exception.value, 3)
+        branch = ExprStmt(IfExpr(Binary(Number(1), "<", Number(2)), [Return(String("out"))], None))
+        with self.assertRaises(ReturnException) as caught:
+            self.interpreter.eval_stmt(branch, env)
+        self.assertEqual(caught.exception.value, "out")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+from interpreter import Environment, Interpreter
+from parser import Parser
+from resolver import Frame
+from symbols import symbol
+
+FIB = '''fn fib(n: Int)
+  if n < 2
+    n
+  else
+    fib(n - 1) + fib(n - 2)
+fib(15)
+'''
+
+
+class TestScopeAllocation(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = Interpreter("tree")
+        self.created = 0  # Environments and Frames
+        for cls in (Environment, Frame):
+            patcher = mock.patch.object(cls, "__init__", self.counting(cls.__init__))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def counting(self, init):
+        def counting_init(scope, *args):
+            self.created += 1
+            init(scope, *args)
+        return counting_init
+
+    def run_source(self, source):
+        return self.interpreter.eval_program(Parser(source).parse())
+
+    def test_recursion_reuses_call_scopes(self):
+        self.assertEqual(self.run_source(FIB), 610)
+        # One scope per level of recursion, not one per call and branch.
+        self.assertLessEqual(self.created, 15)
+
+    def test_block_binding_nothing_allocates_nothing(self):
+        self.assertEqual(self.run_source("let x = 2\nif x > 1\n  x * 3\n"), 6)
+        self.assertEqual(self.created, 0)
+
+    def test_block_lets_stay_local(self):
+        self.assertEqual(self.run_source("let x = 1\nif x > 0\n  x + 1\n  let x = 5\n  x\n"), 5)
+        self.assertEqual(self.interpreter.global_env.get("x"), 1)
+
+    def test_function_without_params_keeps_its_lets(self):
+        self.assertEqual(self.run_source("let y = 1\nfn f()\n  y\n  let y = 2\n  y\nf() + y\n"), 3)
+
+    def test_recycled_scope_starts_empty(self):
+        source = "fn f(a: Int)\n  if a > 0\n    let seen = a\n    seen\n  else\n    seen\n[f(1), f(0)]\n"
+        with self.assertRaisesRegex(NameError, "Undefined variable 'seen'"):
+            self.interpreter.eval_stream(source)
+        self.assertNotIn(symbol("seen"), self.interpreter.global_env.values)
+
+
+    def test_recycled_frame_starts_unbound(self):
+        # f(0) leaves `seen` set in f's frame; f(1) gets that frame back,
+        # and probe must not see the old value before f binds it again.
+        source = ("let seen = 7\n"
+                  "fn probe(a: Int)\n  if a > 0\n    seen\n  else\n    0\n"
+                  "fn f(a: Int)\n  let r = probe(a)\n  let seen = a\n  r\n"
+                  "[f(0), f(1)]\n")
+        self.assertEqual(self.run_source(source), [0, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
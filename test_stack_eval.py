@@ -0,0 +1,67 @@
+import unittest
+from fluent_ast import (
+    Binary, Boolean, Call, ExprStmt, FnDecl, FnParam, IfExpr, LetStmt, ListLiteral, Number, Return, SimpleType, String, Var
+)
+from interpreter import Interpreter
+from parser import Parser
+
+DEPTH = '''fn depth(n: Int)
+  match n
+    0 => 0
+    _ => 1 + depth(n - 1)
+depth({n})
+'''
+
+
+class TestStackEvaluator(unittest.TestCase):
+
+    def run_source(self, source, backend="stack"):
+        return Interpreter(backend).eval_program(Parser(source).parse())
+
+    def test_deep_non_tail_recursion(self):
+        with self.assertRaises(RecursionError):
+            self.run_source(DEPTH.format(n=3000), backend="tree")
+        self.assertEqual(self.run_source(DEPTH.format(n=3000)), 3000)
+
+    def test_deep_list_builder(self):
+        source = '''fn build(n: Int)
+  if n < 1
+    []
+  else
+    let rest = build(n - 1)
+    [n] + rest
+build(2000)
+'''
+        self.assertEqual(self.run_source(source), list(range(2000, 0, -1)))
+
+    def test_return_unwinds_pending_operands(self):
+        # Returning drops the pending `10 +` inside the call and the rest of its body.
+        fn = FnDecl("first_positive", [FnParam("a", SimpleType("Int"))], None, [
+            ExprStmt(IfExpr(Binary(Var("a"), ">", Number(0)), [
+                LetStmt("found", None, Var("a")),
+                ExprStmt(Binary(Number(10), "+", IfExpr(Boolean(True), [Return(Var("found"))], None))),
+            ], None)),
+            ExprStmt(Number(0)),
+        ])
+        program = [fn, ExprStmt(ListLiteral([
+            Binary(Number(100), "+", Call("first_positive", [Number(1)])),
+            Binary(Number(100), "+", Call("first_positive", [Number(-1)])),
+        ]))]
+        self.assertEqual(Interpreter("stack").eval_program(program), [101, 100])
+
+    def test_return_type_checked_after_return(self):
+        fn = FnDecl("f", [], SimpleType("String"), [Return(Number(1)), ExprStmt(String("x"))])
+        with self.assertRaisesRegex(TypeError, "Return type mismatch in function 'f'"):
+            Interpreter("stack").eval_program([fn, ExprStmt(Call("f", []))])
+
+    def test_short_circuit_skips_right_operand(self):
+        boom = Call("len", [Number(1)])
+        program = [ExprStmt(ListLiteral([
+            Binary(Boolean(False), "and", boom),
+            Binary(Boolean(True), "or", boom),
+            Binary(Boolean(True), "and not", Boolean(False)),
+        ]))]
+        self.assertEqual(Interpreter("stack").eval_program(program), [False, True, True])
+
+if __name__ == '__main__':
+    unittest.main()
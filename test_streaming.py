@@ -0,0 +1,72 @@
+import gc
+import io
+import tracemalloc
+import unittest
+from interpreter import BACKENDS, Interpreter
+from parser import Parser
+from symbols import symbol_name
+
+SOURCE = '''fn double(x: Int)
+  x * 2
+let a = double(4)
+let b = [a, double(a)]
+b[1] + 1
+'''
+
+
+class TestEvalStream(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = Interpreter()
+
+    def test_result_matches_eval_program(self):
+        expected = Interpreter().eval_program(Parser(SOURCE).parse())
+        self.assertEqual(self.interpreter.eval_stream(SOURCE), expected)
+        self.assertEqual(self.interpreter.global_env.get("b"), [8, 16])
+
+    def test_reads_from_file_object(self):
+        self.assertEqual(self.interpreter.eval_stream(io.StringIO(SOURCE)), 17)
+
+    def test_statement_runs_before_next_line_is_read(self):
+        seen = []
+        env = self.interpreter.global_env
+
+        def lines():
+            for i in range(3):
+                # Every earlier statement has run before line i is read.
+                seen.append(sorted(n for n in map(symbol_name, env.values) if n.startswith("v")))
+                yield f"let v{i} = {i}\n"
+
+        self.interpreter.eval_stream(lines())
+        self.assertEqual(seen, [[], ["v0"], ["v0", "v1"]])
+
+    def test_earlier_statements_run_before_syntax_error(self):
+        with self.assertRaises(SyntaxError):
+            self.interpreter.eval_stream("let x = 1\nlet y = (\n")
+        self.assertEqual(self.interpreter.global_env.get("x"), 1)
+
+
+    def test_redefining_a_function_does_not_grow_memory(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                samples = []
+
+                def lines(count=600):
+                    for i in range(count):
+                        if i in (100, count - 1):
+                            gc.collect()
+                            samples.append(tracemalloc.get_traced_memory()[0])
+                        yield "fn step(x: Int)\n"
+                        yield f"  x + {i}\n"
+                        yield "step(1)\n"
+
+                tracemalloc.start()
+                try:
+                    self.assertEqual(Interpreter(backend).eval_stream(lines()), 600)
+                finally:
+                    tracemalloc.stop()
+                # Leaking each old FnDecl and its code costs over 1 KB a time.
+                self.assertLess(samples[1] - samples[0], 100_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import pickle
+import unittest
+from fluent_ast import Call, FnDecl, FnParam, LetStmt, Number, Var, SimpleType
+from interpreter import Environment, Interpreter
+from parser import Parser
+from symbols import _ids, _names, reset, symbol, symbol_count, symbol_name
+
+
+class TestSymbols(unittest.TestCase):
+
+    def test_same_name_same_id(self):
+        self.assertEqual(symbol("counter"), symbol("counter"))
+        self.assertNotEqual(symbol("counter"), symbol("count"))
+        self.assertEqual(symbol_name(symbol("counter")), "counter")
+
+    def test_parsed_names_carry_ids(self):
+        fn, let = Parser("fn f(n: Int)\n  n\nlet y = f(x)\n").parse()
+        self.assertEqual(fn.sym, symbol("f"))
+        self.assertEqual(fn.params[0].sym, symbol("n"))
+        self.assertEqual(let.sym, symbol("y"))
+        self.assertEqual(let.value.sym, symbol("f"))
+        self.assertEqual(let.value.args[0].sym, symbol("x"))
+
+    def test_ids_do_not_affect_equality_or_repr(self):
+        self.assertEqual(LetStmt("a", None, Number(1)), LetStmt("a", None, Number(1)))
+        self.assertEqual(repr(Var("a")), "Var(name='a')")
+
+    def test_pickle_rebuilds_ids(self):
+        decl = FnDecl("g", [FnParam("k", SimpleType("Int"))], None, [Call("g", [Var("k")])])
+        restored = pickle.loads(pickle.dumps(decl))
+        self.assertEqual(restored, decl)
+        self.assertEqual(restored.params[0].sym, symbol("k"))
+        self.assertNotIn(decl.sym, decl.__reduce__()[1])
+
+    def test_reset(self):
+        saved = dict(_ids), list(_names)
+
+        def restore():
+            reset()
+            _ids.update(saved[0])
+            _names.extend(saved[1])
+        self.addCleanup(restore)
+        Var("before_reset")
+        reset()
+        self.assertEqual(symbol_count(), 0)
+        self.assertEqual(Var("fresh").sym, 0)
+        self.assertEqual(Var("before_reset").sym, 1)
+        interpreter = Interpreter()
+        interpreter.eval_stream("let total = 2 * 3\n")
+        self.assertEqual(interpreter.global_env.get("total"), 6)
+
+
+class TestEnvironmentSymbols(unittest.TestCase):
+
+    def test_keyed_by_id(self):
+        env = Environment()
+        env.set("x", 1)
+        self.assertEqual(env.values, {symbol("x"): 1})
+        self.assertEqual(env.get("x"), 1)
+        self.assertEqual(Environment(parent=env).lookup(symbol("x")), 1)
+
+    def test_undefined_reports_name(self):
+        with self.assertRaisesRegex(NameError, "Undefined variable 'missing_name'"):
+            Environment().lookup(symbol("missing_name"))
+
+    def test_program_binds_by_id(self):
+        interpreter = Interpreter()
+        interpreter.eval_stream("let total = 2 * 3\n")
+        self.assertEqual(interpreter.global_env.values[symbol("total")], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
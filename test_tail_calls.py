@@ -0,0 +1,70 @@
+import unittest
+from interpreter import Interpreter
+from parser import Parser
+
+COUNT = '''fn count(n: Int)
+  match n
+    0 => "done"
+    _ => count(n - 1)
+'''
+
+EVEN_ODD = '''fn is_even(n: Int)
+  match n
+    0 => 1
+    _ => is_odd(n - 1)
+fn is_odd(n: Int)
+  match n
+    0 => 0
+    _ => is_even(n - 1)
+'''
+
+
+class TestTailCalls(unittest.TestCase):
+
+    def run_source(self, source, tail_calls=True):
+        return Interpreter("tree", tail_calls=tail_calls).eval_program(Parser(source).parse())
+
+    def test_self_recursion_to_a_million(self):
+        self.assertEqual(self.run_source(COUNT + "count(1000000)\n"), "done")
+
+    def test_mutual_recursion_to_a_million(self):
+        self.assertEqual(self.run_source(EVEN_ODD + "is_even(1000000)\n"), 1)
+
+    def test_recursion_limit_without_flag(self):
+        with self.assertRaises(RecursionError):
+            self.run_source(COUNT + "count(5000)\n", tail_calls=False)
+
+    def test_accumulator_in_if_branch(self):
+        source = '''fn sum_to(n: Int, acc: Int)
+  if n < 1
+    acc
+  else
+    let next = acc + n
+    sum_to(n - 1, next)
+sum_to(10000, 0)
+'''
+        self.assertEqual(self.run_source(source), 50005000)
+
+    def test_callee_still_sees_caller_bindings(self):
+        # `depth` and `label` belong to scopes the tail call replaces.
+        source = '''fn inner()
+  [depth, label]
+fn outer(depth: Int)
+  if depth > 0
+    let label = "x"
+    inner()
+outer(3)
+'''
+        self.assertEqual(self.run_source(source), [3, "x"])
+
+    def test_non_tail_calls_unchanged(self):
+        source = "fn fib(n: Int)\n  match n\n    0 => 0\n    1 => 1\n    _ => fib(n - 1) + fib(n - 2)\nfib(15)\n"
+        self.assertEqual(self.run_source(source), 610)
+
+    def test_backends_without_support_reject_flag(self):
+        with self.assertRaisesRegex(ValueError, "does not support tail_calls"):
+            Interpreter("closure", tail_calls=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from lexer import Lexer, Token, TokenType
+from parser import Parser
+from token_buffer import TokenBuffer
+
+SOURCE = '''fn greet(name: String) -> String
+  match name
+    bob => "hi bob"
+    _ => name
+let xs: List[Int] = [1, 22, 333]
+let g = greet("al" ) + xs[2]
+
+'''
+
+
+class TestTokenBuffer(unittest.TestCase):
+
+    def test_views_equal_tokens(self):
+        buffer = TokenBuffer.from_source(SOURCE)
+        tokens = Lexer(SOURCE).tokenize()
+        self.assertEqual(len(buffer), len(tokens))
+        self.assertEqual(list(buffer), tokens)
+
+    def test_values_are_sliced_from_source(self):
+        buffer = TokenBuffer.from_source('let s = "a b"\r\nlet n = 42')
+        strings = [t for t in buffer if t.type == TokenType.STRING]
+        self.assertEqual(strings[0].value, "a b")
+        self.assertEqual(buffer[-3].value, "42")
+        self.assertEqual(buffer[-3].line, 1)
+
+    def test_indexing(self):
+        buffer = TokenBuffer.from_source("let x = 1")
+        self.assertEqual(buffer[0], Token(TokenType.LET, "let", 0, 0))
+        self.assertEqual(buffer[-1].type, TokenType.EOF)
+        with self.assertRaises(IndexError):
+            buffer[len(buffer)]
+
+    def test_parser_accepts_buffer(self):
+        ast = Parser.from_tokens(TokenBuffer.from_source(SOURCE)).parse()
+        self.assertEqual(ast, Parser(SOURCE).parse())
+
+
+if __name__ == "__main__":
+    unittest.main()
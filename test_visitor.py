@@ -0,0 +1,88 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from fluent_ast import Binary, Call, Expr, LetStmt, Number, Var
+from interpreter import Interpreter
+from pretty_printer import pretty_print
+from visitor import MethodTable, NodeVisitor
+
+
+class NameCollector(NodeVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_Var(self, node):
+        self.names.append(node.name)
+
+    def visit_Call(self, node):
+        self.names.append(node.func)
+        self.generic_visit(node)
+
+
+class Shouter(NameCollector):
+    def visit_Var(self, node):
+        self.names.append(node.name.upper())
+
+
+class TestVisitor(unittest.TestCase):
+
+    def test_generic_visit_reaches_nested_nodes(self):
+        tree = [LetStmt("y", None, Binary(Var("a"), "+", Call("f", [Var("b"), Number(1)])))]
+        collector = NameCollector()
+        collector.visit(tree)
+        self.assertEqual(collector.names, ["a", "f", "b"])
+
+    def test_subclass_gets_its_own_table(self):
+        shouter = Shouter()
+        shouter.visit(Call("f", [Var("b")]))
+        self.assertEqual(shouter.names, ["f", "B"])
+        self.assertIsNot(Shouter._visit_table, NameCollector._visit_table)
+        self.assertIs(NameCollector._visit_table[Var], NameCollector.visit_Var)
+
+    def test_resolves_through_mro_and_caches(self):
+        class Node(Expr):
+            pass
+
+        class Handler:
+            def on_Expr(self, node):
+                return "expr"
+
+            def fallback(self, node):
+                return "other"
+
+        table = MethodTable("on_", "fallback", Handler)
+        self.assertIs(table[Node], Handler.on_Expr)
+        self.assertIn(Node, table)
+        self.assertIs(table[int], Handler.fallback)
+
+
+class TestInterpreterDispatch(unittest.TestCase):
+
+    def test_unsupported_nodes_still_raise(self):
+        interpreter = Interpreter()
+        with self.assertRaisesRegex(NotImplementedError, "Unsupported expression"):
+            interpreter.eval_expr(LetStmt("x", None, Number(1)), interpreter.global_env)
+        with self.assertRaisesRegex(NotImplementedError, "Unsupported statement"):
+            interpreter.eval_stmt(Number(1), interpreter.global_env)
+
+    def test_override_in_subclass(self):
+        class Doubling(Interpreter):
+            def eval_Number(self, expr, env):
+                return expr.value * 2
+
+        interpreter = Doubling()
+        self.assertEqual(interpreter.eval_expr(Binary(Number(1), "+", Number(2)), interpreter.global_env), 6)
+        self.assertEqual(Interpreter().eval_expr(Number(1), None), 1)
+
+
+class TestPrettyPrint(unittest.TestCase):
+
+    def test_output(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            pretty_print([LetStmt("y", None, Binary(Var("a"), "*", Number(2)))])
+        self.assertEqual(out.getvalue(), "LetStmt(name=y)\n  Binary(op=*)\n    Var(name=a)\n    Number(value=2)\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
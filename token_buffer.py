@@ -0,0 +1,129 @@
+from array import array
+
+from lexer import Lexer, Token, TokenType
+
+# Type codes are indices into this list.
+TOKEN_TYPES = list(TokenType)
+TYPE_CODES = {tok_type: code for code, tok_type in enumerate(TOKEN_TYPES)}
+
+
+class TokenView:
+    """Token-compatible view of one entry of a TokenBuffer.
+
+    Exposes the same `type`, `value`, `line` and `column` attributes as
+    `Token`; the value is sliced from the source only when it is read.
+    """
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return TOKEN_TYPES[self.buffer.types[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    @property
+    def line(self):
+        return self.buffer.lines[self.index]
+
+    @property
+    def column(self):
+        return self.buffer.columns[self.index]
+
+    def __eq__(self, other):
+        if not isinstance(other, (Token, TokenView)):
+            return NotImplemented
+        return (self.type, self.value, self.line, self.column) == \
+            (other.type, other.value, other.line, other.column)
+
+    def __repr__(self):
+        return f"<Token {self.type.name} '{self.value}' ({self.line}:{self.column})>"
+
+
+class TokenBuffer:
+    """Struct-of-arrays token storage.
+
+    Each token is a type code, the [start, end) offsets of its value in the
+    source, and its line and column, held in `array` columns: about 25 bytes
+    per token instead of a `Token` object plus its own value string.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.lines = array('i')
+        self.columns = array('i')
+
+    @classmethod
+    def from_source(cls, source: str):
+        buffer = cls(source)
+        buffer.extend(Lexer(source).iter_tokens())
+        return buffer
+
+    def extend(self, tokens):
+        # The lexer streams tokens line by line, so walking the line offsets
+        # alongside it is enough to turn columns into source offsets.
+        offsets = _line_offsets(self.source)
+        line, line_start = -1, 0
+        types, starts, ends = self.types.append, self.starts.append, self.ends.append
+        lines, columns = self.lines.append, self.columns.append
+        for tok in tokens:
+            while line < tok.line:
+                line += 1
+                line_start = next(offsets, len(self.source))
+            start = line_start + tok.column
+            if tok.type is TokenType.STRING:
+                start += 1  # the value starts after the opening quote
+            types(TYPE_CODES[tok.type])
+            starts(start)
+            ends(start + len(tok.value))
+            lines(line)
+            columns(tok.column)
+
+    def append(self, type_, start, end, line, column):
+        self.types.append(TYPE_CODES[type_])
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def value(self, index):
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
+
+
+def _line_offsets(source: str):
+    # Start offset of each line, split the same way as Lexer._iter_lines.
+    offset = 0
+    while offset < len(source):
+        end = source.find('\n', offset) + 1 or len(source)
+        for line in source[offset:end].splitlines(keepends=True):
+            yield offset
+            offset += len(line)
+
+
+class ByteTokenBuffer(TokenBuffer):
+    """TokenBuffer over UTF-8 bytes (e.g. a memory map); offsets are byte offsets."""
+
+    def value(self, index):
+        return self.source[self.starts[index]:self.ends[index]].decode('utf-8')
@@ -0,0 +1,62 @@
+from dataclasses import fields, is_dataclass
+
+
+class MethodTable(dict):
+    """Maps a node type to the method handling it, e.g. `eval_Binary`.
+
+    A type seen for the first time is resolved through its MRO (so a handler
+    for a base class covers subclasses), falling back to `fallback`, and the
+    result is cached: every later dispatch is a single dict lookup however
+    many node types there are. Declare one as a class attribute of a
+    `Visitor`; each subclass gets its own table, so overrides are honoured.
+    """
+
+    def __init__(self, prefix, fallback, owner=None):
+        super().__init__()
+        self.prefix = prefix
+        self.fallback = fallback
+        self.owner = owner
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+
+    def __missing__(self, node_type):
+        for cls in node_type.__mro__:
+            method = getattr(self.owner, self.prefix + cls.__name__, None)
+            if method is not None:
+                break
+        else:
+            method = getattr(self.owner, self.fallback)
+        self[node_type] = method
+        return method
+
+
+class Visitor:
+    """Base for classes that dispatch on node type through MethodTables."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in dir(cls):
+            table = getattr(cls, name)
+            if isinstance(table, MethodTable) and table.owner is not cls:
+                setattr(cls, name, MethodTable(table.prefix, table.fallback, cls))
+
+
+class NodeVisitor(Visitor):
+    """Calls `visit_<ClassName>(node, *args)`; unhandled nodes go to
+    `generic_visit`, which visits every child node and list of nodes."""
+    _visit_table = MethodTable("visit_", "generic_visit")
+
+    def visit(self, node, *args):
+        return self._visit_table[type(node)](self, node, *args)
+
+    def visit_list(self, nodes, *args):
+        for node in nodes:
+            self.visit(node, *args)
+
+    def generic_visit(self, node, *args):
+        if is_dataclass(node):
+            for f in fields(node):
+                value = getattr(node, f.name)
+                if is_dataclass(value) or isinstance(value, list):
+                    self.visit(value, *args)
@@ -0,0 +1,201 @@
+from bytecode import (
+    LOAD_FAST, CONST, LOAD_NAME, BINARY, BINARY_CONST, CALL, RETURN_VALUE, POP, MATCH, JUMP, POP_JUMP_IF_FALSE, CHECK_BOOL,
+    STORE_FAST, STORE_ENV, CHECK_TYPE, BUILD_LIST, INDEX, JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP, NOT, RAISE,
+    RAISE_RETURN, BINARY_OPS, Compiler
+)
+from fluent_ast import FnDecl
+from interpreter import BuiltInFunction, Interpreter, ReturnException, check_type, drop_cached, format_type
+
+_BINARY_FUNCS = [fn for _, fn in BINARY_OPS]
+
+
+class Frame:
+    __slots__ = ("code", "slots", "stack", "pc", "caller", "site")
+
+    def __init__(self, code, slots, caller):
+        self.code = code
+        self.slots = slots
+        self.stack = []
+        self.pc = 0
+        self.caller = caller
+        self.site = None  # CallSite of the call this frame is waiting on
+
+
+class VMInterpreter(Interpreter):
+    """Runs bytecode from `bytecode.Compiler` on a stack machine.
+
+    Fluent calls push a Frame instead of recursing in Python, so recursion
+    depth is bounded by memory only. Function bodies are compiled on their
+    first call and kept per FnDecl. Name resolution, type checks and error
+    messages match the tree walker.
+    """
+    backend = "vm"
+    supports_tail_calls = False
+    supports_memoize = False
+
+    def __init__(self, backend=None, **options):
+        super().__init__(**options)
+        self._functions = {}  # id(FnDecl) -> (FnDecl, Code)
+
+    def run_program(self, stmts):
+        return self.execute(Compiler.compile_program(stmts), self.global_env)
+
+    def eval_stmt(self, stmt, env):
+        return self.execute(Compiler.compile_program([stmt]), env)
+
+    def eval_expr(self, expr, env):
+        return self.execute(Compiler.compile_expression(expr), env)
+
+    def compiled_function(self, fn):
+        entry = self._functions.get(id(fn))
+        if entry is None or entry[0] is not fn:
+            entry = self._functions[id(fn)] = (fn, Compiler.compile_function(fn))
+        return entry[1]
+
+    def _forget_function(self, fn):
+        super()._forget_function(fn)
+        drop_cached(self._functions, fn)
+
+    def execute(self, code, env):
+        """Run top-level `code` with `env` as its environment."""
+        frame = Frame(code, [None] * code.nslots, None)
+        ops, consts, slots, stack = code.ops, code.consts, frame.slots, frame.stack
+        push, pop = stack.append, stack.pop
+        pc = 0
+        while True:
+            op = ops[pc]
+            arg = ops[pc + 1]
+            pc += 2
+            if op == LOAD_FAST:
+                push(slots[arg])
+            elif op == CONST:
+                push(consts[arg])
+            elif op == LOAD_NAME:
+                # Dynamic scoping: search what each caller could see at its
+                # call site, innermost call first, then the environment.
+                caller = frame.caller
+                while caller is not None:
+                    found = caller.site.visible.get(arg)
+                    if found is not None:
+                        push(caller.slots[found[0]])
+                        break
+                    caller = caller.caller
+                else:
+                    push(env.lookup(arg))
+            elif op == BINARY_CONST:
+                stack[-1] = _BINARY_FUNCS[arg & 15](stack[-1], consts[arg >> 4])
+            elif op == BINARY:
+                right = pop()
+                stack[-1] = _BINARY_FUNCS[arg](stack[-1], right)
+            elif op == CALL:
+                site = consts[arg]
+                n = site.nargs
+                if n:
+                    args = stack[-n:]
+                    del stack[-n:]
+                else:
+                    args = []
+                fn = pop()
+                if fn is site.fn or isinstance(fn, FnDecl):
+                    if fn is site.fn:
+                        callee = site.code
+                    else:
+                        callee = site.code = self.compiled_function(fn)
+                        site.fn = fn
+                    if n != len(fn.params):
+                        raise ValueError(f"Function '{fn.name}' expects {len(fn.params)} arguments, got {n}")
+                    for slot, check in callee.checks:
+                        if not check(args[slot]):
+                            param = fn.params[slot]
+                            raise TypeError(
+                                f"Type mismatch in parameter '{param.name}': expected {format_type(param.type_annotation)}, got {type(args[slot]).__name__}")
+                    frame.pc = pc
+                    frame.site = site
+                    if callee.nslots > n:
+                        args.extend([None] * (callee.nslots - n))
+                    frame = Frame(callee, args, frame)
+                    ops, consts, slots, stack = callee.ops, callee.consts, args, frame.stack
+                    push, pop = stack.append, stack.pop
+                    pc = 0
+                elif isinstance(fn, BuiltInFunction):
+                    push(fn.call(args))
+                else:
+                    raise TypeError(f"'{site.name}' is not a function")
+            elif op == RETURN_VALUE:
+                result = pop()
+                callee = frame.code
+                if callee.fn is None:
+                    return result
+                if callee.return_check is not None and not callee.return_check(result):
+                    fn = callee.fn
+                    raise TypeError(
+                        f"Return type mismatch in function '{fn.name}': expected {format_type(fn.return_type)}, got {type(result).__name__}")
+                frame = frame.caller
+                code = frame.code
+                ops, consts, slots, stack = code.ops, code.consts, frame.slots, frame.stack
+                push, pop = stack.append, stack.pop
+                pc = frame.pc
+                push(result)
+            elif op == POP:
+                pop()
+            elif op == MATCH:
+                value = pop()
+                table = consts[arg]
+                try:
+                    target = table.targets.get(value, table.default)
+                except TypeError:  # unhashable values never equal a pattern
+                    target = table.default
+                if target < 0:
+                    raise ValueError(f"No match found for value: {value}")
+                pc = target
+            elif op == JUMP:
+                pc = arg
+            elif op == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == CHECK_BOOL:
+                if not isinstance(stack[-1], bool):
+                    raise TypeError(f"If condition must be a boolean, got: {type(stack[-1]).__name__}")
+            elif op == STORE_FAST:
+                slots[arg] = stack[-1]
+            elif op == STORE_ENV:
+                env.values[arg] = stack[-1]
+            elif op == CHECK_TYPE:
+                annotation = consts[arg]
+                if not check_type(stack[-1], annotation):
+                    raise TypeError(f"Type mismatch: expected {annotation}, got {type(stack[-1]).__name__}")
+            elif op == BUILD_LIST:
+                if arg:
+                    items = stack[-arg:]
+                    del stack[-arg:]
+                else:
+                    items = []
+                push(items)
+            elif op == INDEX:
+                index = pop()
+                target = pop()
+                if not isinstance(index, int):
+                    raise TypeError(f"List index must be an integer, got {type(index).__name__}")
+                try:
+                    push(target[index])
+                except (TypeError, IndexError) as e:
+                    raise RuntimeError(f"Indexing failed: {e}")
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == NOT:
+                stack[-1] = not stack[-1]
+            elif op == RAISE:
+                error, message = consts[arg]
+                raise error(message)
+            elif op == RAISE_RETURN:
+                raise ReturnException(pop())
+            else:
+                raise RuntimeError(f"Bad opcode {op} at {pc - 2} in {frame.code.name}")